@@ -0,0 +1,655 @@
+"""
+Hotel Management System - Benchmark
+Legacy vs pooled data access, plus load, durability and memory tests
+
+Usage: python bench_hotel.py pooled [--ops 2000]
+       python bench_hotel.py stress [--processes 8] [--bookings 500]
+       python bench_hotel.py http [--connections 16] [--requests 500] [--depth 8]
+       python bench_hotel.py memory [--bookings 100000]
+       python bench_hotel.py group-commit [--threads 16] [--charges 200]
+       python bench_hotel.py kill-test [--rounds 5]
+       python bench_hotel.py backup [--bookings 1000000]
+       python bench_hotel.py availability [--bookings 100000] [--ops 2000]
+       python bench_hotel.py analytics [--bookings 2000000]
+       python bench_hotel.py search [--bookings 1000000] [--ops 2000]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import bench_suite
+from hotel import ConnectionManager, HotelManagement, analytics, init_database
+from hotel.backup import create_snapshot, restore_snapshot, verify_snapshot
+from hotel.server import BookingServer
+
+# ==================== LEGACY DATA ACCESS ====================
+
+def legacy_create_booking(db_file, room_no, name, address, check_in, check_out):
+    """Connect, insert and close, as HotelManagement used to"""
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute("""
+        INSERT INTO bookings (room_no, name, address, check_in_date, check_out_date)
+        VALUES (?, ?, ?, ?, ?)
+    """, (room_no, name, address, check_in, check_out))
+    booking_id = cursor.lastrowid
+    conn.commit()
+    conn.close()
+    return booking_id
+
+def legacy_update_restaurant_bill(db_file, booking_id, amount):
+    conn = sqlite3.connect(db_file)
+    cursor = conn.cursor()
+    cursor.execute("""
+        UPDATE bookings
+        SET restaurant_bill = restaurant_bill + ?
+        WHERE id = ?
+    """, (amount, booking_id))
+    conn.commit()
+    conn.close()
+
+def legacy_get_booking(db_file, booking_id):
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM bookings WHERE id = ?", (booking_id,))
+    booking = cursor.fetchone()
+    conn.close()
+    return dict(booking) if booking else None
+
+def legacy_generate_bill(db_file, booking_id):
+    """Three reads and a write, as generate_bill used to do per receipt"""
+    booking = legacy_get_booking(db_file, booking_id)
+    if not booking:
+        return None
+    total = (booking['room_rent'] + booking['restaurant_bill'] +
+             booking['laundry_bill'] + booking['game_bill'] + booking['service_charge'])
+    legacy_get_booking(db_file, booking_id)
+    conn = sqlite3.connect(db_file)
+    conn.execute("UPDATE bookings SET total_bill = ? WHERE id = ?", (total, booking_id))
+    conn.commit()
+    conn.close()
+    return legacy_get_booking(db_file, booking_id)
+
+# ==================== BENCHMARK ====================
+
+def timed(label, n, func):
+    """Run func(i) n times and print ops/sec and mean latency"""
+    start = time.perf_counter()
+    for i in range(n):
+        func(i)
+    elapsed = time.perf_counter() - start
+    rate = n / elapsed if elapsed else float("inf")
+    print(f"    {label:<24} {rate:>12,.0f} ops/sec {elapsed / n * 1e6:>10,.1f} us/op")
+    return rate
+
+def run_legacy(db_file, n):
+    print("Legacy (connect per operation):")
+    # The old code used the default rollback journal with synchronous=FULL
+    init_database(ConnectionManager(db_file, pragmas={"journal_mode": "DELETE",
+                                                      "synchronous": "FULL"}))
+    results = {}
+    results["create_booking"] = timed("create_booking", n, lambda i: legacy_create_booking(
+        db_file, i + 1, f"Guest {i}", "Street 1", "2024-01-01", "2024-01-03"))
+    results["update_restaurant_bill"] = timed("update_restaurant_bill", n,
+        lambda i: legacy_update_restaurant_bill(db_file, i + 1, 90))
+    results["get_booking"] = timed("get_booking", n,
+        lambda i: legacy_get_booking(db_file, i + 1))
+    results["generate_bill"] = timed("generate_bill", n,
+        lambda i: legacy_generate_bill(db_file, i + 1))
+    return results
+
+def run_pooled(db_file, n):
+    print("Pooled (ConnectionManager):")
+    db = ConnectionManager(db_file)
+    init_database(db)
+    # The cache is off so reads measure the database, as the legacy path does
+    hotel = HotelManagement(db, cache_size=0)
+    results = {}
+    results["create_booking"] = timed("create_booking", n, lambda i: hotel.create_booking(
+        f"Guest {i}", "Street 1", "2024-01-01", "2024-01-03"))
+    results["update_restaurant_bill"] = timed("update_restaurant_bill", n,
+        lambda i: hotel.update_restaurant_bill(i + 1, 90))
+    results["get_booking"] = timed("get_booking", n,
+        lambda i: hotel.get_booking(i + 1))
+    # total_bill is kept by triggers, so a receipt is a single read
+    results["generate_bill"] = timed("generate_bill", n,
+        lambda i: hotel.get_booking(i + 1))
+    db.close_all()
+    return results
+
+# ==================== CONCURRENCY STRESS TEST ====================
+
+def _stress_worker(db_file, count):
+    hotel = HotelManagement(ConnectionManager(db_file))
+    for i in range(count):
+        hotel.create_booking(f"Guest {os.getpid()}-{i}", "", "2024-01-01", "2024-01-02")
+    hotel.db.close_all()
+
+def run_stress(processes, per_process):
+    """Create bookings from several processes at once and check room numbers"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "stress.db")
+        db = ConnectionManager(db_file)
+        init_database(db)
+
+        workers = [multiprocessing.Process(target=_stress_worker, args=(db_file, per_process))
+                   for _ in range(processes)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        total, distinct = db.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT room_no) FROM bookings").fetchone()
+        db.close_all()
+
+    print(f"Stress: {processes} processes x {per_process} bookings")
+    print(f"    bookings created         {total:>12,}")
+    print(f"    duplicate room numbers   {total - distinct:>12,}")
+    print(f"    throughput               {total / elapsed:>12,.0f} bookings/sec")
+    return total - distinct
+
+# ==================== HTTP LOAD TEST ====================
+
+def _http_request(method, path, payload=None):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    return (f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+
+async def _read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+async def _http_client(port, requests, depth, booking_ids, errors):
+    """Keep-alive connection sending `depth` pipelined requests at a time"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    sent = 0
+    while sent < requests:
+        batch = []
+        for i in range(sent, min(sent + depth, requests)):
+            booking_id = booking_ids[i % len(booking_ids)]
+            if i % 3 == 0:
+                batch.append(_http_request("POST", f"/bookings/{booking_id}/charges",
+                                           {"category": "restaurant", "item": "Tea",
+                                            "qty": 1, "unit_price": 10}))
+            elif i % 3 == 1:
+                batch.append(_http_request("GET", f"/bookings/{booking_id}"))
+            else:
+                batch.append(_http_request("GET", f"/bookings/{booking_id}/total"))
+        writer.write(b"".join(batch))
+        await writer.drain()
+        for _ in batch:
+            if await _read_response(reader) >= 400:
+                errors.append(1)
+        sent += len(batch)
+    writer.close()
+
+def run_http(connections, per_connection, depth):
+    """Load-test the HTTP API against a temporary database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ConnectionManager(os.path.join(tmp, "http.db"))
+        init_database(db)
+        hotel = HotelManagement(db)
+        booking_ids = [hotel.create_booking(f"Guest {i}", "", "2024-01-01", "2024-01-03")[0]
+                       for i in range(100)]
+
+        loop = asyncio.new_event_loop()
+        server = BookingServer(hotel, workers=4)
+        started = threading.Event()
+
+        def serve():
+            asyncio.set_event_loop(loop)
+            listener = loop.run_until_complete(server.start("127.0.0.1", 0))
+            server.port = listener.sockets[0].getsockname()[1]
+            started.set()
+            loop.run_forever()
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        started.wait()
+
+        async def load():
+            errors = []
+            start = time.perf_counter()
+            await asyncio.gather(*(_http_client(server.port, per_connection, depth,
+                                                booking_ids, errors)
+                                   for _ in range(connections)))
+            return time.perf_counter() - start, len(errors)
+
+        elapsed, errors = asyncio.run(load())
+        total = connections * per_connection
+        asyncio.run_coroutine_threadsafe(server.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+        hotel.close()
+
+    print(f"HTTP: {connections} connections x {per_connection} requests, pipeline depth {depth}")
+    print(f"    requests                 {total:>12,}")
+    print(f"    errors                   {errors:>12,}")
+    print(f"    throughput               {total / elapsed:>12,.0f} requests/sec")
+    return errors
+
+# ==================== MEMORY ====================
+
+def run_memory(n):
+    """Memory held by get_all_bookings() in each format"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ConnectionManager(os.path.join(tmp, "memory.db"))
+        init_database(db)
+        with db.transaction():
+            db.executemany("""
+                INSERT INTO bookings (room_no, name, address, check_in_date,
+                                      check_out_date, room_type, room_rent)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, ((i + 1, f"Guest {i}", f"{i} Main Street",
+                   f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                   f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                   f"Type {'ABCD'[i % 4]}", 3000.0 + 1000 * (i % 4)) for i in range(n)))
+        hotel = HotelManagement(db)
+
+        print(f"Memory: get_all_bookings() over {n:,} bookings")
+        results = {}
+        for fmt in ("dict", "record", "table"):
+            tracemalloc.start()
+            start = time.perf_counter()
+            bookings = hotel.get_all_bookings(format=fmt)
+            elapsed = time.perf_counter() - start
+            held = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            assert len(bookings) == n
+            del bookings
+            results[fmt] = held
+            print(f"    {fmt:<8} {held / 2**20:>10.1f} MiB {held / n:>8.0f} B/booking "
+                  f"{elapsed:>8.2f} s")
+        hotel.close()
+
+    for fmt in ("record", "table"):
+        print(f"    {fmt} uses {results[fmt] / results['dict']:.0%} of dict rows")
+    return results
+
+# ==================== GROUP COMMIT ====================
+
+def _post_concurrently(hotel, threads, per_thread):
+    """threads posters each posting per_thread single charges; returns charges/sec"""
+    def poster(t):
+        for i in range(per_thread):
+            hotel.post_charges([(t % 100 + 1, "restaurant", "Tea", 1, 10.0)])
+    workers = [threading.Thread(target=poster, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return threads * per_thread / (time.perf_counter() - start)
+
+def run_group_commit(threads, per_thread):
+    """Charge-post throughput with a commit per charge versus group commit"""
+    print(f"Group commit: {threads} threads x {per_thread} charges")
+    results = {}
+    modes = (("commit per charge, synchronous=NORMAL", "NORMAL", False),
+             ("commit per charge, synchronous=FULL", "FULL", False),
+             ("group commit, synchronous=FULL", "FULL", True))
+    for label, synchronous, group in modes:
+        with tempfile.TemporaryDirectory() as tmp:
+            db = ConnectionManager(os.path.join(tmp, "group.db"),
+                                   pragmas={"synchronous": synchronous})
+            init_database(db)
+            hotel = HotelManagement(db)
+            for i in range(100):
+                hotel.create_booking(f"Guest {i}", "", "2024-01-01", "2024-01-03")
+            writer = hotel.enable_group_commit() if group else None
+            rate = _post_concurrently(hotel, threads, per_thread)
+            posted = db.execute("SELECT COUNT(*) FROM charges").fetchone()[0]
+            stats = writer.stats() if writer else None
+            hotel.close()
+        results[label] = rate
+        extra = f"  ({stats['mean_group']:.1f} charges/commit)" if stats else ""
+        print(f"    {label:<40} {rate:>10,.0f} charges/sec{extra}")
+        assert posted == threads * per_thread
+    durable = results["commit per charge, synchronous=FULL"]
+    print(f"    speedup over durable per-charge commits {results[label] / durable:>10.1f}x")
+    return results
+
+def _kill_test_child(db_file, threads):
+    """Post charges forever, printing each charge's token once it is acknowledged"""
+    hotel = HotelManagement(ConnectionManager(db_file))
+    hotel.enable_group_commit()
+    out_lock = threading.Lock()
+
+    def poster(t):
+        for n in itertools.count():
+            token = f"{os.getpid()}-{t}-{n}"
+            hotel.submit_charges([(t + 1, "restaurant", token, 1, 1.0)]).result()
+            with out_lock:
+                os.write(1, f"{token}\n".encode())
+    for t in range(threads):
+        threading.Thread(target=poster, args=(t,), daemon=True).start()
+    threading.Event().wait()
+
+def run_kill_test(rounds, threads=8):
+    """SIGKILL a group-committing process mid-stream; every acked charge must survive"""
+    lost = inconsistent = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "kill.db")
+        db = ConnectionManager(db_file)
+        init_database(db)
+        hotel = HotelManagement(db)
+        for i in range(threads):
+            hotel.create_booking(f"Guest {i}", "", "2024-01-01", "2024-01-03")
+        db.close_all()
+        print(f"Kill test: {rounds} rounds, {threads} posting threads")
+        for round_no in range(rounds):
+            child = subprocess.Popen([sys.executable, __file__, "kill-test-child", db_file,
+                                      str(threads)], stdout=subprocess.PIPE)
+            time.sleep(random.uniform(0.5, 1.5))
+            child.send_signal(signal.SIGKILL)
+            acked = set(child.stdout.read().decode().split())
+            child.wait()
+            db = ConnectionManager(db_file)
+            stored = {row[0] for row in db.execute("SELECT item FROM charges WHERE item IS NOT NULL")}
+            totals_ok = db.execute("""
+                SELECT COUNT(*) FROM bookings
+                WHERE restaurant_bill != (SELECT COALESCE(SUM(qty * unit_price), 0)
+                                          FROM charges WHERE booking_id = bookings.id
+                                                         AND category = 'restaurant')
+            """).fetchone()[0] == 0
+            db.close_all()
+            missing = acked - stored
+            lost += len(missing)
+            inconsistent += not totals_ok
+            print(f"    round {round_no + 1}: {len(acked):>8,} acknowledged, {len(missing):,} lost, "
+                  f"bills {'consistent' if totals_ok else 'INCONSISTENT'}")
+    print(f"    acknowledged charges lost  {lost:>10,}")
+    return lost + inconsistent
+
+# ==================== ONLINE BACKUP ====================
+
+class _Writer:
+    """Background thread updating bills while a backup runs, timing each write"""
+
+    def __init__(self, hotel, bookings):
+        self.hotel = hotel
+        self.bookings = bookings
+        self.latencies = []
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run)
+
+    def _run(self):
+        rng = random.Random(1)
+        while not self.stop.is_set():
+            start = time.perf_counter()
+            self.hotel.update_restaurant_bill(rng.randint(1, self.bookings), 10)
+            self.latencies.append(time.perf_counter() - start)
+            time.sleep(0.002)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        p99 = latencies[int(0.99 * (len(latencies) - 1))]
+        return (f"{len(latencies):,} writes, p99 {p99 * 1e3:.1f} ms, "
+                f"max {latencies[-1] * 1e3:.1f} ms")
+
+def run_backup(n):
+    """Backup, incremental, verify and restore throughput while a writer keeps writing"""
+    source = bench_suite.cached_database(bench_suite.DEFAULT_DATA_DIR, n, 42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "hotel_management.db")
+        shutil.copyfile(source, db_file)
+        db = ConnectionManager(db_file)
+        init_database(db)
+        hotel = HotelManagement(db, cache_size=0)
+        size_mb = os.path.getsize(db_file) / 1e6
+        print(f"Online backup: {n:,} bookings, {size_mb:,.0f} MB")
+        with _Writer(hotel, n) as writer:
+            time.sleep(2)
+        print(f"    {'writer alone':<28} {'':>18} {writer.summary()}")
+
+        def snapshot(label, directory, **kwargs):
+            with _Writer(hotel, n) as writer:
+                manifest = create_snapshot(os.path.join(tmp, directory), db, **kwargs)
+            stored = sum(entry["stored"] for entry in manifest["databases"].values()) / 1e6
+            print(f"    {label:<28} {size_mb / manifest['seconds']:>8,.0f} MB/s "
+                  f"{stored:>7,.1f} MB  {writer.summary()}")
+            return manifest
+
+        snapshot("full", "plain")
+        snapshot("full, compressed", "packed", compress=True)
+        for i in range(1000):
+            hotel.create_booking(f"Bench Guest {i}", "1 Bench Road", "2025-01-01", "2025-01-03")
+        snapshot("incremental, compressed", "packed", incremental=True, compress=True)
+
+        start = time.perf_counter()
+        verify_snapshot(os.path.join(tmp, "packed"), quick=True)
+        elapsed = time.perf_counter() - start
+        print(f"    {'verify (quick_check)':<28} {size_mb / elapsed:>8,.0f} MB/s")
+        restored = ConnectionManager(os.path.join(tmp, "restored.db"))
+        start = time.perf_counter()
+        restore_snapshot(os.path.join(tmp, "packed"), db=restored)
+        elapsed = time.perf_counter() - start
+        print(f"    {'restore':<28} {size_mb / elapsed:>8,.0f} MB/s")
+        count = restored.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+        restored.close_all()
+        hotel.close()
+        assert count == n + 1000, count
+
+# ==================== AVAILABILITY ====================
+
+def _latency(label, func, iterations):
+    result = bench_suite.measure(func, iterations)
+    print(f"    {label:<28} p50 {result['p50_us']:>9,.1f} us  p99 {result['p99_us']:>9,.1f} us")
+    return result
+
+def run_availability(n, ops):
+    """Availability queries over n bookings: idle, after other writers, and booking"""
+    source = bench_suite.cached_database(bench_suite.DEFAULT_DATA_DIR, n, 42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, "hotel_management.db")
+        shutil.copyfile(source, db_file)
+        db = ConnectionManager(db_file)
+        init_database(db)
+        hotel = HotelManagement(db, cache_size=0)
+        # The synthetic stays use rooms 1-500
+        for i, room_type in enumerate(bench_suite.ROOM_TYPES):
+            hotel.add_rooms(room_type, range(i + 1, 501, len(bench_suite.ROOM_TYPES)))
+        rng = random.Random(7)
+
+        def stay(i):
+            check_in = date(2022, 1, 1) + timedelta(days=rng.randrange(1100))
+            return check_in.isoformat(), (check_in + timedelta(days=rng.randint(1, 7))).isoformat()
+
+        print(f"Availability: {n:,} bookings, 500 rooms")
+        start = time.perf_counter()
+        hotel.find_available_rooms("Type A", *stay(0))
+        print(f"    {'first query (index build)':<28} {(time.perf_counter() - start) * 1e3:>9,.1f} ms")
+        _latency("available_rooms", lambda i: hotel.find_available_rooms(
+            bench_suite.ROOM_TYPES[i % 4], *stay(i)), ops)
+
+        # Another process moves a stay before each query
+        other = ConnectionManager(db_file)
+
+        def moved(i):
+            check_in, check_out = stay(i)
+            other.execute("UPDATE bookings SET check_in_date = ?, check_out_date = ? WHERE id = ?",
+                          (check_in, check_out, rng.randint(1, n)))
+            hotel.find_available_rooms("Type B", check_in, check_out)
+        _latency("after a moved stay", moved, ops)
+        other.close_all()
+
+        def book(i):
+            try:
+                hotel.create_booking(f"Bench Guest {i}", "", *stay(i), room_type="Type C")
+            except ValueError:
+                pass  # fully booked
+        _latency("create_booking by type", book, ops)
+        hotel.close()
+
+# ==================== ANALYTICS ====================
+
+def run_analytics(n):
+    """Columnar revenue reports over n bookings against the same SQL GROUP BY"""
+    source = bench_suite.cached_database(bench_suite.DEFAULT_DATA_DIR, n, 42)
+    # Reports only read, so the cached database is used in place
+    db = ConnectionManager(source)
+    backend = "NumPy" if analytics.np is not None else "array fallback (no NumPy)"
+    print(f"Analytics: {n:,} bookings, {backend}")
+
+    def timed(label, func):
+        start = time.perf_counter()
+        result = func()
+        print(f"    {label:<28} {(time.perf_counter() - start) * 1e3:>10,.1f} ms")
+        return result
+
+    reports = timed("load columns", lambda: analytics.RevenueAnalytics.load(db))
+    period = ("2022-01-01", "2025-01-01")
+    timed("summary (3 years)", lambda: reports.summary(*period))
+    timed("revenue_by_room_type", reports.revenue_by_room_type)
+    timed("revenue_by_day (3 years)", lambda: reports.revenue_by_day(*period))
+    months = timed("revenue_by_month (3 years)", lambda: reports.revenue_by_month(*period))
+    rows = timed("SQL GROUP BY month", lambda: db.execute("""
+        SELECT substr(check_in_date, 1, 7),
+               SUM(room_rent + restaurant_bill + laundry_bill + game_bill + service_charge)
+        FROM bookings
+        WHERE check_in_date >= ? AND check_in_date < ?
+        GROUP BY 1
+    """, period).fetchall())
+    assert {month for month, amount in months if amount} == {row[0] for row in rows}
+    db.close_all()
+
+# ==================== SEARCH ====================
+
+def run_search(n, ops):
+    """Search-as-you-type latency over n bookings, and the LIKE scan it replaced"""
+    source = bench_suite.cached_database(bench_suite.DEFAULT_DATA_DIR, n, 42)
+    # Searches only read, so the cached database is used in place
+    db = ConnectionManager(source)
+    hotel = HotelManagement(db, cache_size=0)
+    rng = random.Random(19)
+    first, last = bench_suite.FIRST_NAMES, bench_suite.LAST_NAMES
+    print(f"Search: {n:,} bookings")
+    _latency("two letters", lambda i: hotel.search_bookings(rng.choice(first)[:2]), ops)
+    _latency("first name", lambda i: hotel.search_bookings(rng.choice(first)), ops)
+    _latency("first + last prefix", lambda i: hotel.search_bookings(
+        f"{rng.choice(first)} {rng.choice(last)[:3]}"), ops)
+    _latency("common word (city)", lambda i: hotel.search_bookings(
+        rng.choice(bench_suite.CITIES)), ops)
+    _latency("unique booking number", lambda i: hotel.search_bookings(
+        str(rng.randrange(n))), ops)
+    _latency("LIKE '%name%' scan", lambda i: db.execute(
+        "SELECT id FROM bookings WHERE name LIKE ? LIMIT 50",
+        (f"%{rng.choice(first)} {rng.choice(last)}%",)).fetchall(), max(1, ops // 100))
+    hotel.close()
+
+def run_connections(n):
+    """Legacy connect-per-operation vs the pooled ConnectionManager"""
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run_legacy(os.path.join(tmp, "legacy.db"), n)
+        after = run_pooled(os.path.join(tmp, "pooled.db"), n)
+    print("Speedup:")
+    for op in before:
+        print(f"    {op:<24} {after[op] / before[op]:>11.1f}x")
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel data layer benchmarks and stress tests")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_pooled = sub.add_parser("pooled", help="connect-per-operation vs pooled connections")
+    p_pooled.add_argument("--ops", type=int, default=2000)
+
+    p_stress = sub.add_parser("stress", help="concurrent bookings from many processes")
+    p_stress.add_argument("--processes", type=int, default=8)
+    p_stress.add_argument("--bookings", type=int, default=500, help="per process")
+
+    p_http = sub.add_parser("http", help="pipelined HTTP load on the API server")
+    p_http.add_argument("--connections", type=int, default=16)
+    p_http.add_argument("--requests", type=int, default=500, help="per connection")
+    p_http.add_argument("--depth", type=int, default=8, help="pipelined requests in flight")
+
+    p_memory = sub.add_parser("memory", help="memory of dict, record and table bookings")
+    p_memory.add_argument("--bookings", type=int, default=100000)
+
+    p_group = sub.add_parser("group-commit", help="per-charge commits vs group commit")
+    p_group.add_argument("--threads", type=int, default=16)
+    p_group.add_argument("--charges", type=int, default=200, help="per thread")
+
+    p_kill = sub.add_parser("kill-test", help="SIGKILL a group-committing process")
+    p_kill.add_argument("--rounds", type=int, default=5)
+    # Started by kill-test in a subprocess
+    p_child = sub.add_parser("kill-test-child")
+    p_child.add_argument("db_file")
+    p_child.add_argument("threads", type=int)
+
+    p_backup = sub.add_parser("backup", help="online snapshots under front-desk load")
+    p_backup.add_argument("--bookings", type=int, default=1000000)
+
+    p_avail = sub.add_parser("availability", help="room availability queries and bookings")
+    p_avail.add_argument("--bookings", type=int, default=100000)
+    p_avail.add_argument("--ops", type=int, default=2000)
+
+    p_analytics = sub.add_parser("analytics", help="columnar revenue reports")
+    p_analytics.add_argument("--bookings", type=int, default=2000000)
+
+    p_search = sub.add_parser("search", help="guest search latency")
+    p_search.add_argument("--bookings", type=int, default=1000000)
+    p_search.add_argument("--ops", type=int, default=2000)
+
+    args = parser.parse_args(argv)
+    if args.command == "pooled":
+        run_connections(args.ops)
+    elif args.command == "stress":
+        return 1 if run_stress(args.processes, args.bookings) else 0
+    elif args.command == "http":
+        return 1 if run_http(args.connections, args.requests, args.depth) else 0
+    elif args.command == "memory":
+        run_memory(args.bookings)
+    elif args.command == "group-commit":
+        run_group_commit(args.threads, args.charges)
+    elif args.command == "kill-test":
+        return 1 if run_kill_test(args.rounds) else 0
+    elif args.command == "kill-test-child":
+        _kill_test_child(args.db_file, args.threads)
+    elif args.command == "backup":
+        run_backup(args.bookings)
+    elif args.command == "availability":
+        run_availability(args.bookings, args.ops)
+    elif args.command == "analytics":
+        run_analytics(args.bookings)
+    elif args.command == "search":
+        run_search(args.bookings, args.ops)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,242 @@
+"""
+Hotel Management System - Benchmark Suite
+Reproducible latency and throughput benchmarks of HotelManagement at several database sizes
+
+Usage: python bench_suite.py [--sizes 1000,100000,1000000] [--ops 2000] [--output results.json]
+       python bench_suite.py --compare before.json after.json
+
+Synthetic databases are built once per size and seed and cached in
+--data-dir; every run works on a fresh copy so results do not drift.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from hotel import ConnectionManager, HotelManagement, booking_key, init_database
+from hotel.schema import latest_version
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "hotel_bench")
+BUILD_BATCH = 50000
+REGRESSION = 1.2      # --compare flags ops whose p50 grew by more than this factor
+
+# ==================== SYNTHETIC DATA ====================
+
+FIRST_NAMES = ("Aarav", "Priya", "John", "Maria", "Chen", "Fatima", "Olga", "Kwame",
+               "Sofia", "Liam", "Noah", "Emma", "Ravi", "Anita", "Jose", "Hiroshi")
+LAST_NAMES = ("Sharma", "Smith", "Garcia", "Wang", "Khan", "Ivanova", "Mensah", "Rossi",
+              "Brown", "Patel", "Muller", "Silva", "Kim", "Okafor", "Haddad", "Novak")
+CITIES = ("Mumbai", "Delhi", "London", "Madrid", "Beijing", "Lagos", "Moscow", "Rome",
+          "Lima", "Pune", "Karachi", "Cairo")
+ROOM_TYPES = ("Type A", "Type B", "Type C", "Type D")
+CHARGES = (("restaurant", "Lunch", 110), ("restaurant", "Tea", 10),
+           ("laundry", "Shirt", 5), ("game", "Pool", 50))
+
+def synthetic_bookings(n, rng):
+    """n bookings spread over three years, newest created last"""
+    start = date(2022, 1, 1)
+    for i in range(n):
+        check_in = start + timedelta(days=i * 1095 // n)
+        nights = rng.randint(1, 7)
+        yield (i % 500 + 1,
+               f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+               f"{rng.randint(1, 999)} {rng.choice(LAST_NAMES)} Road, {rng.choice(CITIES)}",
+               check_in.isoformat(), (check_in + timedelta(days=nights)).isoformat(),
+               rng.choice(ROOM_TYPES), 3000.0 * nights,
+               f"{check_in.isoformat()} {i % 86400 // 3600:02d}:{i % 3600 // 60:02d}:{i % 60:02d}")
+
+def build_database(path, n, seed):
+    """Create a database of n bookings, a fifth of them with ledger charges"""
+    rng = random.Random(seed)
+    db = ConnectionManager(path)
+    init_database(db)
+    rows = synthetic_bookings(n, rng)
+    while True:
+        batch = [row for _, row in zip(range(BUILD_BATCH), rows)]
+        if not batch:
+            break
+        with db.transaction() as conn:
+            cursor = conn.cursor()
+            ids = []
+            for row in batch:
+                cursor.execute("""
+                    INSERT INTO bookings (room_no, name, address, check_in_date, check_out_date,
+                                          room_type, room_rent, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, row)
+                ids.append(cursor.lastrowid)
+            db.executemany("""
+                INSERT INTO charges (booking_id, category, item, qty, unit_price, posted_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [(booking_id, category, item, rng.randint(1, 3), price, row[3])
+                  for booking_id, row in zip(ids, batch) if rng.random() < 0.2
+                  for category, item, price in [rng.choice(CHARGES)]])
+    db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    db.execute("PRAGMA optimize")
+    db.close_all()
+
+def cached_database(data_dir, n, seed):
+    """Path of the synthetic database for (n, seed), building it if needed"""
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f"hotel_{n}_s{seed}_v{latest_version()}.db")
+    if not os.path.exists(path):
+        print(f"Building {n:,} bookings into {path} ...", file=sys.stderr)
+        start = time.perf_counter()
+        partial = path + ".building"
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(partial + suffix):
+                os.remove(partial + suffix)
+        build_database(partial, n, seed)
+        os.replace(partial, path)
+        print(f"    built in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return path
+
+# ==================== MEASUREMENT ====================
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def measure(func, iterations):
+    """Call func(i) iterations times; latency percentiles in microseconds"""
+    clock = time.perf_counter_ns
+    latencies = []
+    start = clock()
+    for i in range(iterations):
+        t = clock()
+        func(i)
+        latencies.append(clock() - t)
+    elapsed = (clock() - start) / 1e9
+    latencies.sort()
+    return {
+        "n": iterations,
+        "p50_us": percentile(latencies, 0.50) / 1e3,
+        "p99_us": percentile(latencies, 0.99) / 1e3,
+        "mean_us": sum(latencies) / len(latencies) / 1e3,
+        "ops_per_sec": iterations / elapsed if elapsed else float("inf"),
+    }
+
+def run_size(source, n, ops, seed):
+    """Benchmark every operation against a scratch copy of source"""
+    rng = random.Random(seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hotel_management.db")
+        shutil.copyfile(source, path)
+        db = ConnectionManager(path)
+        # The cache is off so reads measure the database, not a dict lookup
+        hotel = HotelManagement(db, cache_size=0)
+        ids = [rng.randint(1, n) for _ in range(ops)]
+
+        def record(name, func, iterations=ops):
+            results[name] = measure(func, iterations)
+            r = results[name]
+            print(f"    {name:<24} p50 {r['p50_us']:>10,.1f} us  p99 {r['p99_us']:>10,.1f} us"
+                  f"  {r['ops_per_sec']:>10,.0f} ops/sec", file=sys.stderr)
+
+        record("create_booking", lambda i: hotel.create_booking(
+            f"Bench Guest {i}", "1 Bench Road", "2025-01-01", "2025-01-03"))
+        record("update_restaurant_bill", lambda i: hotel.update_restaurant_bill(ids[i], 90))
+        record("update_laundry_bill", lambda i: hotel.update_laundry_bill(ids[i], 5))
+        record("update_game_bill", lambda i: hotel.update_game_bill(ids[i], 50))
+        record("get_booking", lambda i: hotel.get_booking(ids[i]))
+        record("calculate_total", lambda i: hotel.calculate_total(ids[i]))
+        # refresh_bookings loads the newest page; scrolling loads older pages
+        record("refresh_first_page", lambda i: hotel.get_bookings_page(100))
+        keys = [booking_key(b) for b in hotel.get_bookings_page(1000)]
+        record("scroll_page", lambda i: hotel.get_bookings_page(100, after=keys[i % len(keys)]))
+        full_scans = max(1, min(10, 1000000 // (n + ops)))
+        record("get_all_bookings", lambda i: hotel.get_all_bookings(), full_scans)
+        hotel.close()
+    return results
+
+def environment(seed, ops):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit or None,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "schema_version": latest_version(),
+        "seed": seed,
+        "ops": ops,
+    }
+
+# ==================== COMPARISON ====================
+
+def compare(before_path, after_path):
+    """Print p50 and throughput changes; returns the number of regressions"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{before['environment'].get('commit') or before_path} -> "
+          f"{after['environment'].get('commit') or after_path}")
+    regressions = 0
+    for size, ops in after["results"].items():
+        if size not in before["results"]:
+            continue
+        print(f"{int(size):,} bookings:")
+        for op, result in ops.items():
+            old = before["results"][size].get(op)
+            if old is None:
+                continue
+            ratio = result["p50_us"] / old["p50_us"] if old["p50_us"] else 1.0
+            flag = "  REGRESSION" if ratio > REGRESSION else ""
+            regressions += bool(flag)
+            print(f"    {op:<24} p50 {old['p50_us']:>10,.1f} -> {result['p50_us']:>10,.1f} us"
+                  f" ({ratio:>5.2f}x){flag}")
+    return regressions
+
+# ==================== MAIN ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hotel data layer")
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES),
+                        help="comma-separated booking counts")
+    parser.add_argument("--ops", type=int, default=2000, help="iterations per operation")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR,
+                        help="cache of synthetic databases")
+    parser.add_argument("--output", help="write JSON results here (default stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two result files instead of running")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        return 1 if compare(*args.compare) else 0
+
+    report = {"environment": environment(args.seed, args.ops), "results": {}}
+    for n in (int(size) for size in args.sizes.split(",")):
+        source = cached_database(args.data_dir, n, args.seed)
+        print(f"{n:,} bookings:", file=sys.stderr)
+        report["results"][str(n)] = run_size(source, n, args.ops, args.seed)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+"""
+Hotel Management System - headless core package
+
+Importing this package does not load Tk or touch the database. Call
+init_database() once at startup, then use HotelManagement:
+
+    from hotel import HotelManagement, init_database
+    init_database()
+    hotel = HotelManagement()
+
+The desktop GUI lives in hotel.gui and is only imported when launched.
+"""
+
+from .core import HotelManagement, booking_key
+from .db import DB_FILE, ConnectionManager, get_manager
+from .records import Booking, BookingTable
+from .schema import init_database, migrate
+
+__all__ = [
+    "HotelManagement", "booking_key",
+    "DB_FILE", "ConnectionManager", "get_manager",
+    "Booking", "BookingTable",
+    "init_database", "migrate",
+]
@@ -0,0 +1,243 @@
+"""
+Hotel Management System - Revenue Analytics
+Occupancy, ADR, RevPAR and revenue group-bys over a columnar copy of bookings
+
+Uses NumPy when it is installed; otherwise the same reports run on
+array.array columns with plain Python loops (correct, just slower).
+"""
+
+from array import array
+from datetime import date
+
+from .db import get_manager
+from .records import ARCHIVED_BOOKINGS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+REVENUE_COLUMNS = ("room_rent", "restaurant_bill", "laundry_bill", "game_bill",
+                   "service_charge")
+
+# date.toordinal() of a 'YYYY-MM-DD' value, computed by SQLite
+ORDINAL_SQL = "CAST(julianday(substr({0}, 1, 10)) - 1721424.5 AS INTEGER)"
+MONTH_SQL = "CAST(substr({0}, 1, 4) AS INTEGER) * 12 + CAST(substr({0}, 6, 2) AS INTEGER) - 1"
+
+LOAD_SQL = f"""
+    SELECT {ORDINAL_SQL.format('check_in_date')},
+           {ORDINAL_SQL.format('check_out_date')},
+           {MONTH_SQL.format('check_in_date')},
+           COALESCE(room_type, ''),
+           {', '.join(f'COALESCE({name}, 0)' for name in REVENUE_COLUMNS)}
+    FROM {{source}}
+    WHERE julianday(substr(check_in_date, 1, 10)) IS NOT NULL
+      AND julianday(substr(check_out_date, 1, 10)) IS NOT NULL
+      AND check_out_date >= COALESCE(?, '')
+"""
+
+def ordinal(value):
+    """Day number for a date or 'YYYY-MM-DD' string"""
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+def month_label(index):
+    """'YYYY-MM' for a month index of year * 12 + month - 1"""
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+# ==================== COLUMNAR LOAD ====================
+
+class BookingColumns:
+    """Stay days, room types and revenue of every booking as parallel columns
+
+    check_in/check_out are day ordinals (a same-day stay counts as one
+    night), month is year * 12 + month - 1 of the check-in, room_type holds
+    an index into room_types and each REVENUE_COLUMNS name is a float column.
+    """
+
+    def __init__(self, check_in, check_out, month, room_type, room_types, revenue):
+        self.check_in = check_in
+        self.check_out = check_out
+        self.month = month
+        self.room_type = room_type
+        self.room_types = room_types
+        self.revenue = revenue
+        self.total = _add(*(revenue[name] for name in REVENUE_COLUMNS))
+
+    def __len__(self):
+        return len(self.check_in)
+
+    @classmethod
+    def load(cls, db=None, since=None):
+        """Load live and archived bookings; since skips stays ending before it"""
+        db = db or get_manager()
+        source = "bookings"
+        if db.archive_file:
+            source = f"(SELECT * FROM main.bookings UNION ALL {ARCHIVED_BOOKINGS})"
+        cursor = db.connection().cursor()
+        cursor.row_factory = None
+        cursor.execute(LOAD_SQL.format(source=source), (since,))
+        codes = {}
+        rows = ((row[0], max(row[1], row[0] + 1), row[2], codes.setdefault(row[3], len(codes)))
+                + row[4:] for row in cursor)
+        if np is not None:
+            dtype = [("check_in", "i8"), ("check_out", "i8"), ("month", "i8"),
+                     ("room_type", "i8")] + [(name, "f8") for name in REVENUE_COLUMNS]
+            table = np.fromiter(rows, dtype=dtype)
+            columns = [table[name].copy() for name, _ in dtype]
+        else:
+            columns = [array("q"), array("q"), array("q"), array("q")]
+            columns += [array("d") for _ in REVENUE_COLUMNS]
+            for row in rows:
+                for column, value in zip(columns, row):
+                    column.append(value)
+        return cls(*columns[:4], list(codes), dict(zip(REVENUE_COLUMNS, columns[4:])))
+
+# ==================== KERNELS ====================
+# Each kernel has a NumPy form and a plain-Python form over array.array
+
+def _add(*columns):
+    if np is not None:
+        return sum(columns[1:], columns[0].copy())
+    return array("d", map(sum, zip(*columns)))
+
+def _overlap(check_in, check_out, start, end):
+    """Nights of each stay that fall in [start, end)"""
+    if np is not None:
+        return np.clip(np.minimum(check_out, end) - np.maximum(check_in, start), 0, None)
+    return array("q", (max(0, min(out, end) - max(day, start))
+                       for day, out in zip(check_in, check_out)))
+
+def _prorate(amounts, nights, check_in, check_out):
+    """Share of each amount for `nights` of the stay"""
+    if np is not None:
+        return amounts * nights / (check_out - check_in)
+    return array("d", (amount * n / (out - day) for amount, n, day, out
+                       in zip(amounts, nights, check_in, check_out)))
+
+def _in_range(keys, start, end):
+    if np is not None:
+        return (keys >= start) & (keys < end)
+    return [start <= key < end for key in keys]
+
+def _group_sum(keys, weights, size, mask=None):
+    """Sum weights by integer key in [0, size), skipping rows where mask is false"""
+    if np is not None:
+        if mask is not None:
+            keys, weights = keys[mask], weights[mask]
+        return np.bincount(keys, weights=weights, minlength=size)[:size].tolist()
+    sums = [0.0] * size
+    if mask is None:
+        for key, weight in zip(keys, weights):
+            sums[key] += weight
+    else:
+        for key, weight, keep in zip(keys, weights, mask):
+            if keep:
+                sums[key] += weight
+    return sums
+
+def _offset(column, offset):
+    if np is not None:
+        return column - offset
+    return array("q", (value - offset for value in column))
+
+def _total(column):
+    return float(column.sum()) if np is not None else float(sum(column))
+
+# ==================== REPORTS ====================
+
+class RevenueAnalytics:
+    """Hotel KPIs over a loaded BookingColumns snapshot
+
+    Periods are [start, end) as dates or 'YYYY-MM-DD' strings. Room revenue
+    is recognised per night, so a stay spanning the period boundary counts
+    only its nights inside the period; ancillary charges are attributed to
+    the check-in day. rooms is the number of sellable rooms.
+    """
+
+    def __init__(self, columns, rooms):
+        self.columns = columns
+        self.rooms = rooms
+
+    @classmethod
+    def load(cls, db=None, since=None, rooms=None):
+        """Snapshot the bookings table; rooms defaults to the rooms inventory
+        size, or the number of distinct rooms booked (live or archived) when it is empty"""
+        db = db or get_manager()
+        if rooms is None:
+            booked = "SELECT room_no FROM bookings"
+            if db.archive_file:
+                booked += f" UNION SELECT room_no FROM ({ARCHIVED_BOOKINGS})"
+            rooms = (db.execute("SELECT COUNT(*) FROM rooms").fetchone()[0] or
+                     db.execute(f"SELECT COUNT(DISTINCT room_no) FROM ({booked})").fetchone()[0])
+        return cls(BookingColumns.load(db, since), rooms)
+
+    def _period(self, start, end):
+        start, end = ordinal(start), ordinal(end)
+        if end <= start:
+            raise ValueError("Period end must be after its start")
+        return start, end
+
+    def room_nights(self, start, end):
+        """Occupied room-nights in the period"""
+        start, end = self._period(start, end)
+        cols = self.columns
+        return int(_total(_overlap(cols.check_in, cols.check_out, start, end)))
+
+    def room_revenue(self, start, end):
+        """Room rent earned for nights in the period"""
+        start, end = self._period(start, end)
+        cols = self.columns
+        nights = _overlap(cols.check_in, cols.check_out, start, end)
+        return _total(_prorate(cols.revenue["room_rent"], nights, cols.check_in, cols.check_out))
+
+    def summary(self, start, end):
+        """Occupancy, ADR and RevPAR for the period"""
+        first, last = self._period(start, end)
+        available = self.rooms * (last - first)
+        sold = self.room_nights(start, end)
+        revenue = self.room_revenue(start, end)
+        return {
+            "rooms": self.rooms,
+            "available_room_nights": available,
+            "room_nights": sold,
+            "room_revenue": revenue,
+            "occupancy": sold / available if available else 0.0,
+            "adr": revenue / sold if sold else 0.0,
+            "revpar": revenue / available if available else 0.0,
+        }
+
+    def revenue_by_room_type(self, start=None, end=None):
+        """{room_type: {column: amount, ..., "total": amount}} by check-in day"""
+        cols = self.columns
+        mask = None
+        if start is not None or end is not None:
+            first = ordinal(start) if start is not None else 0
+            last = ordinal(end) if end is not None else date.max.toordinal() + 1
+            mask = _in_range(cols.check_in, first, last)
+        size = len(cols.room_types)
+        sums = {name: _group_sum(cols.room_type, cols.revenue[name], size, mask)
+                for name in REVENUE_COLUMNS}
+        sums["total"] = _group_sum(cols.room_type, cols.total, size, mask)
+        return {room_type or "Unassigned": {name: sums[name][i] for name in sums}
+                for i, room_type in enumerate(cols.room_types)}
+
+    def revenue_by_day(self, start, end):
+        """[(date, total revenue)] for each day in the period, by check-in day"""
+        start, end = self._period(start, end)
+        cols = self.columns
+        sums = _group_sum(_offset(cols.check_in, start), cols.total, end - start,
+                          _in_range(cols.check_in, start, end))
+        return [(date.fromordinal(start + i), amount) for i, amount in enumerate(sums)]
+
+    def revenue_by_month(self, start, end):
+        """[('YYYY-MM', total revenue)] for each month in the period, by check-in day"""
+        first, last = self._period(start, end)
+        first_day, last_day = date.fromordinal(first), date.fromordinal(last - 1)
+        first_month = first_day.year * 12 + first_day.month - 1
+        months = last_day.year * 12 + last_day.month - first_month
+        cols = self.columns
+        sums = _group_sum(_offset(cols.month, first_month), cols.total, months,
+                          _in_range(cols.check_in, first, last))
+        return [(month_label(first_month + i), amount) for i, amount in enumerate(sums)]
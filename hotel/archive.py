@@ -0,0 +1,185 @@
+"""
+Hotel Management System - Archive
+Moves checked-out bookings and their ledger lines into the attached archive database
+
+Usage:
+    python -m hotel.archive run [--days 90] [--batch 2000] [--vacuum]
+    python -m hotel.archive status
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+from .db import DB_FILE, ConnectionManager, get_manager
+from .records import BOOKING_COLUMNS, LEDGER_COLUMNS
+from .schema import has_archive, init_database
+
+ARCHIVE_AFTER_DAYS = 90    # bookings checked out this long ago are archived
+ARCHIVE_BATCH = 2000       # bookings moved per pair of transactions
+ARCHIVE_PAUSE = 0.05       # seconds between batches, so other writers get the lock
+
+_BOOKING_LIST = ", ".join(BOOKING_COLUMNS)
+_LEDGER_LIST = ", ".join(LEDGER_COLUMNS)
+
+# ==================== ARCHIVING ====================
+
+def _copy_batch(db, before, batch_size):
+    """Copy the next batch into the archive; returns how many bookings it holds
+
+    Only the archive file is written, so the commit is atomic. Bookings
+    copied by an earlier, interrupted run are copied again from scratch.
+    """
+    with db.transaction("IMMEDIATE") as conn:
+        conn.execute("DELETE FROM temp.archive_batch")
+        # Free-text and compact legacy dates compare below any ISO day as
+        # text; date() is NULL for them, so they stay live
+        conn.execute("""
+            INSERT INTO temp.archive_batch (id)
+            SELECT id FROM main.bookings
+            WHERE check_out_date < ?
+              AND date(check_out_date) IS NOT NULL AND date(check_out_date) < ?
+            ORDER BY id LIMIT ?
+        """, (before, before, batch_size))
+        conn.execute("""
+            DELETE FROM archive.charges WHERE booking_id IN (SELECT id FROM temp.archive_batch)
+        """)
+        conn.execute(f"""
+            INSERT OR REPLACE INTO archive.bookings ({_BOOKING_LIST})
+            SELECT {_BOOKING_LIST} FROM main.bookings
+            WHERE id IN (SELECT id FROM temp.archive_batch)
+        """)
+        conn.execute(f"""
+            INSERT INTO archive.charges ({_LEDGER_LIST})
+            SELECT {_LEDGER_LIST} FROM main.charges
+            WHERE booking_id IN (SELECT id FROM temp.archive_batch)
+        """)
+        return conn.execute("SELECT COUNT(*) FROM temp.archive_batch").fetchone()[0]
+
+def _remove_batch(db):
+    """Delete the copied batch from the live tables; returns (bookings, charges)
+
+    Only the main file is written. A booking changed since it was copied
+    (a late charge, a rent update) does not match its archive row and stays
+    live until the next run.
+    """
+    booking_match = " AND ".join(f"a.{name} IS b.{name}" for name in BOOKING_COLUMNS)
+    with db.transaction("IMMEDIATE") as conn:
+        conn.execute(f"""
+            INSERT INTO main.archive_moving (booking_id)
+            SELECT b.id FROM main.bookings AS b JOIN archive.bookings AS a ON a.id = b.id
+            WHERE b.id IN (SELECT id FROM temp.archive_batch)
+              AND {booking_match}
+              AND (SELECT COUNT(*) FROM main.charges WHERE booking_id = b.id) =
+                  (SELECT COUNT(*) FROM archive.charges WHERE booking_id = b.id)
+        """)
+        # archive_moving tells the rollup delete triggers to keep these rows'
+        # totals: archived revenue still counts in reports
+        charges = conn.execute("""
+            DELETE FROM main.charges
+            WHERE booking_id IN (SELECT booking_id FROM main.archive_moving)
+        """).rowcount
+        bookings = conn.execute("""
+            DELETE FROM main.bookings WHERE id IN (SELECT booking_id FROM main.archive_moving)
+        """).rowcount
+        conn.execute("DELETE FROM main.archive_moving")
+    return bookings, charges
+
+def archive_bookings(db=None, before=None, batch_size=ARCHIVE_BATCH, pause=ARCHIVE_PAUSE):
+    """Move bookings checked out before `before` into the archive database
+
+    before defaults to ARCHIVE_AFTER_DAYS ago. Each batch is copied in one
+    transaction and removed from the live tables in a second, with a short
+    pause between batches so front-desk writes are never blocked for long.
+    Returns (bookings, charges) moved.
+    """
+    db = db or get_manager()
+    if not has_archive(db):
+        raise RuntimeError("No archive database is attached")
+    before = before or (date.today() - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+    db.execute("CREATE TEMP TABLE IF NOT EXISTS archive_batch (id INTEGER PRIMARY KEY)")
+    moved_bookings = moved_charges = 0
+    try:
+        while True:
+            copied = _copy_batch(db, before, batch_size)
+            if not copied:
+                break
+            bookings, charges = _remove_batch(db)
+            moved_bookings += bookings
+            moved_charges += charges
+            if copied < batch_size or not bookings:
+                break
+            time.sleep(pause)
+    finally:
+        db.execute("DROP TABLE IF EXISTS temp.archive_batch")
+    if moved_bookings:
+        with db.transaction("IMMEDIATE") as conn:
+            conn.execute("""
+                INSERT INTO archive.archive_runs (checked_out_before, bookings, charges)
+                VALUES (?, ?, ?)
+            """, (before, moved_bookings, moved_charges))
+    return moved_bookings, moved_charges
+
+def archive_status(db=None):
+    """Row counts and file sizes of the live and archive databases"""
+    db = db or get_manager()
+    status = {
+        "live_bookings": db.execute("SELECT COUNT(*) FROM main.bookings").fetchone()[0],
+        "live_charges": db.execute("SELECT COUNT(*) FROM main.charges").fetchone()[0],
+        "oldest_live_check_out": db.execute(
+            "SELECT MIN(check_out_date) FROM main.bookings").fetchone()[0],
+    }
+    if has_archive(db):
+        status["archived_bookings"] = db.execute(
+            "SELECT COUNT(*) FROM archive.bookings").fetchone()[0]
+        status["archived_charges"] = db.execute(
+            "SELECT COUNT(*) FROM archive.charges").fetchone()[0]
+        last = db.execute("""
+            SELECT finished_at, checked_out_before FROM archive.archive_runs
+            ORDER BY id DESC LIMIT 1
+        """).fetchone()
+        status["last_run"] = dict(last) if last else None
+    for name, path in (("live_file_bytes", db.db_file), ("archive_file_bytes", db.archive_file)):
+        if path and os.path.exists(path):
+            status[name] = os.path.getsize(path)
+    return status
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive checked-out bookings")
+    parser.add_argument("--db", default=DB_FILE, help="database file")
+    parser.add_argument("--archive", help="archive file (default: <db>_archive.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_run = sub.add_parser("run", help="move checked-out bookings to the archive")
+    p_run.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS,
+                       help="archive stays checked out more than this many days ago")
+    p_run.add_argument("--before", help="archive stays checked out before this day instead")
+    p_run.add_argument("--batch", type=int, default=ARCHIVE_BATCH)
+    p_run.add_argument("--vacuum", action="store_true",
+                       help="compact the live database afterwards (blocks writers)")
+    sub.add_parser("status", help="show live and archived row counts")
+
+    args = parser.parse_args(argv)
+    db = ConnectionManager(args.db, archive=args.archive or True)
+    try:
+        init_database(db)
+        if args.command == "status":
+            for key, value in archive_status(db).items():
+                print(f"{key}: {value}")
+            return 0
+        before = args.before or (date.today() - timedelta(days=args.days)).isoformat()
+        start = time.perf_counter()
+        bookings, charges = archive_bookings(db, before, args.batch)
+        print(f"Archived {bookings:,} bookings and {charges:,} charges checked out before "
+              f"{before} in {time.perf_counter() - start:.1f} s")
+        if args.vacuum:
+            db.execute("VACUUM main")
+        return 0
+    finally:
+        db.close_all()
+
+if __name__ == "__main__":
+    sys.exit(main())
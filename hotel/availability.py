@@ -0,0 +1,183 @@
+"""
+Hotel Management System - Room Availability
+In-memory per-room occupancy arrays kept in step with the bookings table
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+ROOM_TYPES = ("Type A", "Type B", "Type C", "Type D")
+RELOAD_BATCH = 500         # changed bookings re-read per query
+
+def date_ordinal(value):
+    """Day number for a 'YYYY-MM-DD' date (timestamps are truncated)"""
+    return date.fromisoformat(str(value).strip()[:10]).toordinal()
+
+# ==================== OCCUPANCY ====================
+
+class RoomOccupancy:
+    """Stays for one room as parallel lists sorted by check-in day
+
+    A stay overlapping a day range starts less than `longest` days before
+    the range, so a free/busy check bisects to that window and looks only
+    at the few stays starting in it. Overlapping legacy stays are handled.
+    """
+
+    __slots__ = ("starts", "ends", "booking_ids", "longest")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.booking_ids = []
+        self.longest = 0
+
+    def add(self, start, end, booking_id):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.booking_ids.insert(i, booking_id)
+        # Never shrinks on remove: a wider window is slower, never wrong
+        self.longest = max(self.longest, end - start)
+
+    def remove(self, start, booking_id):
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.booking_ids[i] == booking_id:
+                del self.starts[i], self.ends[i], self.booking_ids[i]
+                return
+            i += 1
+
+    def is_free(self, start, end):
+        """True if no stay overlaps the half-open day range [start, end)"""
+        starts = self.starts
+        last = bisect_left(starts, end)
+        first = bisect_right(starts, start - self.longest, 0, last)
+        return first == last or max(self.ends[first:last]) <= start
+
+# ==================== AVAILABILITY INDEX ====================
+
+class AvailabilityIndex:
+    """Answers "which rooms of a type are free between two dates"
+
+    Built lazily from the rooms and bookings tables. Every query first
+    pulls bookings with an id above the last one seen (a primary-key range
+    read) and replays the stay_changes log kept by triggers for changed
+    and deleted stays, so writes from other threads and processes, and
+    archiving runs, are picked up incrementally. A change to the rooms
+    inventory, or falling further behind than the log keeps, rebuilds it.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.room_types = {}
+            self.rooms_by_type = {}
+            self.occupancy = {}
+            self._stays = {}            # booking_id -> (room_no, start) of indexed stays
+            self._last_booking_id = 0
+            self._last_change = None    # stay_changes seq replayed; None until built
+
+    def _rebuild(self, last_change):
+        self.reset()
+        for row in self.db.execute("SELECT room_no, room_type FROM rooms ORDER BY room_no"):
+            self.room_types[row[0]] = row[1]
+            self.rooms_by_type.setdefault(row[1], []).append(row[0])
+            self.occupancy[row[0]] = RoomOccupancy()
+        self._last_change = last_change
+        self._load_new()
+
+    def _load_new(self):
+        cursor = self.db.execute("""
+            SELECT id, room_no, check_in_date, check_out_date
+            FROM bookings
+            WHERE id > ?
+            ORDER BY id
+        """, (self._last_booking_id,))
+        for booking_id, room_no, check_in, check_out in cursor:
+            self._last_booking_id = booking_id
+            self._add_stay(booking_id, room_no, check_in, check_out)
+
+    def sync(self):
+        """Bring the index up to date with the database"""
+        with self._lock:
+            if self._last_change is not None:
+                # Nothing to replay or load: one primary-key lookup per table
+                newest, last_id = self.db.execute("""
+                    SELECT (SELECT COALESCE(MAX(seq), 0) FROM stay_changes),
+                           (SELECT COALESCE(MAX(id), 0) FROM bookings)
+                """).fetchone()
+                if newest == self._last_change and last_id <= self._last_booking_id:
+                    return
+            self._catch_up()
+
+    def _catch_up(self):
+        # One read transaction, so the log and the bookings agree
+        with self.db.transaction():
+            oldest, newest = self.db.execute(
+                "SELECT MIN(seq), COALESCE(MAX(seq), 0) FROM stay_changes").fetchone()
+            if self._last_change is None or (oldest is not None and oldest > self._last_change + 1):
+                self._rebuild(newest)
+                return
+            changed = set()
+            if newest > self._last_change:
+                for (booking_id,) in self.db.execute(
+                        "SELECT booking_id FROM stay_changes WHERE seq > ?", (self._last_change,)):
+                    if booking_id is None:
+                        self._rebuild(newest)
+                        return
+                    if booking_id <= self._last_booking_id:
+                        changed.add(booking_id)
+                self._last_change = newest
+            if changed:
+                for booking_id in changed:
+                    self._remove_stay(booking_id)
+                ids = sorted(changed)
+                for i in range(0, len(ids), RELOAD_BATCH):
+                    batch = ids[i:i + RELOAD_BATCH]
+                    cursor = self.db.execute(f"""
+                        SELECT id, room_no, check_in_date, check_out_date
+                        FROM bookings
+                        WHERE id IN ({", ".join("?" * len(batch))})
+                    """, batch)
+                    for row in cursor:
+                        self._add_stay(*row)
+            self._load_new()
+
+    def _add_stay(self, booking_id, room_no, check_in, check_out):
+        # Bookings for rooms outside the inventory are ignored
+        occupancy = self.occupancy.get(room_no)
+        if occupancy is None:
+            return
+        try:
+            start, end = date_ordinal(check_in), date_ordinal(check_out)
+        except ValueError:
+            return
+        # A same-day stay still blocks the room for that night
+        occupancy.add(start, max(end, start + 1), booking_id)
+        self._stays[booking_id] = (room_no, start)
+
+    def _remove_stay(self, booking_id):
+        stay = self._stays.pop(booking_id, None)
+        if stay is not None:
+            self.occupancy[stay[0]].remove(stay[1], booking_id)
+
+    def is_free(self, room_no, check_in, check_out):
+        self.sync()
+        start, end = date_ordinal(check_in), date_ordinal(check_out)
+        with self._lock:
+            occupancy = self.occupancy.get(room_no)
+            return occupancy is not None and occupancy.is_free(start, max(end, start + 1))
+
+    def available_rooms(self, room_type, check_in, check_out):
+        """Room numbers of room_type that are free for the whole stay"""
+        self.sync()
+        start, end = date_ordinal(check_in), date_ordinal(check_out)
+        end = max(end, start + 1)
+        with self._lock:
+            return [room_no for room_no in self.rooms_by_type.get(room_type, ())
+                    if self.occupancy[room_no].is_free(start, end)]
@@ -0,0 +1,411 @@
+"""
+Hotel Management System - Backup
+Online snapshots of the live and archive databases, with incremental deltas, verify and restore
+
+Usage:
+    python -m hotel.backup create DIR [--incremental] [--compress] [--pages 1024]
+    python -m hotel.backup list DIR
+    python -m hotel.backup verify DIR [SNAPSHOT] [--quick]
+    python -m hotel.backup restore DIR [SNAPSHOT]
+
+Each snapshot is a <name>.json manifest plus one file per database: a full
+copy (<name>.main.db) or the pages changed since the parent snapshot
+(<name>.main.delta), gzip-compressed with --compress. The manifest is
+written last, so an interrupted backup leaves no listed snapshot behind.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+
+from .db import DB_FILE, ConnectionManager, get_manager
+
+BACKUP_PAGES = 1024       # pages copied per backup step
+BACKUP_PAUSE = 0.002      # seconds slept between steps so app threads get the GIL and disk
+COMPRESS_LEVEL = 1        # gzip level; higher levels cost far more time than they save
+READ_PAGES = 256          # pages read per chunk when hashing a copy
+
+PAGE_HASH_SIZE = 8        # blake2b digest bytes kept per page to find changed pages
+DELTA_HEADER = struct.Struct(">4sII")    # magic, page size, page count
+DELTA_PAGE = struct.Struct(">I")         # page number before each changed page
+DELTA_MAGIC = b"HDLT"
+
+# ==================== SNAPSHOT FILES ====================
+
+def _open_out(path, compress):
+    if compress:
+        return gzip.open(path, "wb", compresslevel=COMPRESS_LEVEL)
+    return open(path, "wb")
+
+def _open_in(path):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+def _write_json(path, data):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+def read_manifest(directory, name):
+    with open(os.path.join(directory, f"{name}.json")) as f:
+        return json.load(f)
+
+def list_snapshots(directory):
+    """Manifests of the snapshots in directory, oldest first"""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(entry[:-5] for entry in os.listdir(directory)
+                   if entry.endswith(".json") and not entry.startswith("."))
+    return [read_manifest(directory, name) for name in names]
+
+def _new_name(directory):
+    """Timestamped snapshot name, unique within directory"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    name, n = stamp, 1
+    while os.path.exists(os.path.join(directory, f"{name}.json")):
+        n += 1
+        name = f"{stamp}-{n}"
+    return name
+
+# ==================== CREATE ====================
+
+def _stage(src, schema, staging, pages, pause):
+    """Copy one database of src into staging with the online backup API
+
+    Returns (page_size, page_count) of the copy.
+    """
+    dst = sqlite3.connect(staging, isolation_level=None)
+    try:
+        src.backup(dst, pages=pages, name=schema,
+                   progress=lambda status, remaining, total: time.sleep(pause))
+        # A self-contained file: no -wal needed to open the copy
+        dst.execute("PRAGMA journal_mode = DELETE")
+        return (dst.execute("PRAGMA page_size").fetchone()[0],
+                dst.execute("PRAGMA page_count").fetchone()[0])
+    finally:
+        dst.close()
+
+def _pack(staging, path, page_size, parent_hashes, compress, pause):
+    """Hash every page of staging and write it to path in full or as a delta
+
+    parent_hashes=None writes a full copy; otherwise only pages whose hash
+    differs from the parent's are written. Sleeps pause after every chunk:
+    compressing a large copy would otherwise starve the app's threads.
+    Returns (page_hashes, sha256, pages_written).
+    """
+    hashes = bytearray()
+    digest = hashlib.sha256()
+    written = 0
+    # An uncompressed full copy is the staging file itself
+    out = None
+    if parent_hashes is not None or compress:
+        out = _open_out(path, compress)
+    try:
+        with open(staging, "rb") as f:
+            if parent_hashes is not None:
+                page_count = os.fstat(f.fileno()).st_size // page_size
+                out.write(DELTA_HEADER.pack(DELTA_MAGIC, page_size, page_count))
+            pgno = 0
+            while True:
+                chunk = f.read(page_size * READ_PAGES)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                if parent_hashes is None and out is not None:
+                    out.write(chunk)
+                view = memoryview(chunk)
+                for offset in range(0, len(chunk), page_size):
+                    page = view[offset:offset + page_size]
+                    page_hash = hashlib.blake2b(page, digest_size=PAGE_HASH_SIZE).digest()
+                    if parent_hashes is not None:
+                        start = pgno * PAGE_HASH_SIZE
+                        if parent_hashes[start:start + PAGE_HASH_SIZE] != page_hash:
+                            out.write(DELTA_PAGE.pack(pgno + 1))
+                            out.write(page)
+                            written += 1
+                    hashes += page_hash
+                    pgno += 1
+                time.sleep(pause)
+    finally:
+        if out is not None:
+            out.close()
+    if out is None:
+        os.replace(staging, path)
+    if parent_hashes is None:
+        written = pgno
+    return bytes(hashes), digest.hexdigest(), written
+
+def create_snapshot(directory, db=None, incremental=False, compress=False,
+                    pages=BACKUP_PAGES, pause=BACKUP_PAUSE):
+    """Back up the live and archive databases into directory; returns the manifest
+
+    One read transaction spans the whole backup, so the live and archive
+    copies come from the same moment even while the app keeps writing. In
+    WAL mode readers never block writers; the only cost is that the WAL
+    cannot be checkpointed past that moment until the backup ends.
+
+    incremental=True stores only the pages changed since the newest
+    snapshot in directory (a full copy when there is none).
+    """
+    db = db or get_manager()
+    os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    name = _new_name(directory)
+    parent = None
+    if incremental:
+        snapshots = list_snapshots(directory)
+        parent = snapshots[-1] if snapshots else None
+
+    src = sqlite3.connect(db.db_file, isolation_level=None, timeout=30)
+    schemas = ["main"]
+    if db.archive_file and os.path.exists(db.archive_file):
+        src.execute("ATTACH DATABASE ? AS archive", (db.archive_file,))
+        schemas.append("archive")
+    staged = []
+    try:
+        src.execute("BEGIN")
+        for schema in schemas:
+            src.execute(f"SELECT COUNT(*) FROM {schema}.sqlite_master").fetchone()
+        manifest = {
+            "name": name,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "parent": parent["name"] if parent else None,
+            "schema_version": src.execute("PRAGMA user_version").fetchone()[0],
+            "databases": {},
+        }
+        copies = {}
+        for schema in schemas:
+            staging = os.path.join(directory, f".{name}.{schema}.staging")
+            staged.append(staging)
+            copies[schema] = (staging,) + _stage(src, schema, staging, pages, pause)
+        # The copies are consistent; hashing and compressing need no snapshot
+        src.execute("COMMIT")
+
+        for schema, (staging, page_size, page_count) in copies.items():
+            parent_entry = parent["databases"].get(schema) if parent else None
+            parent_hashes = None
+            if parent_entry and parent_entry["page_size"] == page_size:
+                with open(os.path.join(directory, parent_entry["hashes"]), "rb") as f:
+                    parent_hashes = f.read()
+            kind = "full" if parent_hashes is None else "delta"
+            suffix = ("db" if kind == "full" else "delta") + (".gz" if compress else "")
+            filename = f"{name}.{schema}.{suffix}"
+            hashes, digest, written = _pack(staging, os.path.join(directory, filename),
+                                            page_size, parent_hashes, compress, pause)
+            hash_file = f"{name}.{schema}.pages"
+            with open(os.path.join(directory, hash_file), "wb") as f:
+                f.write(hashes)
+            manifest["databases"][schema] = {
+                "kind": kind,
+                "file": filename,
+                "hashes": hash_file,
+                "page_size": page_size,
+                "page_count": page_count,
+                "pages_written": written,
+                "size": page_size * page_count,
+                "stored": os.path.getsize(os.path.join(directory, filename)),
+                "sha256": digest,
+            }
+    finally:
+        src.close()
+        for staging in staged:
+            if os.path.exists(staging):
+                os.remove(staging)
+    manifest["seconds"] = round(time.perf_counter() - start, 3)
+    _write_json(os.path.join(directory, f"{name}.json"), manifest)
+    return manifest
+
+# ==================== RESTORE ====================
+
+def _chain(directory, name, schema):
+    """Files to apply for one database, the full copy first"""
+    files = []
+    while name:
+        manifest = read_manifest(directory, name)
+        entry = manifest["databases"].get(schema)
+        if entry is None:
+            raise ValueError(f"Snapshot {name} has no {schema} database")
+        files.append(entry["file"])
+        if entry["kind"] == "full":
+            return files[::-1]
+        name = manifest["parent"]
+    raise ValueError(f"No full copy of {schema} before this snapshot")
+
+def _apply_chain(directory, files, path):
+    """Write the full copy files[0] to path, then apply the deltas after it"""
+    full, *deltas = files
+    with _open_in(os.path.join(directory, full)) as src, open(path, "wb") as out:
+        while True:
+            chunk = src.read(1024 * 1024)
+            if not chunk:
+                break
+            out.write(chunk)
+    with open(path, "r+b") as out:
+        for delta in deltas:
+            with _open_in(os.path.join(directory, delta)) as src:
+                magic, page_size, page_count = DELTA_HEADER.unpack(src.read(DELTA_HEADER.size))
+                if magic != DELTA_MAGIC:
+                    raise ValueError(f"{delta} is not a delta file")
+                while True:
+                    header = src.read(DELTA_PAGE.size)
+                    if not header:
+                        break
+                    (pgno,) = DELTA_PAGE.unpack(header)
+                    out.seek((pgno - 1) * page_size)
+                    out.write(src.read(page_size))
+                out.truncate(page_count * page_size)
+
+def _materialize(directory, name, schema, path):
+    """Rebuild one database of a snapshot into path; checks its sha256"""
+    entry = read_manifest(directory, name)["databases"][schema]
+    try:
+        _apply_chain(directory, _chain(directory, name, schema), path)
+    except (EOFError, gzip.BadGzipFile, struct.error) as e:
+        raise ValueError(f"Snapshot {name} {schema}: damaged file ({e})")
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(1024 * 1024)
+            if not chunk:
+                break
+            digest.update(chunk)
+    if digest.hexdigest() != entry["sha256"]:
+        raise ValueError(f"Snapshot {name} {schema}: checksum mismatch")
+    return entry
+
+def verify_snapshot(directory, name=None, quick=False):
+    """Rebuild a snapshot in a scratch directory and check it
+
+    Checks the sha256 of every rebuilt database and runs PRAGMA
+    integrity_check (quick_check with quick=True). Returns a dict per
+    database; raises ValueError when a file is missing or corrupt.
+    """
+    name = name or _latest(directory)
+    manifest = read_manifest(directory, name)
+    check = "quick_check" if quick else "integrity_check"
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        for schema in manifest["databases"]:
+            path = os.path.join(scratch, f"{schema}.db")
+            _materialize(directory, name, schema, path)
+            conn = sqlite3.connect(path)
+            try:
+                problems = [row[0] for row in conn.execute(f"PRAGMA {check}")]
+                tables = [row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' "
+                    "AND name IN ('bookings', 'charges')")]
+                counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                          for table in tables}
+            finally:
+                conn.close()
+            results[schema] = {"integrity": problems == ["ok"], "problems": problems[:10],
+                               "rows": counts}
+    return results
+
+def restore_snapshot(directory, name=None, db=None):
+    """Restore a snapshot over the live and archive databases
+
+    Every database is rebuilt and checksummed before anything is written,
+    then copied in with the backup API, so other connections see either
+    the old or the restored contents. Stop the app first, or restart it
+    afterwards: its caches still describe the old contents.
+    Returns the restored snapshot's manifest.
+    """
+    db = db or get_manager()
+    name = name or _latest(directory)
+    manifest = read_manifest(directory, name)
+    targets = {"main": db.db_file, "archive": db.archive_file}
+    with tempfile.TemporaryDirectory(dir=directory) as scratch:
+        rebuilt = {}
+        for schema in manifest["databases"]:
+            if not targets.get(schema):
+                continue
+            rebuilt[schema] = os.path.join(scratch, f"{schema}.db")
+            _materialize(directory, name, schema, rebuilt[schema])
+        for schema, path in rebuilt.items():
+            src = sqlite3.connect(path)
+            dst = sqlite3.connect(targets[schema], timeout=30)
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+                src.close()
+    return manifest
+
+def _latest(directory):
+    snapshots = list_snapshots(directory)
+    if not snapshots:
+        raise ValueError(f"No snapshots in {directory}")
+    return snapshots[-1]["name"]
+
+# ==================== CLI ====================
+
+def _describe(manifest):
+    parts = []
+    for schema, entry in manifest["databases"].items():
+        parts.append(f"{schema} {entry['kind']} {entry['pages_written']:,}/{entry['page_count']:,}"
+                     f" pages, {entry['stored'] / 1e6:,.1f} MB stored")
+    return f"{manifest['name']}  " + "; ".join(parts)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Online backup of the hotel database")
+    parser.add_argument("--db", default=DB_FILE, help="database file")
+    parser.add_argument("--archive", help="archive file (default: <db>_archive.db)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_create = sub.add_parser("create", help="take a snapshot while the app keeps running")
+    p_create.add_argument("directory")
+    p_create.add_argument("--incremental", action="store_true",
+                          help="store only pages changed since the newest snapshot")
+    p_create.add_argument("--compress", action="store_true", help="gzip the snapshot files")
+    p_create.add_argument("--pages", type=int, default=BACKUP_PAGES, help="pages per backup step")
+    p_create.add_argument("--pause", type=float, default=BACKUP_PAUSE,
+                          help="seconds to sleep between steps")
+    p_list = sub.add_parser("list", help="list snapshots")
+    p_list.add_argument("directory")
+    p_verify = sub.add_parser("verify", help="rebuild a snapshot and check it")
+    p_verify.add_argument("directory")
+    p_verify.add_argument("snapshot", nargs="?", help="snapshot name (default: newest)")
+    p_verify.add_argument("--quick", action="store_true", help="quick_check instead of integrity_check")
+    p_restore = sub.add_parser("restore", help="restore a snapshot over the database")
+    p_restore.add_argument("directory")
+    p_restore.add_argument("snapshot", nargs="?", help="snapshot name (default: newest)")
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for manifest in list_snapshots(args.directory):
+            print(_describe(manifest))
+        return 0
+    if args.command == "verify":
+        try:
+            results = verify_snapshot(args.directory, args.snapshot, args.quick)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+        ok = True
+        for schema, result in results.items():
+            ok = ok and result["integrity"]
+            print(f"{schema}: {'ok' if result['integrity'] else result['problems']} {result['rows']}")
+        return 0 if ok else 1
+
+    db = ConnectionManager(args.db, archive=args.archive or True)
+    if args.command == "create":
+        manifest = create_snapshot(args.directory, db, args.incremental, args.compress,
+                                   args.pages, args.pause)
+        size = sum(entry["size"] for entry in manifest["databases"].values())
+        print(_describe(manifest))
+        print(f"{size / 1e6:,.1f} MB in {manifest['seconds']:.1f} s "
+              f"({size / 1e6 / max(manifest['seconds'], 1e-9):,.0f} MB/s)")
+        return 0
+    manifest = restore_snapshot(args.directory, args.snapshot, db)
+    print(f"Restored {manifest['name']} into {args.db}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+"""
+Hotel Management System - Bulk Import / Export
+Streams CSV or JSON-lines bookings in and out of the database in batches
+
+Usage:
+    python -m hotel.bulk import bookings.csv [--rejects rejected.csv] [--batch-size 1000]
+    python -m hotel.bulk export bookings.jsonl
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from .core import check_stay, check_timestamp, next_room_no
+from .db import DB_FILE, ConnectionManager, existing_archive, get_manager
+from .records import ARCHIVED_BOOKINGS, BOOKING_COLUMNS, BOOKING_SELECT
+from .schema import init_database
+
+# ==================== FORMAT ====================
+
+CHARGE_COLUMNS = ("room_rent", "restaurant_bill", "laundry_bill", "game_bill",
+                  "service_charge")
+
+# Short names used by channel manager exports
+COLUMN_ALIASES = {
+    "check_in": "check_in_date",
+    "check_out": "check_out_date",
+}
+
+DEFAULT_BATCH_SIZE = 1000
+
+def detect_format(path):
+    """'csv' or 'jsonl' from the file extension
+
+    .json is refused rather than guessed: a JSON array document cannot be
+    streamed a record at a time, so convert it to one object per line.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if ext == ".json":
+        raise ValueError(f"{path}: JSON arrays are not supported; use JSON lines (.jsonl), "
+                         "one booking object per line")
+    raise ValueError(f"Cannot tell the format of {path}; use .csv or .jsonl")
+
+def read_records(stream, fmt):
+    """Yield (line_no, record) pairs; unparseable JSON yields the error instead"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, ValueError(f"invalid JSON: {e}")
+            continue
+        yield line_no, record
+
+# ==================== VALIDATION ====================
+
+def validate_booking(record):
+    """Normalize one input record into an insert tuple or raise ValueError
+
+    id and total_bill are ignored; the database assigns both.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+    fields = {COLUMN_ALIASES.get(key, key): value for key, value in record.items()
+              if key is not None}
+
+    def text(key):
+        value = fields.get(key)
+        if value is None:
+            return None
+        value = str(value).strip()
+        return value or None
+
+    name = text("name")
+    if not name:
+        raise ValueError("name is required")
+    check_in, check_out = text("check_in_date"), text("check_out_date")
+    if not check_in or not check_out:
+        raise ValueError("check_in_date and check_out_date are required")
+    # The same rule as create_booking: rollups, analytics and archiving
+    # all compare stays as YYYY-MM-DD text
+    check_stay(check_in, check_out)
+    created_at = text("created_at")
+    if created_at is not None:
+        check_timestamp(created_at)
+
+    room_no = text("room_no")
+    if room_no is not None:
+        try:
+            room_no = int(room_no)
+        except ValueError:
+            raise ValueError(f"bad room_no: {room_no!r}")
+        if room_no <= 0:
+            raise ValueError(f"bad room_no: {room_no}")
+
+    charges = []
+    for key in CHARGE_COLUMNS:
+        value = text(key)
+        if value is None:
+            charges.append(1800.0 if key == "service_charge" else 0.0)
+            continue
+        try:
+            amount = float(value)
+        except ValueError:
+            raise ValueError(f"bad {key}: {value!r}")
+        if amount < 0:
+            raise ValueError(f"negative {key}: {amount}")
+        charges.append(amount)
+
+    return (room_no, name, text("address"), check_in, check_out, text("room_type"),
+            *charges, created_at)
+
+# ==================== IMPORT ====================
+
+class RejectWriter:
+    """Writes rejected records, with line number and reason, in the input format"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, line_no, record, error):
+        if self.path is None:
+            self.count += 1
+            return
+        if self._file is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+        if self.fmt == "csv":
+            if self._writer is None:
+                fieldnames = ["line", "error"] + (list(record) if isinstance(record, dict) else [])
+                self._writer = csv.DictWriter(self._file, fieldnames=fieldnames,
+                                              extrasaction="ignore")
+                self._writer.writeheader()
+            row = dict(record) if isinstance(record, dict) else {}
+            row.update(line=line_no, error=str(error))
+            self._writer.writerow(row)
+        else:
+            self._file.write(json.dumps({"line": line_no, "error": str(error),
+                                         "record": record if isinstance(record, dict) else None}) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+# Positions of the ledger-backed charges in a validated row
+LEDGER_CHARGES = ((7, "restaurant"), (8, "laundry"), (9, "game"))
+CHECK_IN, CREATED_AT = 3, 11
+
+INSERT_BOOKING = """
+    INSERT INTO bookings (room_no, name, address, check_in_date, check_out_date,
+                          room_type, room_rent, restaurant_bill, laundry_bill,
+                          game_bill, service_charge, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+"""
+
+def _insert_batch(db, batch):
+    """Insert one batch in a single write transaction, assigning missing room numbers
+
+    Restaurant, laundry and game amounts are posted as opening ledger lines,
+    and the ledger triggers fill in the bookings columns. The lines are
+    dated when the booking was made (its check-in if that is unknown), so
+    historical balances land on their own day in the charge rollups.
+    """
+    with db.transaction("IMMEDIATE") as conn:
+        next_room = None
+        if any(row[0] is None for row in batch):
+            next_room = next_room_no(db)
+        cursor = conn.cursor()
+        plain = []
+        ledger = []
+        for row in batch:
+            row = list(row)
+            if row[0] is None:
+                row[0] = next_room
+                next_room += 1
+            lines = [(category, row[index]) for index, category in LEDGER_CHARGES if row[index]]
+            if not lines:
+                plain.append(row)
+                continue
+            for index, _ in LEDGER_CHARGES:
+                row[index] = 0.0
+            # Ledger lines need the booking's real id; rows queued before it
+            # go in first so ids follow the file order
+            if plain:
+                cursor.executemany(INSERT_BOOKING, plain)
+                plain = []
+            cursor.execute(INSERT_BOOKING, row)
+            posted_at = row[CREATED_AT] or row[CHECK_IN]
+            ledger.extend((cursor.lastrowid, category, amount, posted_at)
+                          for category, amount in lines)
+        if plain:
+            cursor.executemany(INSERT_BOOKING, plain)
+        db.executemany("""
+            INSERT INTO charges (booking_id, category, item, qty, unit_price, posted_at)
+            VALUES (?, ?, 'Imported balance', 1, ?, ?)
+        """, ledger)
+
+def import_bookings(path, fmt=None, db=None, batch_size=DEFAULT_BATCH_SIZE,
+                    rejects_path=None):
+    """Stream bookings from a CSV or JSON-lines file into the database
+
+    Rows are validated one at a time and inserted one transaction per
+    batch, so memory stays bounded by batch_size. Invalid rows go to
+    rejects_path. Returns {"imported": n, "rejected": n}.
+
+    Imports load historical data as it was: a given room_no is stored
+    without the availability check create_booking makes, so stays that
+    overlap each other or existing bookings are kept as they are.
+    """
+    db = db or get_manager()
+    fmt = fmt or detect_format(path)
+    init_database(db)
+
+    imported = 0
+    rejects = RejectWriter(rejects_path, fmt)
+    batch = []
+    try:
+        with open(path, newline="", encoding="utf-8") as stream:
+            for line_no, record in read_records(stream, fmt):
+                if isinstance(record, Exception):
+                    rejects.write(line_no, None, record)
+                    continue
+                try:
+                    batch.append(validate_booking(record))
+                except ValueError as e:
+                    rejects.write(line_no, record, e)
+                    continue
+                if len(batch) >= batch_size:
+                    _insert_batch(db, batch)
+                    imported += len(batch)
+                    batch = []
+        if batch:
+            _insert_batch(db, batch)
+            imported += len(batch)
+    finally:
+        rejects.close()
+    return {"imported": imported, "rejected": rejects.count}
+
+# ==================== EXPORT ====================
+
+def export_bookings(path, fmt=None, db=None, batch_size=DEFAULT_BATCH_SIZE):
+    """Write every booking to a CSV or JSON-lines file in constant memory
+
+    Archived bookings come first, then the live ones, each in id order.
+    """
+    db = db or get_manager()
+    fmt = fmt or detect_format(path)
+    init_database(db)
+    exported = 0
+    # One read transaction, so an archiving run cannot move rows between the
+    # two streams while they are exported
+    with db.transaction(), open(path, "w", newline="", encoding="utf-8") as out:
+        writer = None
+        if fmt == "csv":
+            writer = csv.writer(out)
+            writer.writerow(BOOKING_COLUMNS)
+        queries = [f"{BOOKING_SELECT} ORDER BY id"]
+        if db.archive_file:
+            queries.insert(0, f"{ARCHIVED_BOOKINGS} ORDER BY id")
+        for query in queries:
+            cursor = db.execute(query)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if writer is not None:
+                    writer.writerows(rows)
+                else:
+                    out.writelines(json.dumps(dict(zip(BOOKING_COLUMNS, row))) + "\n"
+                                   for row in rows)
+                exported += len(rows)
+    return exported
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import/export hotel bookings")
+    parser.add_argument("--db", default=DB_FILE, help="database file")
+    parser.add_argument("--archive",
+                        help="archive file to attach (default: <db>_archive.db if it exists)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="load bookings from CSV or JSON lines")
+    p_import.add_argument("path")
+    p_import.add_argument("--format", choices=("csv", "jsonl"))
+    p_import.add_argument("--rejects", help="file for rejected rows")
+    p_import.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    p_export = sub.add_parser("export", help="write all bookings to CSV or JSON lines")
+    p_export.add_argument("path")
+    p_export.add_argument("--format", choices=("csv", "jsonl"))
+
+    args = parser.parse_args(argv)
+    db = ConnectionManager(args.db, archive=args.archive or existing_archive(args.db))
+    try:
+        if args.command == "import":
+            result = import_bookings(args.path, args.format, db, args.batch_size,
+                                     args.rejects)
+            print(f"Imported {result['imported']:,} bookings, rejected {result['rejected']:,}")
+            return 1 if result["rejected"] else 0
+        count = export_bookings(args.path, args.format, db)
+        print(f"Exported {count:,} bookings to {args.path}")
+        return 0
+    finally:
+        db.close_all()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Hotel Management System - Booking Cache
+Read-through LRU cache with TTL and a memory cap for booking records
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+def record_size(record):
+    """Approximate bytes held by a flat dict record"""
+    return sys.getsizeof(record) + sum(sys.getsizeof(value) for value in record.values())
+
+class BookingCache:
+    """LRU cache of booking dicts keyed by booking id
+
+    Entries expire after ttl seconds, which bounds staleness from writers in
+    other processes; writes made through HotelManagement invalidate their
+    bookings immediately. The cache holds at most max_entries records and,
+    if max_bytes is set, at most that many (approximate) bytes.
+
+    Loads are guarded by a generation number: a record read from the
+    database is only stored if no invalidation happened while it was being
+    read, so a slow reader cannot put back a value a writer just replaced.
+    """
+
+    def __init__(self, max_entries=1024, ttl=2.0, max_bytes=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # booking_id -> (expires, size, record)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, booking_id):
+        """Cached copy of the record, or None"""
+        with self._lock:
+            entry = self._entries.get(booking_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] < time.monotonic():
+                self._drop(booking_id)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(booking_id)
+            self.hits += 1
+            return dict(entry[2])
+
+    def put(self, booking_id, record, generation):
+        """Store a record loaded while the cache was at `generation`"""
+        if self.max_entries <= 0:
+            return
+        size = record_size(record)
+        with self._lock:
+            if generation != self.generation:
+                return
+            if booking_id in self._entries:
+                self._drop(booking_id)
+            self._entries[booking_id] = (time.monotonic() + self.ttl, size, dict(record))
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or
+                                     (self.max_bytes and self._bytes > self.max_bytes)):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, booking_ids=None):
+        """Forget some bookings, or everything when booking_ids is None"""
+        with self._lock:
+            self.generation += 1
+            if booking_ids is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for booking_id in booking_ids:
+                if booking_id in self._entries:
+                    self._drop(booking_id)
+
+    def _drop(self, booking_id):
+        _, size, _ = self._entries.pop(booking_id)
+        self._bytes -= size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
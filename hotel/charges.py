@@ -0,0 +1,312 @@
+"""
+Hotel Management System - Charge Posting
+Itemized restaurant, laundry and game charges with write-behind and group commit
+"""
+
+import logging
+import math
+import sqlite3
+import threading
+import time
+from collections import Counter
+from concurrent.futures import Future, wait
+
+log = logging.getLogger(__name__)
+
+# Charge category -> bookings column it is added to
+CHARGE_COLUMNS = {
+    "restaurant": "restaurant_bill",
+    "laundry": "laundry_bill",
+    "game": "game_bill",
+}
+
+# Bounds on one ledger line. A negative amount is a correction of an
+# earlier line (a refund or a typo), so it is capped much lower.
+MAX_QTY = 1000
+MAX_LINE_AMOUNT = 1_000_000.0
+MAX_CORRECTION = 100_000.0
+
+def _number(value):
+    return (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value))
+
+def ledger_row(charge):
+    """Normalize a charge into a (booking_id, category, item, qty, unit_price) row
+
+    Accepts (booking_id, category, amount) for an unitemized amount or
+    (booking_id, category, item, qty, unit_price) for a menu item. qty
+    must be positive; a negative unit_price posts a correction, at most
+    MAX_CORRECTION per line. Raises ValueError for anything else.
+    """
+    if len(charge) == 3:
+        booking_id, category, amount = charge
+        row = (booking_id, category, None, 1, amount)
+    elif len(charge) == 5:
+        row = tuple(charge)
+    else:
+        raise ValueError(f"Bad charge: {charge!r}")
+    booking_id, category, item, qty, unit_price = row
+    if category not in CHARGE_COLUMNS:
+        raise ValueError(f"Unknown charge category: {category}")
+    if not isinstance(booking_id, int) or isinstance(booking_id, bool):
+        raise ValueError(f"Bad booking id: {booking_id!r}")
+    if item is not None and not isinstance(item, str):
+        raise ValueError(f"Bad item: {item!r}")
+    if not _number(qty) or not 0 < qty <= MAX_QTY:
+        raise ValueError(f"Bad quantity: {qty!r}")
+    if not _number(unit_price):
+        raise ValueError(f"Bad price: {unit_price!r}")
+    if not -MAX_CORRECTION <= qty * unit_price <= MAX_LINE_AMOUNT:
+        raise ValueError(f"Charge out of range: {qty} x {unit_price}")
+    return row
+
+# ==================== WRITE-BEHIND BUFFER ====================
+
+class ChargeBuffer:
+    """Collects charges in memory and posts them in one transaction
+
+    A flush happens when max_charges are pending or max_delay seconds after
+    the first pending charge, whichever comes first. Timed flushes run on
+    one long-lived thread so they reuse a single pooled connection. If a
+    flush fails the charges stay pending and last_error is set; the next
+    flush retries. Charges count as pending per booking until posted, so
+    readers flush only when the booking they read has some.
+    """
+
+    def __init__(self, post, max_charges=500, max_delay=1.0):
+        self.post = post
+        self.max_charges = max_charges
+        self.max_delay = max_delay
+        self.last_error = None
+        self._pending = []
+        self._pending_ids = Counter()    # booking_id -> charges not yet posted
+        self._deadline = None
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._flusher, name="hotel-charges",
+                                        daemon=True)
+        self._thread.start()
+
+    def add(self, *charge):
+        """Queue one charge, in any shape ledger_row() accepts"""
+        row = ledger_row(charge)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("ChargeBuffer is closed")
+            self._pending.append(row)
+            self._pending_ids[row[0]] += 1
+            full = len(self._pending) >= self.max_charges
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.max_delay
+                self._cond.notify()
+        if full:
+            self.flush()
+
+    def pending(self, booking_id=None):
+        """Charges not yet posted, in total or for one booking"""
+        with self._cond:
+            if booking_id is not None:
+                return self._pending_ids[booking_id]
+            return len(self._pending)
+
+    def flush(self):
+        """Post every pending charge now; returns the number posted"""
+        with self._flush_lock:
+            with self._cond:
+                charges, self._pending = self._pending, []
+                self._deadline = None
+            if not charges:
+                return 0
+            try:
+                self.post(charges)
+            except Exception as e:
+                self.last_error = e
+                with self._cond:
+                    self._pending[:0] = charges
+                    if self._deadline is None:
+                        self._deadline = time.monotonic() + self.max_delay
+                raise
+            with self._cond:
+                self._pending_ids -= Counter(row[0] for row in charges)
+            self.last_error = None
+            return len(charges)
+
+    def _flusher(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._deadline is None:
+                        self._cond.wait()
+                        continue
+                    remaining = self._deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception:
+                pass  # kept pending; last_error records why
+
+    def close(self):
+        """Flush and stop accepting charges"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+
+# ==================== GROUP COMMIT ====================
+
+class GroupCommitWriter:
+    """Single writer thread that commits charges from many callers together
+
+    Callers submit() a list of charges and get a Future. The writer posts
+    everything queued in one transaction, so concurrent posters share one
+    commit and one fsync; whatever arrives while a group is being written
+    forms the next group. interval adds a wait after the first queued entry
+    for more to join (useful on disks with slow fsync), cut short once
+    max_batch charges are queued. Futures resolve only after COMMIT returns: with the writer's
+    connection at synchronous=FULL an acknowledged charge survives a crash
+    or power loss. Each future's result is the number of ledger lines
+    written (charges for unknown bookings are skipped); a failed commit
+    fails every future in the group.
+    """
+
+    def __init__(self, db, interval=0.0, max_batch=1000, synchronous="FULL",
+                 on_commit=None):
+        self.db = db
+        self.interval = interval
+        self.max_batch = max_batch
+        self.synchronous = synchronous
+        self.on_commit = on_commit       # called with the booking ids of each group
+        self.groups = 0
+        self.committed = 0
+        self._queue = []                 # (rows, future)
+        self._queued_rows = 0
+        self._queued_ids = Counter()     # booking_id -> rows queued or being written
+        self._last = None                # future of the newest submission
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="hotel-group-commit",
+                                        daemon=True)
+        self._thread.start()
+
+    def submit(self, charges):
+        """Queue charges for the next group; returns a Future"""
+        rows = [ledger_row(charge) for charge in charges]
+        future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed")
+            self._queue.append((rows, future))
+            self._queued_rows += len(rows)
+            self._queued_ids.update(row[0] for row in rows)
+            self._last = future
+            if len(self._queue) == 1 or self._queued_rows >= self.max_batch:
+                self._cond.notify()
+        return future
+
+    def pending(self, booking_id=None):
+        """Rows not yet committed for booking_id; all queued rows without one"""
+        with self._cond:
+            if booking_id is not None:
+                return self._queued_ids[booking_id]
+            return self._queued_rows
+
+    def flush(self):
+        """Wait until everything submitted so far is committed"""
+        with self._cond:
+            last = self._last
+        # Groups commit in order, so the newest submission finishes last
+        if last is not None:
+            wait([last])
+
+    def stats(self):
+        with self._cond:
+            return {
+                "groups": self.groups,
+                "committed": self.committed,
+                "queued": self._queued_rows,
+                "mean_group": self.committed / self.groups if self.groups else 0.0,
+            }
+
+    def _next_group(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            deadline = time.monotonic() + self.interval
+            while self._queued_rows < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            group, self._queue = self._queue, []
+            self._queued_rows = 0
+            return group
+
+    def _writer(self):
+        while True:
+            group = self._next_group()
+            if group is None:
+                self.db.close()
+                return
+            try:
+                self._commit(group)
+            finally:
+                with self._cond:
+                    self._queued_ids -= Counter(row[0] for rows, _ in group for row in rows)
+
+    def _commit(self, group):
+        group = [(rows, future) for rows, future in group
+                 if future.set_running_or_notify_cancel()]
+        results = []
+        try:
+            # Set per group: the pool may have reopened the connection
+            self.db.execute(f"PRAGMA synchronous = {self.synchronous}")
+            with self.db.transaction("IMMEDIATE"):
+                for rows, future in group:
+                    # A bad row fails its own submission, not the group
+                    self.db.execute("SAVEPOINT submission")
+                    try:
+                        written = self.db.executemany("""
+                            INSERT INTO charges (booking_id, category, item, qty, unit_price)
+                            SELECT ?, ?, ?, ?, ?
+                            WHERE EXISTS (SELECT 1 FROM bookings WHERE id = ?)
+                        """, [row + (row[0],) for row in rows]).rowcount
+                    except sqlite3.DatabaseError as e:
+                        self.db.execute("ROLLBACK TO submission")
+                        results.append((future, None, e))
+                    else:
+                        results.append((future, written, None))
+                    self.db.execute("RELEASE submission")
+        except Exception as e:
+            for _, future in group:
+                future.set_exception(e)
+            return
+        self.groups += 1
+        self.committed += sum(written for _, written, error in results if error is None)
+        # Before the futures resolve, so a caller that waited reads its own
+        # charges; the charges are committed, so a failing hook must not
+        # fail them or stop the writer
+        if self.on_commit is not None:
+            try:
+                self.on_commit({row[0] for rows, _ in group for row in rows})
+            except Exception:
+                log.exception("GroupCommitWriter on_commit hook failed")
+        for future, written, error in results:
+            if error is None:
+                future.set_result(written)
+            else:
+                future.set_exception(error)
+
+    def close(self):
+        """Commit everything queued and stop the writer"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
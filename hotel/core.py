@@ -0,0 +1,478 @@
+"""
+Hotel Management System - Core
+Headless booking and billing logic; usable without Tk or a display
+"""
+
+import re
+from concurrent.futures import Future
+from datetime import date, datetime
+
+from .availability import ROOM_TYPES, AvailabilityIndex
+from .cache import BookingCache
+from .charges import ChargeBuffer, GroupCommitWriter, ledger_row
+from .db import get_manager
+from .pricing import Pricing, day_number
+from .rates import RateEngine, check_out_after
+from .records import (
+    ARCHIVED_BOOKINGS, ARCHIVED_CHARGES, BOOKING_COLUMNS, BOOKING_SELECT, Booking, BookingTable,
+)
+
+SEARCH_CANDIDATES = 1000   # newest matches ranked by search_bookings
+
+ID = BOOKING_COLUMNS.index("id")
+CREATED_AT = BOOKING_COLUMNS.index("created_at")
+
+# ==================== HOTEL MANAGEMENT CLASS ====================
+
+def check_stay(check_in, check_out):
+    """Raise ValueError unless the stay is two YYYY-MM-DD dates in order"""
+    try:
+        stay = [date.fromisoformat(day) for day in (check_in, check_out)]
+    except (TypeError, ValueError):
+        stay = None
+    if stay is None or [day.isoformat() for day in stay] != [check_in, check_out]:
+        raise ValueError(f"Dates must be YYYY-MM-DD, got {check_in!r} and {check_out!r}")
+    if stay[1] < stay[0]:
+        raise ValueError("Check-out date is before check-in date")
+
+def check_timestamp(value):
+    """Raise ValueError unless value is a 'YYYY-MM-DD HH:MM:SS' timestamp"""
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+    except (TypeError, ValueError):
+        parsed = None
+    if parsed is None or parsed.strftime("%Y-%m-%d %H:%M:%S") != value:
+        raise ValueError(f"Timestamps must be YYYY-MM-DD HH:MM:SS, got {value!r}")
+
+def next_room_no(db):
+    """First room number above every booked, archived and inventory room"""
+    archived = ("COALESCE((SELECT MAX(room_no) FROM archive.bookings), 0),"
+                if db.archive_file else "")
+    return db.execute(f"""
+        SELECT MAX(COALESCE((SELECT MAX(room_no) FROM main.bookings), 0), {archived}
+                   COALESCE((SELECT MAX(room_no) FROM rooms), 0)) + 1
+    """).fetchone()[0]
+
+class HotelManagement:
+    def __init__(self, db=None, cache_size=1024, cache_ttl=2.0, cache_max_bytes=None):
+        # Nothing touches the database until the first operation; call
+        # hotel.init_database() once at startup to create or upgrade it
+        self.db = db or get_manager()
+        self.room_no_count = 0
+        self.current_booking = None
+        self.availability = AvailabilityIndex(self.db)
+        self.charge_buffer = None
+        self.group_commit = None
+        # cache_size=0 disables caching; cache_ttl bounds how long writes
+        # from other processes can go unseen
+        self.cache = BookingCache(cache_size, cache_ttl, cache_max_bytes)
+        self.pricing = Pricing(self.db)
+        self.rates = RateEngine(self.pricing)
+    
+    def load_room_count(self):
+        """Load the highest room number from database"""
+        result = self.db.execute("SELECT MAX(room_no) FROM bookings").fetchone()
+        self.room_no_count = result[0] if result[0] else 0
+    
+    def get_next_room_no(self):
+        """Get the next available room number
+
+        Must run inside the write transaction that inserts the booking,
+        otherwise another writer can claim the same number. Numbers above
+        the rooms inventory are used so they never collide with real rooms.
+        """
+        self.room_no_count = next_room_no(self.db)
+        return self.room_no_count
+    
+    def create_booking(self, name, address, check_in, check_out, room_type=None):
+        """Create a new booking
+
+        check_in and check_out must be YYYY-MM-DD dates (ValueError
+        otherwise). With a room_type, a free room of that type from the
+        rooms inventory is assigned for the stay (ValueError if none is
+        free). Without one, a fresh room number is allocated as before.
+        """
+        check_stay(check_in, check_out)
+        # IMMEDIATE takes the write lock before choosing the room, so
+        # concurrent processes and threads serialize on allocation
+        with self.db.transaction("IMMEDIATE"):
+            if room_type:
+                free_rooms = self.availability.available_rooms(room_type, check_in, check_out)
+                if not free_rooms:
+                    raise ValueError(f"No {room_type} rooms available from {check_in} to {check_out}")
+                room_no = free_rooms[0]
+                self.room_no_count = max(self.room_no_count, room_no)
+            else:
+                room_no = self.get_next_room_no()
+            cursor = self.db.execute("""
+                INSERT INTO bookings (room_no, name, address, check_in_date, check_out_date, room_type)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (room_no, name, address, check_in, check_out, room_type))
+        return cursor.lastrowid, room_no
+    
+    def add_rooms(self, room_type, room_numbers):
+        """Add rooms of one type to the inventory"""
+        if room_type not in ROOM_TYPES:
+            raise ValueError(f"Unknown room type: {room_type}")
+        with self.db.transaction():
+            self.db.executemany("INSERT INTO rooms (room_no, room_type) VALUES (?, ?)",
+                                [(room_no, room_type) for room_no in room_numbers])
+    
+    def find_available_rooms(self, room_type, check_in, check_out):
+        """Room numbers of room_type free from check_in to check_out"""
+        return self.availability.available_rooms(room_type, check_in, check_out)
+    
+    def quote_stay(self, room_type, check_in, check_out):
+        """Room rent for a stay at the current rates, without booking it"""
+        return self.rates.quote(room_type, check_in, check_out)
+    
+    def update_room_rent(self, booking_id, room_type, nights=None):
+        """Update room rent for a booking
+
+        Each night of the booking's stored stay is priced against the rate
+        calendar (weekday, seasonal and promotional rates). nights, if
+        given, overrides the stored check-out: that many nights from
+        check-in are charged. Bookings from before dates were validated
+        may hold free text; they need nights, priced at today's base rate.
+        """
+        # IMMEDIATE: the read of the stay and the rent it prices commit as
+        # one write, never upgraded from a reader mid-transaction
+        with self.db.transaction("IMMEDIATE"):
+            row = self.db.execute("SELECT check_in_date, check_out_date FROM bookings WHERE id = ?",
+                                  (booking_id,)).fetchone()
+            if row is None:
+                raise ValueError(f"Booking {booking_id} not found")
+            check_in, check_out = row
+            try:
+                day_number(check_in)
+                if nights is None:
+                    day_number(check_out)
+            except ValueError:
+                if nights is None:
+                    raise ValueError(f"Booking {booking_id} has no YYYY-MM-DD stay dates "
+                                     f"({check_in!r} to {check_out!r}); enter the nights")
+                room_rent = self.pricing.current().price("room", room_type) * nights
+            else:
+                if nights is not None:
+                    check_out = check_out_after(check_in, nights)
+                room_rent = self.rates.quote(room_type, check_in, check_out)
+            self.db.execute("""
+                UPDATE bookings 
+                SET room_type = ?, room_rent = ?
+                WHERE id = ?
+            """, (room_type, room_rent, booking_id))
+        self.cache.invalidate([booking_id])
+        return room_rent
+    
+    def reprice_open_bookings(self, on=None):
+        """Re-price every booking not checked out by `on` (default today)
+
+        One read of the open stays, one batch of quotes and one batched
+        UPDATE in a single transaction; use after publishing new prices.
+        Stays whose room type has no price, or without YYYY-MM-DD dates,
+        are left alone. Returns the number of bookings whose rent changed.
+        """
+        on = on or date.today().isoformat()
+        with self.db.transaction("IMMEDIATE"):
+            stays = self.db.execute("""
+                SELECT id, room_type, check_in_date, check_out_date, room_rent
+                FROM bookings
+                WHERE room_type IS NOT NULL AND check_out_date >= ?
+            """, (on,)).fetchall()
+            quotes = self.rates.quote_many([(row[1], row[2], row[3]) for row in stays])
+            changed = [(rent, row[0]) for row, rent in zip(stays, quotes)
+                       if rent is not None and rent != row[4]]
+            self.db.executemany("UPDATE bookings SET room_rent = ? WHERE id = ?", changed)
+        if changed:
+            self.cache.invalidate([booking_id for _, booking_id in changed])
+        return len(changed)
+    
+    def post_charges(self, charges):
+        """Append charges to the ledger in one transaction
+
+        Each charge is (booking_id, category, amount) or (booking_id,
+        category, item, qty, unit_price); category is "restaurant",
+        "laundry" or "game". The matching bookings column is updated by a
+        ledger trigger. Charges for unknown bookings are skipped; returns
+        the number of ledger lines written.
+
+        In group commit mode the charges join the writer thread's next
+        group and this returns once that group is durably committed.
+        """
+        if self.group_commit is not None:
+            return self.group_commit.submit(charges).result()
+        rows = [ledger_row(charge) + (charge[0],) for charge in charges]
+        try:
+            with self.db.transaction():
+                cursor = self.db.executemany("""
+                    INSERT INTO charges (booking_id, category, item, qty, unit_price)
+                    SELECT ?, ?, ?, ?, ?
+                    WHERE EXISTS (SELECT 1 FROM bookings WHERE id = ?)
+                """, rows)
+        finally:
+            self.cache.invalidate({row[0] for row in rows})
+        return cursor.rowcount
+    
+    def submit_charges(self, charges):
+        """Post charges without waiting; returns a Future of the lines written
+
+        The future resolves when the charges are committed. Without group
+        commit they are posted before this returns.
+        """
+        if self.group_commit is not None:
+            return self.group_commit.submit(charges)
+        future = Future()
+        try:
+            future.set_result(self.post_charges(charges))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def post_catalog_charges(self, booking_id, category, quantities):
+        """Post items from the price list in effect today; returns the total
+
+        quantities maps item name to quantity (hours for games).
+        """
+        catalog = self.pricing.current()
+        lines = [(booking_id, category, item, qty, catalog.price(category, item))
+                 for item, qty in quantities.items() if qty > 0]
+        if not lines:
+            return 0
+        if not self.post_charges(lines):
+            raise ValueError(f"Booking {booking_id} not found")
+        return sum(qty * price for _, _, _, qty, price in lines)
+    
+    def enable_write_behind(self, max_charges=500, max_delay=1.0):
+        """Buffer charge updates and post them in batches"""
+        if self.charge_buffer is None:
+            self.charge_buffer = ChargeBuffer(self.post_charges, max_charges, max_delay)
+        return self.charge_buffer
+    
+    def enable_group_commit(self, interval=0.0, max_batch=1000, synchronous="FULL"):
+        """Commit charges from all threads together on one writer thread
+
+        Concurrent post_charges() callers (API workers, the GUI, the
+        write-behind buffer) share one transaction and one fsync; see
+        GroupCommitWriter for interval. The writer commits with
+        synchronous=FULL by default so an acknowledged charge survives
+        power loss.
+        """
+        if self.group_commit is None:
+            self.group_commit = GroupCommitWriter(self.db, interval, max_batch, synchronous,
+                                                  on_commit=self.cache.invalidate)
+        return self.group_commit
+    
+    def flush_charges(self, booking_id=None):
+        """Post any buffered charges now
+
+        With a booking_id, only if that booking has charges still pending,
+        so reads of other bookings never wait on a flush.
+        """
+        for writer in (self.charge_buffer, self.group_commit):
+            if writer is not None and (booking_id is None or writer.pending(booking_id)):
+                writer.flush()
+    
+    def close(self):
+        """Flush buffered charges and close database connections"""
+        if self.charge_buffer is not None:
+            self.charge_buffer.close()
+            self.charge_buffer = None
+        if self.group_commit is not None:
+            self.group_commit.close()
+            self.group_commit = None
+        self.db.close_all()
+    
+    def add_charge(self, *charge):
+        """Post one charge, through the write-behind buffer when enabled"""
+        if self.charge_buffer is not None:
+            self.charge_buffer.add(*charge)
+        else:
+            self.post_charges([charge])
+    
+    def update_restaurant_bill(self, booking_id, amount):
+        """Update restaurant bill"""
+        self.add_charge(booking_id, "restaurant", amount)
+    
+    def update_laundry_bill(self, booking_id, amount):
+        """Update laundry bill"""
+        self.add_charge(booking_id, "laundry", amount)
+    
+    def update_game_bill(self, booking_id, amount):
+        """Update game bill"""
+        self.add_charge(booking_id, "game", amount)
+    
+    def get_charges(self, booking_id):
+        """Ledger lines for a booking, oldest first (live or archived)"""
+        self.flush_charges(booking_id)
+        cursor = self.db.execute("""
+            SELECT posted_at, category, item, qty, unit_price
+            FROM charges
+            WHERE booking_id = ?
+            ORDER BY posted_at
+        """, (booking_id,))
+        lines = [dict(row) for row in cursor]
+        if not lines and self.db.archive_file:
+            cursor = self.db.execute("""
+                SELECT posted_at, category, item, qty, unit_price
+                FROM archive.charges
+                WHERE booking_id = ?
+                ORDER BY posted_at
+            """, (booking_id,))
+            lines = [dict(row) for row in cursor]
+        return lines
+    
+    def item_sales_report(self, start=None, end=None):
+        """Quantity and revenue per category and item, optionally by posting date
+
+        Archived ledger lines are included.
+        """
+        self.flush_charges()
+        ledger = "charges"
+        if self.db.archive_file:
+            columns = "category, item, qty, unit_price, posted_at"
+            ledger = (f"(SELECT {columns} FROM main.charges UNION ALL "
+                      f"{ARCHIVED_CHARGES.format(columns=columns)})")
+        cursor = self.db.execute(f"""
+            SELECT category, item, SUM(qty) AS qty, SUM(qty * unit_price) AS revenue
+            FROM {ledger}
+            WHERE posted_at >= COALESCE(?, '') AND posted_at < COALESCE(?, '9999-12-31')
+            GROUP BY category, item
+            ORDER BY category, item
+        """, (start, end))
+        return [dict(row) for row in cursor]
+    
+    def get_booking(self, booking_id):
+        """Get booking details, from the archive if it has been archived"""
+        self.flush_charges(booking_id)
+        booking = self.cache.get(booking_id)
+        if booking is not None:
+            return booking
+        generation = self.cache.generation
+        row = self.db.execute("SELECT * FROM bookings WHERE id = ?",
+                              (booking_id,)).fetchone()
+        if row is None and self.db.archive_file:
+            row = self.db.execute("SELECT * FROM archive.bookings WHERE id = ?",
+                                  (booking_id,)).fetchone()
+        if row is None:
+            return None
+        booking = dict(row)
+        self.cache.put(booking_id, booking, generation)
+        return booking
+    
+    def calculate_total(self, booking_id):
+        """Get the total bill (kept up to date by database triggers)"""
+        booking = self.get_booking(booking_id)
+        return booking['total_bill'] if booking else 0
+    
+    def get_bookings_page(self, limit=100, after=None, before=None):
+        """Get one page of bookings, newest first, using a (created_at, id) cursor
+
+        after: return bookings older than this key (scrolling down)
+        before: return bookings newer than this key (scrolling up)
+        """
+        return [dict(zip(BOOKING_COLUMNS, row))
+                for row in self._booking_rows(limit, after, before)]
+    
+    def _booking_rows(self, limit, after=None, before=None):
+        """One page of raw rows in BOOKING_COLUMNS order, newest first"""
+        if after is not None:
+            cursor = self.db.execute(f"""
+                {BOOKING_SELECT}
+                WHERE (created_at, id) < (?, ?)
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?
+            """, (after[0], after[1], limit))
+            return [tuple(row) for row in cursor]
+        if before is not None:
+            cursor = self.db.execute(f"""
+                {BOOKING_SELECT}
+                WHERE (created_at, id) > (?, ?)
+                ORDER BY created_at ASC, id ASC
+                LIMIT ?
+            """, (before[0], before[1], limit))
+            return [tuple(row) for row in cursor][::-1]
+        cursor = self.db.execute(f"""
+            {BOOKING_SELECT}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        """, (limit,))
+        return [tuple(row) for row in cursor]
+    
+    def _archived_rows(self, limit, after=None):
+        """One page of archived rows in BOOKING_COLUMNS order, newest first"""
+        cursor = self.db.execute(f"""
+            {ARCHIVED_BOOKINGS}
+              AND (created_at, id) < (?, ?)
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+        """, (after or ("9999-12-31", 0)) + (limit,))
+        return [tuple(row) for row in cursor]
+    
+    def _iter_booking_rows(self, batch_size, archived=False):
+        pages = [self._booking_rows]
+        if archived and self.db.archive_file:
+            pages.append(self._archived_rows)
+        for fetch in pages:
+            page = fetch(batch_size)
+            while page:
+                yield from page
+                if len(page) < batch_size:
+                    break
+                last = page[-1]
+                page = fetch(batch_size, after=(last[CREATED_AT], last[ID]))
+    
+    def search_bookings(self, text, limit=50):
+        """Bookings whose guest name or address matches text, best first
+
+        Every word must match the start of a word in the name or address,
+        so partial input finds results while it is being typed. Only the
+        newest SEARCH_CANDIDATES matches are ranked, which keeps very
+        common words (a city everyone lives in) fast.
+        """
+        query = search_query(text)
+        if not query:
+            return []
+        cursor = self.db.execute(f"""
+            {BOOKING_SELECT}
+            JOIN (SELECT rowid, rank FROM bookings_fts
+                  WHERE bookings_fts MATCH ? ORDER BY rowid DESC LIMIT ?) AS hits
+              ON bookings.id = hits.rowid
+            ORDER BY hits.rank
+            LIMIT ?
+        """, (query, SEARCH_CANDIDATES, limit))
+        return [dict(zip(BOOKING_COLUMNS, row)) for row in cursor]
+    
+    def iter_bookings(self, batch_size=500, format="dict", archived=False):
+        """Yield all bookings newest first, one page in memory at a time
+
+        format is "dict" (default) or "record" for compact Booking objects.
+        archived=True continues with the archived bookings, newest first,
+        after the live ones.
+        """
+        rows = self._iter_booking_rows(batch_size, archived)
+        if format == "dict":
+            return (dict(zip(BOOKING_COLUMNS, row)) for row in rows)
+        if format == "record":
+            return (Booking.from_row(row) for row in rows)
+        raise ValueError(f"Unknown booking format: {format}")
+    
+    def get_all_bookings(self, format="dict", archived=False):
+        """Get all live bookings (and archived ones with archived=True)
+
+        format "dict" returns a list of dicts, "record" a list of Booking
+        objects and "table" a columnar BookingTable; the compact formats use
+        a fraction of the memory for large result sets.
+        """
+        if format == "table":
+            table = BookingTable()
+            table.extend(self._iter_booking_rows(500, archived))
+            return table
+        return list(self.iter_bookings(format=format, archived=archived))
+
+def booking_key(booking):
+    """Keyset pagination cursor for a booking row"""
+    return (booking['created_at'], booking['id'])
+
+def search_query(text):
+    """FTS5 query requiring each word of text as a prefix, or "" if none"""
+    return " ".join(f'"{word}"*' for word in re.findall(r"\w+", text))
@@ -0,0 +1,170 @@
+"""
+Hotel Management System - Database Connection Layer
+Long-lived, per-thread SQLite connections with tuned pragmas and statement caching
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# ==================== CONFIGURATION ====================
+
+DB_FILE = "hotel_management.db"
+
+# Applied to every new connection. journal_mode is persistent in the file,
+# the rest are per-connection settings.
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,   # negative value means KiB
+    "busy_timeout": 5000,       # ms to wait on a locked database
+    "temp_store": "MEMORY",
+}
+
+# Number of prepared statements sqlite3 keeps per connection, keyed by SQL text
+STATEMENT_CACHE_SIZE = 256
+
+def archive_path(db_file):
+    """Archive database kept next to db_file: hotel_management_archive.db"""
+    root, ext = os.path.splitext(db_file)
+    return f"{root}_archive{ext or '.db'}"
+
+def existing_archive(db_file):
+    """archive_path(db_file) if that file exists, else None
+
+    Attaching creates the archive file, so tools that only read archived
+    bookings attach it when archive_bookings has already made one.
+    """
+    path = archive_path(db_file)
+    return path if os.path.exists(path) else None
+
+# ==================== CONNECTION MANAGER ====================
+
+class ConnectionManager:
+    """Per-thread pool of persistent SQLite connections
+
+    Each thread gets its own connection the first time it touches the
+    database and keeps it until close() / close_all(). Connections run in
+    autocommit mode; writes are grouped with transaction().
+
+    With archive set, every connection also attaches the archive database
+    as schema "archive" (creating the file if needed): archive=True uses
+    archive_path(db_file) and a string names another file. Reads only
+    reach archived bookings through a manager that attaches it.
+    """
+
+    def __init__(self, db_file=DB_FILE, pragmas=None,
+                 statement_cache_size=STATEMENT_CACHE_SIZE, archive=False):
+        self.db_file = db_file
+        if archive is True:
+            archive = archive_path(db_file) if db_file != ":memory:" else None
+        self.archive_file = archive or None
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        if pragmas:
+            self.pragmas.update(pragmas)
+        self.statement_cache_size = statement_cache_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._generation = 0
+
+    def _connect(self):
+        """Open and configure a new connection"""
+        conn = sqlite3.connect(self.db_file,
+                               isolation_level=None,
+                               check_same_thread=False,
+                               cached_statements=self.statement_cache_size)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            if value is None:
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+        if self.archive_file:
+            # Attached after the pragmas so the archive keeps SQLite's small
+            # default page cache; the main database gets the large one
+            conn.execute("ATTACH DATABASE ? AS archive", (self.archive_file,))
+        return conn
+
+    def connection(self):
+        """Return the calling thread's connection, opening it if needed"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            conn = self._connect()
+            self._local.conn = conn
+            self._local.depth = 0
+            self._local.generation = self._generation
+            with self._lock:
+                self._connections[threading.get_ident()] = conn
+        return conn
+
+    def execute(self, sql, params=()):
+        """Execute a statement on the thread's connection and return the cursor"""
+        return self.connection().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        """Execute a statement for every parameter tuple"""
+        return self.connection().executemany(sql, seq_of_params)
+
+    @contextmanager
+    def transaction(self, mode="DEFERRED"):
+        """Run the block in a single transaction (nested blocks join the outer one)"""
+        conn = self.connection()
+        if self._local.depth:
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn.execute(f"BEGIN {mode}")
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+        finally:
+            self._local.depth = 0
+
+    def close(self):
+        """Close the calling thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            with self._lock:
+                self._connections.pop(threading.get_ident(), None)
+            conn.close()
+            self._local.conn = None
+
+    def close_all(self):
+        """Close every connection opened by this manager"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+    def pool_size(self):
+        """Number of open connections across all threads"""
+        with self._lock:
+            return len(self._connections)
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+def get_manager():
+    """Return the shared ConnectionManager for DB_FILE"""
+    global _default_manager
+    if _default_manager is None:
+        with _default_lock:
+            if _default_manager is None:
+                _default_manager = ConnectionManager(DB_FILE)
+    return _default_manager
@@ -0,0 +1,945 @@
+"""
+Hotel Management System - Tk GUI
+Desktop front desk application built on the headless hotel core
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext
+from datetime import datetime
+
+from .core import HotelManagement, booking_key, check_stay
+from .db import DB_FILE, ConnectionManager, existing_archive
+from .instrument import from_environment
+from .receipts import render_receipt
+from .schema import init_database
+from .tasks import TaskExecutor
+
+# ==================== THEME COLORS ====================
+
+PRIMARY_BG = "#1a1a2e"
+SECONDARY_BG = "#16213e"
+CARD_BG = "#0f3460"
+ACCENT_COLOR = "#e94560"
+SUCCESS_COLOR = "#00d9ff"
+TEXT_COLOR = "#ffffff"
+BUTTON_HOVER = "#c73954"
+INPUT_BG = "#16213e"
+
+# ==================== ALL BOOKINGS VIEW ====================
+
+BOOKINGS_PAGE_SIZE = 100   # rows fetched per keyset page
+BOOKINGS_WINDOW = 300      # max rows kept in the Treeview at once
+BOOKINGS_PREFETCH = 0.2    # fetch the next page within this scroll fraction of an edge
+SEARCH_DEBOUNCE_MS = 250   # wait for a pause in typing before searching
+SEARCH_LIMIT = 100         # guests shown for a search
+
+TASK_STATUS_MS = 500       # status bar refresh interval
+
+# ==================== GUI APPLICATION ====================
+
+class HotelManagementApp:
+    def __init__(self, root, db=None):
+        self.root = root
+        self.hotel = HotelManagement(db)
+        # HOTEL_METRICS=metrics.json times data access and Tk callbacks;
+        # F12 writes a snapshot, and one is written on exit
+        self.metrics, self.metrics_path = from_environment(self.hotel, tk=True)
+        self.tasks = TaskExecutor(root, on_error=self.show_task_error)
+        if self.metrics is not None:
+            self.metrics.attach_tasks(self.tasks)
+            self.root.bind("<F12>", self.export_metrics)
+        self.current_booking_id = None
+        # Menus are built from the price list in effect at startup; charges
+        # are always priced from the current catalog when they are posted
+        self.catalog = self.hotel.pricing.current()
+        self.setup_window()
+        self.create_main_ui()
+        self.update_task_status()
+    
+    def show_task_error(self, error):
+        """Fallback error handler for background database tasks"""
+        messagebox.showerror("Error", f"Database operation failed: {str(error)}")
+    
+    def export_metrics(self, event=None):
+        """Write an instrumentation snapshot to HOTEL_METRICS"""
+        self.metrics.export(self.metrics_path)
+        messagebox.showinfo("Metrics", f"Metrics snapshot written to {self.metrics_path}")
+    
+    def update_task_status(self):
+        """Show background task and cache metrics in the status bar"""
+        stats = self.tasks.stats()
+        cache = self.hotel.cache.stats()
+        self.task_status.config(
+            text=f"DB tasks: {stats['in_flight']} running | {stats['queue_depth']} queued"
+                 f" | {stats['completed']} done | {stats['failed']} failed"
+                 f" | Cache: {cache['hit_rate']:.0%} hits, {cache['entries']} bookings"
+        )
+        self.root.after(TASK_STATUS_MS, self.update_task_status)
+    
+    def setup_window(self):
+        """Configure main window"""
+        self.root.title("🏨 Thunder Hotel Management System")
+        self.root.geometry("1200x700")
+        self.root.minsize(1000, 600)
+        self.root.configure(bg=PRIMARY_BG)
+        
+        # Center window
+        self.root.update_idletasks()
+        width = self.root.winfo_width()
+        height = self.root.winfo_height()
+        x = (self.root.winfo_screenwidth() // 2) - (width // 2)
+        y = (self.root.winfo_screenheight() // 2) - (height // 2)
+        self.root.geometry(f'{width}x{height}+{x}+{y}')
+    
+    def create_main_ui(self):
+        """Create main user interface"""
+        # Header
+        header = tk.Frame(self.root, bg=PRIMARY_BG, pady=20)
+        header.pack(fill="x")
+        
+        title = tk.Label(header, 
+                        text="🏨 Thunder Hotel Management System",
+                        font=('Arial', 28, 'bold'),
+                        bg=PRIMARY_BG, fg=ACCENT_COLOR)
+        title.pack()
+        
+        subtitle = tk.Label(header,
+                           text="Professional Hotel Management Solution",
+                           font=('Arial', 12),
+                           bg=PRIMARY_BG, fg=TEXT_COLOR)
+        subtitle.pack(pady=5)
+        
+        # Main container with notebook (tabs)
+        main_container = tk.Frame(self.root, bg=PRIMARY_BG)
+        main_container.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        # Create notebook style
+        style = ttk.Style()
+        style.theme_use('clam')
+        style.configure('TNotebook', background=PRIMARY_BG, borderwidth=0)
+        style.configure('TNotebook.Tab', 
+                       background=SECONDARY_BG,
+                       foreground=TEXT_COLOR,
+                       padding=[20, 10],
+                       font=('Arial', 11, 'bold'))
+        style.map('TNotebook.Tab',
+                 background=[('selected', ACCENT_COLOR)],
+                 foreground=[('selected', TEXT_COLOR)])
+        
+        notebook = ttk.Notebook(main_container)
+        notebook.pack(fill="both", expand=True)
+        
+        # Create tabs
+        self.tab_customer = tk.Frame(notebook, bg=PRIMARY_BG)
+        self.tab_room = tk.Frame(notebook, bg=PRIMARY_BG)
+        self.tab_restaurant = tk.Frame(notebook, bg=PRIMARY_BG)
+        self.tab_laundry = tk.Frame(notebook, bg=PRIMARY_BG)
+        self.tab_games = tk.Frame(notebook, bg=PRIMARY_BG)
+        self.tab_bill = tk.Frame(notebook, bg=PRIMARY_BG)
+        self.tab_bookings = tk.Frame(notebook, bg=PRIMARY_BG)
+        
+        notebook.add(self.tab_customer, text="👤 Customer Data")
+        notebook.add(self.tab_room, text="🛏️ Room Booking")
+        notebook.add(self.tab_restaurant, text="🍽️ Restaurant")
+        notebook.add(self.tab_laundry, text="👔 Laundry")
+        notebook.add(self.tab_games, text="🎮 Games")
+        notebook.add(self.tab_bill, text="💰 Bill")
+        notebook.add(self.tab_bookings, text="📋 All Bookings")
+        
+        # Setup each tab
+        self.setup_customer_tab()
+        self.setup_room_tab()
+        self.setup_restaurant_tab()
+        self.setup_laundry_tab()
+        self.setup_games_tab()
+        self.setup_bill_tab()
+        self.setup_bookings_tab()
+        
+        # Status bar
+        self.task_status = tk.Label(self.root, text="", anchor="w",
+                                    font=('Arial', 9),
+                                    bg=PRIMARY_BG, fg=TEXT_COLOR)
+        self.task_status.pack(fill="x", side="bottom", padx=20, pady=(0, 5))
+    
+    def setup_customer_tab(self):
+        """Setup customer data entry tab"""
+        frame = tk.Frame(self.tab_customer, bg=PRIMARY_BG)
+        frame.pack(expand=True, fill="both", padx=30, pady=20)
+        
+        title = tk.Label(frame, text="Customer Information",
+                        font=('Arial', 20, 'bold'),
+                        bg=PRIMARY_BG, fg=ACCENT_COLOR)
+        title.pack(pady=10)
+        
+        # Form fields
+        form_frame = tk.Frame(frame, bg=CARD_BG, padx=30, pady=20)
+        form_frame.pack(expand=True, fill="both")
+        
+        # Name
+        tk.Label(form_frame, text="Full Name *", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).grid(
+                row=0, column=0, sticky="w", pady=10, padx=10)
+        self.name_entry = tk.Entry(form_frame, font=('Arial', 12), 
+                                   width=40, bg=INPUT_BG, fg=TEXT_COLOR,
+                                   insertbackground=TEXT_COLOR)
+        self.name_entry.grid(row=0, column=1, pady=10, padx=10)
+        
+        # Address
+        tk.Label(form_frame, text="Address", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).grid(
+                row=1, column=0, sticky="w", pady=10, padx=10)
+        self.address_entry = tk.Entry(form_frame, font=('Arial', 12), 
+                                      width=40, bg=INPUT_BG, fg=TEXT_COLOR,
+                                      insertbackground=TEXT_COLOR)
+        self.address_entry.grid(row=1, column=1, pady=10, padx=10)
+        
+        # Check-in date
+        tk.Label(form_frame, text="Check-in Date *", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).grid(
+                row=2, column=0, sticky="w", pady=10, padx=10)
+        self.checkin_entry = tk.Entry(form_frame, font=('Arial', 12), 
+                                      width=40, bg=INPUT_BG, fg=TEXT_COLOR,
+                                      insertbackground=TEXT_COLOR)
+        self.checkin_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        self.checkin_entry.grid(row=2, column=1, pady=10, padx=10)
+        
+        # Check-out date
+        tk.Label(form_frame, text="Check-out Date *", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).grid(
+                row=3, column=0, sticky="w", pady=10, padx=10)
+        self.checkout_entry = tk.Entry(form_frame, font=('Arial', 12), 
+                                      width=40, bg=INPUT_BG, fg=TEXT_COLOR,
+                                      insertbackground=TEXT_COLOR)
+        self.checkout_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        self.checkout_entry.grid(row=3, column=1, pady=10, padx=10)
+        
+        # Status label
+        self.customer_status = tk.Label(form_frame, text="",
+                                       font=('Arial', 11),
+                                       bg=CARD_BG, fg=SUCCESS_COLOR)
+        self.customer_status.grid(row=4, column=0, columnspan=2, pady=10)
+        
+        # Submit button
+        submit_btn = tk.Button(form_frame, text="Create Booking",
+                              font=('Arial', 14, 'bold'),
+                              bg=ACCENT_COLOR, fg=TEXT_COLOR,
+                              activebackground=BUTTON_HOVER,
+                              activeforeground=TEXT_COLOR,
+                              cursor="hand2", width=20, height=2,
+                              command=self.create_customer_booking)
+        submit_btn.grid(row=5, column=0, columnspan=2, pady=20)
+    
+    def create_customer_booking(self):
+        """Create a new customer booking"""
+        name = self.name_entry.get().strip()
+        address = self.address_entry.get().strip()
+        check_in = self.checkin_entry.get().strip()
+        check_out = self.checkout_entry.get().strip()
+        
+        if not name or not check_in or not check_out:
+            messagebox.showwarning("Validation", 
+                                 "Please fill in all required fields (Name, Check-in, Check-out)!")
+            return
+        try:
+            check_stay(check_in, check_out)
+        except ValueError as e:
+            messagebox.showwarning("Validation", str(e))
+            return
+        
+        def on_created(result):
+            booking_id, room_no = result
+            self.current_booking_id = booking_id
+            self.customer_status.config(
+                text=f"✅ Booking created successfully! Room No: {room_no} | Booking ID: {booking_id}",
+                fg=SUCCESS_COLOR
+            )
+            messagebox.showinfo("Success", 
+                              f"Booking created successfully!\nRoom No: {room_no}\nBooking ID: {booking_id}")
+            # Clear form
+            self.name_entry.delete(0, tk.END)
+            self.address_entry.delete(0, tk.END)
+            self.checkin_entry.delete(0, tk.END)
+            self.checkin_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+            self.checkout_entry.delete(0, tk.END)
+            self.checkout_entry.insert(0, datetime.now().strftime("%Y-%m-%d"))
+        
+        self.tasks.submit(
+            lambda: self.hotel.create_booking(name, address, check_in, check_out),
+            on_success=on_created,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to create booking: {str(e)}")
+        )
+    
+    def setup_room_tab(self):
+        """Setup room booking tab"""
+        frame = tk.Frame(self.tab_room, bg=PRIMARY_BG)
+        frame.pack(expand=True, fill="both", padx=30, pady=20)
+        
+        title = tk.Label(frame, text="Room Booking",
+                        font=('Arial', 20, 'bold'),
+                        bg=PRIMARY_BG, fg=ACCENT_COLOR)
+        title.pack(pady=10)
+        
+        # Room types
+        room_frame = tk.Frame(frame, bg=CARD_BG, padx=30, pady=20)
+        room_frame.pack(expand=True, fill="both")
+        
+        tk.Label(room_frame, text="Available Room Types:",
+                font=('Arial', 14, 'bold'),
+                bg=CARD_BG, fg=TEXT_COLOR).pack(pady=10)
+        
+        rooms_info = [(room.item, f"Rs {room.price:,.0f} per {room.unit}", room.description or "")
+                      for room in self.catalog.items("room")]
+        
+        for room_type, price, desc in rooms_info:
+            room_card = tk.Frame(room_frame, bg=SECONDARY_BG, padx=15, pady=10)
+            room_card.pack(fill="x", pady=5)
+            tk.Label(room_card, text=f"{room_type} - {price}",
+                    font=('Arial', 12, 'bold'),
+                    bg=SECONDARY_BG, fg=ACCENT_COLOR).pack(anchor="w")
+            tk.Label(room_card, text=desc,
+                    font=('Arial', 10),
+                    bg=SECONDARY_BG, fg=TEXT_COLOR).pack(anchor="w")
+        
+        # Booking form
+        form_frame = tk.Frame(room_frame, bg=CARD_BG)
+        form_frame.pack(pady=20)
+        
+        tk.Label(form_frame, text="Booking ID:", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).grid(
+                row=0, column=0, sticky="w", pady=10, padx=10)
+        self.room_booking_id = tk.Entry(form_frame, font=('Arial', 12), 
+                                       width=20, bg=INPUT_BG, fg=TEXT_COLOR,
+                                       insertbackground=TEXT_COLOR)
+        self.room_booking_id.grid(row=0, column=1, pady=10, padx=10)
+        
+        tk.Label(form_frame, text="Room Type:", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).grid(
+                row=1, column=0, sticky="w", pady=10, padx=10)
+        room_types = [room_type for room_type, _, _ in rooms_info]
+        self.room_type_var = tk.StringVar(value=room_types[0] if room_types else "")
+        room_type_menu = ttk.Combobox(form_frame, textvariable=self.room_type_var,
+                                     values=room_types,
+                                     state="readonly", width=17)
+        room_type_menu.grid(row=1, column=1, pady=10, padx=10)
+        
+        tk.Label(form_frame, text="Nights (blank = booked stay):", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).grid(
+                row=2, column=0, sticky="w", pady=10, padx=10)
+        self.nights_entry = tk.Entry(form_frame, font=('Arial', 12), 
+                                    width=20, bg=INPUT_BG, fg=TEXT_COLOR,
+                                    insertbackground=TEXT_COLOR)
+        self.nights_entry.grid(row=2, column=1, pady=10, padx=10)
+        
+        self.room_status = tk.Label(form_frame, text="",
+                                   font=('Arial', 11),
+                                   bg=CARD_BG, fg=SUCCESS_COLOR)
+        self.room_status.grid(row=3, column=0, columnspan=2, pady=10)
+        
+        tk.Button(form_frame, text="Calculate Room Rent",
+                 font=('Arial', 12, 'bold'),
+                 bg=ACCENT_COLOR, fg=TEXT_COLOR,
+                 activebackground=BUTTON_HOVER,
+                 activeforeground=TEXT_COLOR,
+                 cursor="hand2", width=20,
+                 command=self.calculate_room_rent).grid(
+                 row=4, column=0, columnspan=2, pady=20)
+    
+    def calculate_room_rent(self):
+        """Calculate room rent"""
+        try:
+            booking_id = int(self.room_booking_id.get().strip())
+            # Blank prices the check-in to check-out dates stored on the booking
+            nights_text = self.nights_entry.get().strip()
+            nights = int(nights_text) if nights_text else None
+            room_type = self.room_type_var.get()
+            
+            if nights is not None and nights <= 0:
+                messagebox.showwarning("Validation", "Number of nights must be greater than 0!")
+                return
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid booking ID and number of nights!")
+            return
+        
+        def on_updated(room_rent):
+            self.room_status.config(
+                text=f"✅ Room rent calculated: Rs {room_rent:,.2f}",
+                fg=SUCCESS_COLOR
+            )
+            messagebox.showinfo("Success", 
+                              f"Room rent calculated successfully!\nRoom Type: {room_type}\nNights: {nights or 'as booked'}\nTotal: Rs {room_rent:,.2f}")
+        
+        self.tasks.submit(
+            lambda: self.hotel.update_room_rent(booking_id, room_type, nights),
+            on_success=on_updated,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to calculate room rent: {str(e)}")
+        )
+    
+    def setup_restaurant_tab(self):
+        """Setup restaurant tab"""
+        frame = tk.Frame(self.tab_restaurant, bg=PRIMARY_BG)
+        frame.pack(expand=True, fill="both", padx=30, pady=20)
+        
+        title = tk.Label(frame, text="Restaurant Menu",
+                        font=('Arial', 20, 'bold'),
+                        bg=PRIMARY_BG, fg=ACCENT_COLOR)
+        title.pack(pady=10)
+        
+        # Menu items
+        menu_frame = tk.Frame(frame, bg=CARD_BG, padx=30, pady=20)
+        menu_frame.pack(expand=True, fill="both")
+        
+        menu_items = [(item.item, item.price) for item in self.catalog.items("restaurant")]
+        
+        self.restaurant_items = {}
+        for i, (item, price) in enumerate(menu_items):
+            item_frame = tk.Frame(menu_frame, bg=SECONDARY_BG, padx=15, pady=10)
+            item_frame.pack(fill="x", pady=5)
+            
+            tk.Label(item_frame, text=f"{item} - Rs {price:g}",
+                    font=('Arial', 12, 'bold'),
+                    bg=SECONDARY_BG, fg=ACCENT_COLOR).pack(side="left", padx=10)
+            
+            quantity_var = tk.StringVar(value="0")
+            quantity_entry = tk.Entry(item_frame, textvariable=quantity_var,
+                                     width=10, bg=INPUT_BG, fg=TEXT_COLOR,
+                                     insertbackground=TEXT_COLOR)
+            quantity_entry.pack(side="right", padx=10)
+            
+            self.restaurant_items[item] = (price, quantity_var)
+        
+        # Booking ID and calculate
+        calc_frame = tk.Frame(menu_frame, bg=CARD_BG)
+        calc_frame.pack(pady=20)
+        
+        tk.Label(calc_frame, text="Booking ID:", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).pack(side="left", padx=10)
+        self.restaurant_booking_id = tk.Entry(calc_frame, font=('Arial', 12), 
+                                             width=15, bg=INPUT_BG, fg=TEXT_COLOR,
+                                             insertbackground=TEXT_COLOR)
+        self.restaurant_booking_id.pack(side="left", padx=10)
+        
+        tk.Button(calc_frame, text="Add to Bill",
+                 font=('Arial', 12, 'bold'),
+                 bg=ACCENT_COLOR, fg=TEXT_COLOR,
+                 activebackground=BUTTON_HOVER,
+                 activeforeground=TEXT_COLOR,
+                 cursor="hand2", width=15,
+                 command=self.calculate_restaurant_bill).pack(side="left", padx=10)
+    
+    def calculate_restaurant_bill(self):
+        """Calculate restaurant bill"""
+        try:
+            booking_id = int(self.restaurant_booking_id.get().strip())
+            total = 0
+            quantities = {}
+            
+            for item, (price, quantity_var) in self.restaurant_items.items():
+                try:
+                    qty = int(quantity_var.get())
+                    if qty > 0:
+                        total += price * qty
+                        quantities[item] = qty
+                except ValueError:
+                    pass
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid booking ID!")
+            return
+        
+        if total <= 0:
+            messagebox.showwarning("Validation", "Please select at least one item!")
+            return
+        
+        def on_added(total):
+            messagebox.showinfo("Success", 
+                              f"Restaurant bill added!\nTotal: Rs {total:,.2f}")
+            # Reset quantities
+            for item, (price, quantity_var) in self.restaurant_items.items():
+                quantity_var.set("0")
+        
+        self.tasks.submit(
+            lambda: self.hotel.post_catalog_charges(booking_id, "restaurant", quantities),
+            on_success=on_added,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to calculate restaurant bill: {str(e)}")
+        )
+    
+    def setup_laundry_tab(self):
+        """Setup laundry tab"""
+        frame = tk.Frame(self.tab_laundry, bg=PRIMARY_BG)
+        frame.pack(expand=True, fill="both", padx=30, pady=20)
+        
+        title = tk.Label(frame, text="Laundry Service",
+                        font=('Arial', 20, 'bold'),
+                        bg=PRIMARY_BG, fg=ACCENT_COLOR)
+        title.pack(pady=10)
+        
+        menu_frame = tk.Frame(frame, bg=CARD_BG, padx=30, pady=20)
+        menu_frame.pack(expand=True, fill="both")
+        
+        laundry_items = [(item.item, item.price) for item in self.catalog.items("laundry")]
+        
+        self.laundry_items = {}
+        for item, price in laundry_items:
+            item_frame = tk.Frame(menu_frame, bg=SECONDARY_BG, padx=15, pady=10)
+            item_frame.pack(fill="x", pady=5)
+            
+            tk.Label(item_frame, text=f"{item} - Rs {price:g}",
+                    font=('Arial', 12, 'bold'),
+                    bg=SECONDARY_BG, fg=ACCENT_COLOR).pack(side="left", padx=10)
+            
+            quantity_var = tk.StringVar(value="0")
+            quantity_entry = tk.Entry(item_frame, textvariable=quantity_var,
+                                     width=10, bg=INPUT_BG, fg=TEXT_COLOR,
+                                     insertbackground=TEXT_COLOR)
+            quantity_entry.pack(side="right", padx=10)
+            
+            self.laundry_items[item] = (price, quantity_var)
+        
+        calc_frame = tk.Frame(menu_frame, bg=CARD_BG)
+        calc_frame.pack(pady=20)
+        
+        tk.Label(calc_frame, text="Booking ID:", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).pack(side="left", padx=10)
+        self.laundry_booking_id = tk.Entry(calc_frame, font=('Arial', 12), 
+                                          width=15, bg=INPUT_BG, fg=TEXT_COLOR,
+                                          insertbackground=TEXT_COLOR)
+        self.laundry_booking_id.pack(side="left", padx=10)
+        
+        tk.Button(calc_frame, text="Add to Bill",
+                 font=('Arial', 12, 'bold'),
+                 bg=ACCENT_COLOR, fg=TEXT_COLOR,
+                 activebackground=BUTTON_HOVER,
+                 activeforeground=TEXT_COLOR,
+                 cursor="hand2", width=15,
+                 command=self.calculate_laundry_bill).pack(side="left", padx=10)
+    
+    def calculate_laundry_bill(self):
+        """Calculate laundry bill"""
+        try:
+            booking_id = int(self.laundry_booking_id.get().strip())
+            total = 0
+            quantities = {}
+            
+            for item, (price, quantity_var) in self.laundry_items.items():
+                try:
+                    qty = int(quantity_var.get())
+                    if qty > 0:
+                        total += price * qty
+                        quantities[item] = qty
+                except ValueError:
+                    pass
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid booking ID!")
+            return
+        
+        if total <= 0:
+            messagebox.showwarning("Validation", "Please select at least one item!")
+            return
+        
+        def on_added(total):
+            messagebox.showinfo("Success", 
+                              f"Laundry bill added!\nTotal: Rs {total:,.2f}")
+            for item, (price, quantity_var) in self.laundry_items.items():
+                quantity_var.set("0")
+        
+        self.tasks.submit(
+            lambda: self.hotel.post_catalog_charges(booking_id, "laundry", quantities),
+            on_success=on_added,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to calculate laundry bill: {str(e)}")
+        )
+    
+    def setup_games_tab(self):
+        """Setup games tab"""
+        frame = tk.Frame(self.tab_games, bg=PRIMARY_BG)
+        frame.pack(expand=True, fill="both", padx=30, pady=20)
+        
+        title = tk.Label(frame, text="Games & Recreation",
+                        font=('Arial', 20, 'bold'),
+                        bg=PRIMARY_BG, fg=ACCENT_COLOR)
+        title.pack(pady=10)
+        
+        menu_frame = tk.Frame(frame, bg=CARD_BG, padx=30, pady=20)
+        menu_frame.pack(expand=True, fill="both")
+        
+        game_items = [(item.item, item.price) for item in self.catalog.items("game")]
+        
+        self.game_items = {}
+        for item, price_per_hour in game_items:
+            item_frame = tk.Frame(menu_frame, bg=SECONDARY_BG, padx=15, pady=10)
+            item_frame.pack(fill="x", pady=5)
+            
+            tk.Label(item_frame, text=f"{item} - Rs {price_per_hour:g}/hour",
+                    font=('Arial', 12, 'bold'),
+                    bg=SECONDARY_BG, fg=ACCENT_COLOR).pack(side="left", padx=10)
+            
+            hours_var = tk.StringVar(value="0")
+            hours_entry = tk.Entry(item_frame, textvariable=hours_var,
+                                  width=10, bg=INPUT_BG, fg=TEXT_COLOR,
+                                  insertbackground=TEXT_COLOR)
+            hours_entry.pack(side="right", padx=10)
+            
+            self.game_items[item] = (price_per_hour, hours_var)
+        
+        calc_frame = tk.Frame(menu_frame, bg=CARD_BG)
+        calc_frame.pack(pady=20)
+        
+        tk.Label(calc_frame, text="Booking ID:", 
+                font=('Arial', 12), bg=CARD_BG, fg=TEXT_COLOR).pack(side="left", padx=10)
+        self.game_booking_id = tk.Entry(calc_frame, font=('Arial', 12), 
+                                       width=15, bg=INPUT_BG, fg=TEXT_COLOR,
+                                       insertbackground=TEXT_COLOR)
+        self.game_booking_id.pack(side="left", padx=10)
+        
+        tk.Button(calc_frame, text="Add to Bill",
+                 font=('Arial', 12, 'bold'),
+                 bg=ACCENT_COLOR, fg=TEXT_COLOR,
+                 activebackground=BUTTON_HOVER,
+                 activeforeground=TEXT_COLOR,
+                 cursor="hand2", width=15,
+                 command=self.calculate_game_bill).pack(side="left", padx=10)
+    
+    def calculate_game_bill(self):
+        """Calculate game bill"""
+        try:
+            booking_id = int(self.game_booking_id.get().strip())
+            total = 0
+            quantities = {}
+            
+            for item, (price_per_hour, hours_var) in self.game_items.items():
+                try:
+                    hours = int(hours_var.get())
+                    if hours > 0:
+                        total += price_per_hour * hours
+                        quantities[item] = hours
+                except ValueError:
+                    pass
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid booking ID!")
+            return
+        
+        if total <= 0:
+            messagebox.showwarning("Validation", "Please enter hours for at least one game!")
+            return
+        
+        def on_added(total):
+            messagebox.showinfo("Success", 
+                              f"Game bill added!\nTotal: Rs {total:,.2f}")
+            for item, (price_per_hour, hours_var) in self.game_items.items():
+                hours_var.set("0")
+        
+        self.tasks.submit(
+            lambda: self.hotel.post_catalog_charges(booking_id, "game", quantities),
+            on_success=on_added,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to calculate game bill: {str(e)}")
+        )
+    
+    def setup_bill_tab(self):
+        """Setup bill display tab"""
+        frame = tk.Frame(self.tab_bill, bg=PRIMARY_BG)
+        frame.pack(expand=True, fill="both", padx=30, pady=20)
+        
+        title = tk.Label(frame, text="Hotel Bill",
+                        font=('Arial', 20, 'bold'),
+                        bg=PRIMARY_BG, fg=ACCENT_COLOR)
+        title.pack(pady=10)
+        
+        # Bill display area
+        bill_frame = tk.Frame(frame, bg=CARD_BG, padx=30, pady=20)
+        bill_frame.pack(expand=True, fill="both")
+        
+        # Booking ID input
+        input_frame = tk.Frame(bill_frame, bg=CARD_BG)
+        input_frame.pack(pady=10)
+        
+        tk.Label(input_frame, text="Booking ID:", 
+                font=('Arial', 12, 'bold'),
+                bg=CARD_BG, fg=TEXT_COLOR).pack(side="left", padx=10)
+        self.bill_booking_id = tk.Entry(input_frame, font=('Arial', 12), 
+                                       width=20, bg=INPUT_BG, fg=TEXT_COLOR,
+                                       insertbackground=TEXT_COLOR)
+        self.bill_booking_id.pack(side="left", padx=10)
+        
+        tk.Button(input_frame, text="Generate Bill",
+                 font=('Arial', 12, 'bold'),
+                 bg=ACCENT_COLOR, fg=TEXT_COLOR,
+                 activebackground=BUTTON_HOVER,
+                 activeforeground=TEXT_COLOR,
+                 cursor="hand2", width=15,
+                 command=self.generate_bill).pack(side="left", padx=10)
+        
+        # Bill display
+        self.bill_text = scrolledtext.ScrolledText(bill_frame,
+                                                   font=('Courier', 11),
+                                                   bg=INPUT_BG, fg=TEXT_COLOR,
+                                                   width=70, height=25,
+                                                   wrap=tk.WORD)
+        self.bill_text.pack(expand=True, fill="both", pady=10)
+    
+    def generate_bill(self):
+        """Generate and display bill"""
+        try:
+            booking_id = int(self.bill_booking_id.get().strip())
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid booking ID!")
+            return
+        
+        # total_bill is maintained by the database, so one read is enough
+        self.tasks.submit(
+            lambda: self.hotel.get_booking(booking_id),
+            on_success=lambda booking: self.show_bill(booking_id, booking),
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to generate bill: {str(e)}"),
+            key="generate_bill"
+        )
+    
+    def show_bill(self, booking_id, booking):
+        """Display the receipt for a loaded booking"""
+        if not booking:
+            messagebox.showerror("Error", "Booking not found!")
+            return
+        
+        bill_content = render_receipt(booking)
+        
+        self.bill_text.delete(1.0, tk.END)
+        self.bill_text.insert(1.0, bill_content)
+    
+    def setup_bookings_tab(self):
+        """Setup all bookings display tab"""
+        frame = tk.Frame(self.tab_bookings, bg=PRIMARY_BG)
+        frame.pack(expand=True, fill="both", padx=30, pady=20)
+        
+        title_frame = tk.Frame(frame, bg=PRIMARY_BG)
+        title_frame.pack(fill="x", pady=10)
+        
+        tk.Label(title_frame, text="All Bookings",
+                font=('Arial', 20, 'bold'),
+                bg=PRIMARY_BG, fg=ACCENT_COLOR).pack(side="left")
+        
+        tk.Button(title_frame, text="Refresh",
+                 font=('Arial', 11, 'bold'),
+                 bg=ACCENT_COLOR, fg=TEXT_COLOR,
+                 activebackground=BUTTON_HOVER,
+                 activeforeground=TEXT_COLOR,
+                 cursor="hand2", width=12,
+                 command=self.refresh_bookings).pack(side="right")
+        
+        # Search as you type; queries run on the task executor
+        self.search_var = tk.StringVar()
+        self.search_after = None
+        self.search_var.trace_add("write", self.on_search_changed)
+        tk.Entry(title_frame, textvariable=self.search_var,
+                font=('Arial', 12), width=30, bg=INPUT_BG, fg=TEXT_COLOR,
+                insertbackground=TEXT_COLOR).pack(side="right", padx=10)
+        tk.Label(title_frame, text="Search guests:",
+                font=('Arial', 12), bg=PRIMARY_BG, fg=TEXT_COLOR).pack(side="right")
+        
+        # Treeview for bookings
+        columns = ("ID", "Room No", "Name", "Check-in", "Check-out", "Total Bill")
+        self.bookings_tree = ttk.Treeview(frame, columns=columns, show="headings", height=20)
+        
+        for col in columns:
+            self.bookings_tree.heading(col, text=col)
+            self.bookings_tree.column(col, width=120, anchor="center")
+        
+        self.bookings_scrollbar = ttk.Scrollbar(frame, orient="vertical",
+                                                command=self.bookings_tree.yview)
+        self.bookings_tree.configure(yscrollcommand=self.on_bookings_scroll)
+        
+        self.bookings_tree.pack(side="left", fill="both", expand=True)
+        self.bookings_scrollbar.pack(side="right", fill="y")
+        self.bookings_tree.bind("<Double-1>", self.select_booking_row)
+        
+        self.booking_keys = {}
+        self.bookings_generation = 0
+        self.bookings_at_start = True
+        self.bookings_at_end = True
+        self.bookings_loading = False
+        self.refresh_bookings()
+    
+    def refresh_bookings(self):
+        """Refresh bookings list"""
+        if self.search_var.get().strip():
+            self.run_booking_search()
+            return
+        # Pages still in flight from before the refresh are discarded
+        self.bookings_generation += 1
+        generation = self.bookings_generation
+        self.bookings_loading = True
+        
+        # Load the first window; the rest is fetched as the user scrolls.
+        # Repeated clicks while a refresh is queued collapse into one query.
+        self.tasks.submit(
+            lambda: self.hotel.get_bookings_page(BOOKINGS_PAGE_SIZE),
+            on_success=lambda page: self.show_first_bookings_page(page, generation),
+            on_error=self.bookings_load_failed,
+            key="refresh_bookings"
+        )
+    
+    def show_first_bookings_page(self, page, generation):
+        """Replace the Treeview contents with the newest bookings"""
+        if generation != self.bookings_generation:
+            return
+        # Clear existing items
+        self.bookings_tree.delete(*self.bookings_tree.get_children())
+        self.booking_keys = {}
+        for booking in page:
+            self.insert_booking_row(booking)
+        self.bookings_at_start = True
+        self.bookings_at_end = len(page) < BOOKINGS_PAGE_SIZE
+        self.bookings_loading = False
+    
+    def on_search_changed(self, *args):
+        """Restart the debounce timer on every keystroke"""
+        if self.search_after is not None:
+            self.root.after_cancel(self.search_after)
+        self.search_after = self.root.after(SEARCH_DEBOUNCE_MS, self.run_booking_search)
+    
+    def run_booking_search(self):
+        """Show guests matching the search box, or all bookings when it is empty"""
+        self.search_after = None
+        text = self.search_var.get().strip()
+        if not text:
+            self.refresh_bookings()
+            return
+        self.bookings_generation += 1
+        generation = self.bookings_generation
+        self.bookings_loading = True
+        # A search still queued is replaced by the newer text
+        self.tasks.submit(
+            lambda: self.hotel.search_bookings(text, SEARCH_LIMIT),
+            on_success=lambda results: self.show_search_results(results, generation),
+            on_error=self.bookings_load_failed,
+            key="search_bookings"
+        )
+    
+    def show_search_results(self, results, generation):
+        """Replace the Treeview contents with ranked search results"""
+        if generation != self.bookings_generation:
+            return
+        self.bookings_tree.delete(*self.bookings_tree.get_children())
+        self.booking_keys = {}
+        for booking in results:
+            self.insert_booking_row(booking)
+        # Results are a single ranked list, so scrolling does not page
+        self.bookings_at_start = True
+        self.bookings_at_end = True
+        self.bookings_loading = False
+    
+    def select_booking_row(self, event):
+        """Fill every Booking ID field with the double-clicked booking"""
+        iid = self.bookings_tree.identify_row(event.y)
+        if not iid:
+            return
+        self.current_booking_id = int(iid)
+        for entry in (self.room_booking_id, self.restaurant_booking_id,
+                      self.laundry_booking_id, self.game_booking_id, self.bill_booking_id):
+            entry.delete(0, tk.END)
+            entry.insert(0, iid)
+    
+    def bookings_load_failed(self, error):
+        self.bookings_loading = False
+        self.show_task_error(error)
+    
+    def insert_booking_row(self, booking, index="end"):
+        """Insert one booking into the Treeview"""
+        iid = str(booking['id'])
+        self.booking_keys[iid] = booking_key(booking)
+        self.bookings_tree.insert("", index, iid=iid, values=(
+            booking['id'],
+            booking['room_no'],
+            booking['name'],
+            booking['check_in_date'],
+            booking['check_out_date'],
+            f"Rs {booking['total_bill']:,.2f}"
+        ))
+    
+    def append_bookings_page(self):
+        """Load the next page of older bookings below the current window"""
+        rows = self.bookings_tree.get_children()
+        if not rows:
+            self.bookings_loading = False
+            return
+        after = self.booking_keys[rows[-1]]
+        generation = self.bookings_generation
+        self.tasks.submit(
+            lambda: self.hotel.get_bookings_page(BOOKINGS_PAGE_SIZE, after=after),
+            on_success=lambda page: self.show_older_bookings(page, generation),
+            on_error=self.bookings_load_failed
+        )
+    
+    def show_older_bookings(self, page, generation):
+        if generation != self.bookings_generation:
+            return
+        for booking in page:
+            self.insert_booking_row(booking)
+        self.bookings_at_end = len(page) < BOOKINGS_PAGE_SIZE
+        
+        # Drop rows scrolled far above the view to keep the window bounded
+        rows = self.bookings_tree.get_children()
+        excess = len(rows) - BOOKINGS_WINDOW
+        if excess > 0 and page:
+            self.drop_booking_rows(rows[:excess])
+            self.bookings_at_start = False
+            self.bookings_tree.see(str(page[0]['id']))
+        self.bookings_loading = False
+    
+    def prepend_bookings_page(self):
+        """Reload the page of newer bookings above the current window"""
+        rows = self.bookings_tree.get_children()
+        if not rows:
+            self.bookings_loading = False
+            return
+        before = self.booking_keys[rows[0]]
+        generation = self.bookings_generation
+        self.tasks.submit(
+            lambda: self.hotel.get_bookings_page(BOOKINGS_PAGE_SIZE, before=before),
+            on_success=lambda page: self.show_newer_bookings(page, generation),
+            on_error=self.bookings_load_failed
+        )
+    
+    def show_newer_bookings(self, page, generation):
+        if generation != self.bookings_generation:
+            return
+        for booking in reversed(page):
+            self.insert_booking_row(booking, index=0)
+        self.bookings_at_start = len(page) < BOOKINGS_PAGE_SIZE
+        
+        rows = self.bookings_tree.get_children()
+        excess = len(rows) - BOOKINGS_WINDOW
+        if excess > 0 and page:
+            self.drop_booking_rows(rows[-excess:])
+            self.bookings_at_end = False
+            self.bookings_tree.see(str(page[-1]['id']))
+        self.bookings_loading = False
+    
+    def drop_booking_rows(self, rows):
+        """Remove rows from the Treeview and forget their cursors"""
+        self.bookings_tree.delete(*rows)
+        for iid in rows:
+            self.booking_keys.pop(iid, None)
+    
+    def on_bookings_scroll(self, first, last):
+        """Update the scrollbar and prefetch pages near either edge"""
+        self.bookings_scrollbar.set(first, last)
+        if self.bookings_loading:
+            return
+        if float(last) >= 1 - BOOKINGS_PREFETCH and not self.bookings_at_end:
+            self.bookings_loading = True
+            self.append_bookings_page()
+        elif float(first) <= BOOKINGS_PREFETCH and not self.bookings_at_start:
+            self.bookings_loading = True
+            self.prepend_bookings_page()
+
+# ==================== MAIN ====================
+
+def main():
+    # The front desk reads archived bookings through, e.g. for old bills
+    db = ConnectionManager(DB_FILE, archive=existing_archive(DB_FILE))
+    init_database(db)
+    root = tk.Tk()
+    app = HotelManagementApp(root, db)
+    try:
+        root.mainloop()
+    finally:
+        app.tasks.shutdown()
+        app.hotel.close()
+        if app.metrics is not None:
+            app.metrics.export(app.metrics_path)
@@ -0,0 +1,398 @@
+"""
+Hotel Management System - Instrumentation
+Opt-in timing histograms, row counts, lock waits and a slow-query log
+
+Nothing here runs unless an Instrumentation is attached: attach_hotel()
+and attach_tk() swap in timed wrappers on the instance (or on tkinter's
+callback wrapper) and detach() puts the originals back, so a process
+that never enables it pays no overhead at all.
+
+    metrics = Instrumentation(slow_query_ms=50)
+    metrics.attach_hotel(hotel)
+    ...
+    metrics.export("metrics.json")
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import wraps
+
+from .records import BookingTable
+
+# Histogram bucket upper bounds in microseconds (1-2-5 steps up to 10 s)
+BUCKETS_US = tuple(m * 10 ** e for e in range(7) for m in (1, 2, 5)) + (10 ** 7,)
+
+SLOW_LOG_SIZE = 200        # slow statements kept in memory
+SQL_TEXT_LIMIT = 500       # characters of SQL kept per slow-log entry
+
+# HotelManagement methods that reach the database or the write-behind buffer
+HOTEL_METHODS = (
+    "create_booking", "add_rooms", "find_available_rooms", "quote_stay",
+    "update_room_rent", "reprice_open_bookings", "post_charges", "submit_charges",
+    "post_catalog_charges", "add_charge", "update_restaurant_bill", "update_laundry_bill",
+    "update_game_bill", "flush_charges", "get_charges", "item_sales_report", "get_booking",
+    "calculate_total", "get_bookings_page", "search_bookings", "get_all_bookings",
+)
+
+# Literals in traced SQL (sqlite3 reports statements with values bound)
+SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+ENV_VAR = "HOTEL_METRICS"  # file the GUI and server export a snapshot to on exit
+
+# ==================== HISTOGRAMS ====================
+
+class Histogram:
+    """Call count, total and max time, rows and a bucketed latency distribution"""
+
+    __slots__ = ("count", "errors", "total_ns", "max_ns", "rows", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.rows = 0
+        self.buckets = [0] * (len(BUCKETS_US) + 1)   # last bucket: above 10 s
+
+    def add(self, elapsed_ns, rows=None, failed=False):
+        self.count += 1
+        self.errors += failed
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if rows:
+            self.rows += rows
+        self.buckets[bisect_left(BUCKETS_US, elapsed_ns / 1000)] += 1
+
+    def percentile(self, fraction):
+        """Upper bound (ms) of the bucket holding the given fraction of calls"""
+        target = fraction * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= target:
+                return BUCKETS_US[i] / 1000 if i < len(BUCKETS_US) else self.max_ns / 1e6
+        return 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": self.total_ns / 1e6,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "max_ms": self.max_ns / 1e6,
+            "p50_ms": self.percentile(0.50),
+            "p90_ms": self.percentile(0.90),
+            "p99_ms": self.percentile(0.99),
+            "buckets_us": {(str(bound) if i < len(BUCKETS_US) else "inf"): n
+                           for i, (bound, n) in enumerate(zip(BUCKETS_US + (None,), self.buckets))
+                           if n},
+        }
+
+def row_count(result):
+    """Rows in a method's result: len() of lists and tables, else None"""
+    if isinstance(result, (list, BookingTable)):
+        return len(result)
+    return None
+
+def callback_name(func):
+    """Readable name of a Tk callback (after() wraps its function in callit)"""
+    name = getattr(func, "__qualname__", None) or repr(func)
+    if name.endswith("<locals>.callit"):
+        return f"after {func.__name__}"
+    return name
+
+# ==================== INSTRUMENTATION ====================
+
+class Instrumentation:
+    """Collects metrics from the objects it is attached to
+
+    Groups in snapshot():
+        hotel   HotelManagement method calls, with rows returned
+        sql     statements run through ConnectionManager.execute/executemany,
+                timed to the first row, with rows changed by writes
+        lock    BEGIN IMMEDIATE/EXCLUSIVE and COMMIT waits on the write lock,
+                plus "database is locked" errors (busy)
+        tk      Tk callbacks (commands, bindings, after) by function name
+    slow_query_ms: statements at least this slow go to the slow log.
+    trace_sql: also install sqlite3 trace callbacks, counting every
+    statement SQLite runs with literals replaced by ?. A statement is
+    reported again for each trigger step it fires, so the counts show
+    trigger fan-out as well.
+    """
+
+    def __init__(self, slow_query_ms=50, trace_sql=False, slow_log_size=SLOW_LOG_SIZE):
+        self.slow_query_ns = int(slow_query_ms * 1e6)
+        self.trace_sql = trace_sql
+        self.started = time.time()
+        self._groups = {"hotel": {}, "sql": {}, "lock": {}, "tk": {}}
+        self._slow = deque(maxlen=slow_log_size)
+        self._traced = Counter()
+        self._busy = 0
+        self._lock = threading.Lock()
+        self._restore = []      # (obj, name, original or None) to undo on detach
+
+    def record(self, group, name, elapsed_ns, rows=None, failed=False):
+        with self._lock:
+            histogram = self._groups[group].get(name)
+            if histogram is None:
+                histogram = self._groups[group][name] = Histogram()
+            histogram.add(elapsed_ns, rows, failed)
+
+    @contextmanager
+    def timer(self, group, name):
+        """Time a block; usable for ad hoc sections (e.g. a report job)"""
+        start = time.perf_counter_ns()
+        failed = True
+        try:
+            yield
+            failed = False
+        finally:
+            self.record(group, name, time.perf_counter_ns() - start, failed=failed)
+
+    def timed(self, group, name, func):
+        """func wrapped to record each call under group/name"""
+        clock = time.perf_counter_ns
+        record = self.record
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                record(group, name, clock() - start, failed=True)
+                raise
+            record(group, name, clock() - start, row_count(result))
+            return result
+        return wrapper
+
+    def _slow_query(self, sql, elapsed_ns, params_count):
+        with self._lock:
+            self._slow.append({
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "ms": elapsed_ns / 1e6,
+                "thread": threading.current_thread().name,
+                "sql": _statement_name(sql),
+                "batch": params_count,
+            })
+
+    def _trace(self, statement):
+        with self._lock:
+            self._traced[_statement_name(SQL_LITERAL.sub("?", statement))] += 1
+
+    def _patch(self, obj, name, replacement):
+        # Instances get a shadowing attribute (deleted again on detach);
+        # modules get theirs replaced and restored
+        self._restore.append((obj, name, vars(obj).get(name)))
+        setattr(obj, name, replacement)
+
+    def attach_hotel(self, hotel):
+        """Time the data-access methods of a HotelManagement and its database"""
+        for name in HOTEL_METHODS:
+            self._patch(hotel, name, self.timed("hotel", name, getattr(hotel, name)))
+        self.attach_db(hotel.db)
+        return self
+
+    def attach_db(self, db):
+        """Time statements, lock waits and busy errors of a ConnectionManager"""
+        execute, executemany, transaction = db.execute, db.executemany, db.transaction
+        clock = time.perf_counter_ns
+        record = self.record
+        slow_ns = self.slow_query_ns
+        names = {}      # SQL text -> normalised histogram key
+
+        def run(method, sql, params, batch):
+            start = clock()
+            try:
+                cursor = method(sql, params)
+            except BaseException as e:
+                elapsed = clock() - start
+                self._note_busy(e)
+                record("sql", _statement_name(sql), elapsed, failed=True)
+                raise
+            elapsed = clock() - start
+            name = names.get(sql)
+            if name is None:
+                name = names[sql] = _statement_name(sql)
+            record("sql", name, elapsed, cursor.rowcount if cursor.rowcount > 0 else None)
+            if elapsed >= slow_ns:
+                self._slow_query(sql, elapsed, batch)
+            return cursor
+
+        def timed_execute(sql, params=()):
+            return run(execute, sql, params, None)
+
+        def timed_executemany(sql, seq_of_params):
+            seq_of_params = list(seq_of_params)
+            return run(executemany, sql, seq_of_params, len(seq_of_params))
+
+        @contextmanager
+        def timed_transaction(mode="DEFERRED"):
+            # Entering the outer block runs BEGIN: for IMMEDIATE/EXCLUSIVE
+            # that is where a writer waits for the lock (busy_timeout)
+            outer = not getattr(db._local, "depth", 0)
+            context = transaction(mode)
+            start = clock()
+            try:
+                conn = context.__enter__()
+            except BaseException as e:
+                self._note_busy(e)
+                raise
+            if outer and mode != "DEFERRED":
+                record("lock", f"begin {mode.lower()}", clock() - start)
+            try:
+                yield conn
+            except BaseException as e:
+                if not context.__exit__(type(e), e, e.__traceback__):
+                    raise
+            else:
+                start = clock()
+                try:
+                    context.__exit__(None, None, None)
+                except BaseException as e:
+                    self._note_busy(e)
+                    raise
+                if outer:
+                    record("lock", "commit", clock() - start)
+
+        self._patch(db, "execute", timed_execute)
+        self._patch(db, "executemany", timed_executemany)
+        self._patch(db, "transaction", timed_transaction)
+        if self.trace_sql:
+            connect = db._connect
+
+            def traced_connect():
+                conn = connect()
+                conn.set_trace_callback(self._trace)
+                return conn
+            self._patch(db, "_connect", traced_connect)
+            # Connections already open pick up the callback now
+            with db._lock:
+                for conn in db._connections.values():
+                    conn.set_trace_callback(self._trace)
+            self._restore.append((db, None, None))
+        return self
+
+    def _note_busy(self, error):
+        if "locked" in str(error) or "busy" in str(error):
+            with self._lock:
+                self._busy += 1
+
+    def attach_tk(self):
+        """Time every Tk callback registered from now on
+
+        tkinter routes commands, event bindings and after() callbacks
+        through tkinter.CallWrapper; widgets created after this call get a
+        timing wrapper, so attach before building the UI.
+        """
+        import tkinter
+        original = tkinter.CallWrapper
+        record = self.record
+        clock = time.perf_counter_ns
+
+        class TimedCallWrapper(original):
+            def __call__(self, *args):
+                start = clock()
+                try:
+                    return original.__call__(self, *args)
+                finally:
+                    record("tk", callback_name(self.func), clock() - start)
+
+        self._patch(tkinter, "CallWrapper", TimedCallWrapper)
+        return self
+
+    def attach_tasks(self, executor):
+        """Time the callbacks a TaskExecutor delivers with background results"""
+        deliver = executor._deliver
+        record = self.record
+        clock = time.perf_counter_ns
+
+        def timed_deliver(callback, value, ok):
+            start = clock()
+            try:
+                return deliver(callback, value, ok)
+            finally:
+                if callback is not None:
+                    record("tk", callback_name(callback), clock() - start, failed=not ok)
+
+        self._patch(executor, "_deliver", timed_deliver)
+        return self
+
+    def detach(self):
+        """Restore every patched attribute; recorded metrics are kept"""
+        while self._restore:
+            obj, name, original = self._restore.pop()
+            if name is None:
+                # trace callbacks on a ConnectionManager's open connections
+                with obj._lock:
+                    for conn in obj._connections.values():
+                        conn.set_trace_callback(None)
+            elif original is None:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, original)
+
+    def snapshot(self):
+        """Every metric as a JSON-serialisable dict"""
+        with self._lock:
+            snapshot = {
+                "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+                "taken": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "pid": os.getpid(),
+                "slow_query_ms": self.slow_query_ns / 1e6,
+                "busy_errors": self._busy,
+            }
+            for group, histograms in self._groups.items():
+                snapshot[group] = {name: histogram.as_dict()
+                                   for name, histogram in sorted(histograms.items())}
+            snapshot["slow_queries"] = list(self._slow)
+            if self.trace_sql:
+                snapshot["traced_statements"] = dict(self._traced.most_common())
+        return snapshot
+
+    def export(self, path):
+        """Write snapshot() to path as JSON (atomically, via a temp file)"""
+        temp = f"{path}.tmp"
+        with open(temp, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+            f.write("\n")
+        os.replace(temp, path)
+        return path
+
+    def reset(self):
+        """Clear all recorded metrics"""
+        with self._lock:
+            for histograms in self._groups.values():
+                histograms.clear()
+            self._slow.clear()
+            self._traced.clear()
+            self._busy = 0
+            self.started = time.time()
+
+def _statement_name(sql):
+    """Histogram key for a statement: its whitespace-normalised text"""
+    return " ".join(sql.split())[:SQL_TEXT_LIMIT]
+
+def from_environment(hotel, tk=False):
+    """Attach an Instrumentation if HOTEL_METRICS names an export file
+
+    Returns (instrumentation, path), or (None, None) when disabled.
+    HOTEL_SLOW_QUERY_MS and HOTEL_TRACE_SQL=1 tune it.
+    """
+    path = os.environ.get(ENV_VAR)
+    if not path:
+        return None, None
+    metrics = Instrumentation(float(os.environ.get("HOTEL_SLOW_QUERY_MS", 50)),
+                              os.environ.get("HOTEL_TRACE_SQL") == "1")
+    metrics.attach_hotel(hotel)
+    if tk:
+        metrics.attach_tk()
+    return metrics, path
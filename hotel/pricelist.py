@@ -0,0 +1,72 @@
+"""
+Hotel Management System - Price List Admin
+Show and publish pricing catalog versions from the command line
+
+Usage:
+    python -m hotel.pricelist show [--on 2024-08-01] [--json]
+    python -m hotel.pricelist publish prices.json --effective 2025-01-01 [--note "..."] [--reprice]
+    python -m hotel.pricelist reprice
+
+A published file has the shape printed by `show --json`:
+    {"items": [{"category", "item", "price", "unit", "description"}, ...],
+     "rates": [{"category", "item", "name", "start_date", "end_date",
+                "weekdays", "price", "multiplier", "priority"}, ...]}
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+
+from .core import HotelManagement
+from .db import DB_FILE, ConnectionManager
+from .pricing import load_catalog, price_list_json, publish_prices
+from .schema import init_database
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel pricing catalog")
+    parser.add_argument("--db", default=DB_FILE, help="database file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_show = sub.add_parser("show", help="print the price list in effect")
+    p_show.add_argument("--on", help="day, YYYY-MM-DD (default today)")
+    p_show.add_argument("--json", action="store_true", help="print in publish format")
+    p_publish = sub.add_parser("publish", help="publish a new price list version")
+    p_publish.add_argument("path")
+    p_publish.add_argument("--effective", help="first day it applies (default today)")
+    p_publish.add_argument("--note")
+    p_publish.add_argument("--reprice", action="store_true",
+                           help="re-price open bookings at the new rates")
+    sub.add_parser("reprice", help="re-price bookings not yet checked out")
+
+    args = parser.parse_args(argv)
+    db = ConnectionManager(args.db)
+    try:
+        init_database(db)
+        if args.command == "publish":
+            with open(args.path, encoding="utf-8") as f:
+                data = json.load(f)
+            version = publish_prices(data["items"], data.get("rates", ()),
+                                     args.effective, args.note, db)
+            print(f"Published price list version {version}")
+            if args.reprice:
+                print(f"Re-priced {HotelManagement(db).reprice_open_bookings():,} bookings")
+            return 0
+        if args.command == "reprice":
+            print(f"Re-priced {HotelManagement(db).reprice_open_bookings():,} bookings")
+            return 0
+        price_list = load_catalog(db).price_list(args.on)
+        if args.json:
+            print(json.dumps(price_list_json(price_list), indent=2))
+            return 0
+        print(f"Version {price_list.version}, effective "
+              f"{date.fromordinal(price_list.effective_from)}")
+        for item in price_list.items.values():
+            print(f"    {item.category:<12} {item.item:<20} {item.price:>10,.2f} / {item.unit}")
+        return 0
+    finally:
+        db.close_all()
+
+if __name__ == "__main__":
+    sys.exit(main())
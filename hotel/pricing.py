@@ -0,0 +1,224 @@
+"""
+Hotel Management System - Pricing Catalog
+Effective-dated price lists loaded into an immutable, hot-reloadable snapshot
+"""
+
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date
+from types import MappingProxyType
+
+from .db import get_manager
+
+PriceItem = namedtuple("PriceItem", "category item price unit description")
+Rate = namedtuple("Rate", "name start end weekdays price multiplier priority")
+
+def day_number(value):
+    """Day ordinal for a date or 'YYYY-MM-DD' string"""
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(str(value).strip()[:10]).toordinal()
+
+# ==================== CATALOG SNAPSHOT ====================
+
+class PriceList:
+    """One published version: items by (category, item) and their date rates"""
+
+    __slots__ = ("version", "effective_from", "items", "rates")
+
+    def __init__(self, version, effective_from, items, rates):
+        self.version = version
+        self.effective_from = effective_from
+        self.items = items      # read-only {(category, item): PriceItem}, in menu order
+        self.rates = rates      # read-only {(category, item): (Rate, ...)}, highest priority first
+
+def night_price(rates, weekday, base):
+    """Price of one night on a weekday: the first matching rate, else base"""
+    for rate in rates:
+        if rate.weekdays is None or weekday in rate.weekdays:
+            return rate.price if rate.price is not None else base * rate.multiplier
+    return base
+
+class PriceCatalog:
+    """Immutable view of every published price list
+
+    Lookups pick the version in effect on the given day with one bisect.
+    night_prices splits a date range at version and rate boundaries and
+    prices one week per piece; RateEngine turns that into O(1) stay quotes.
+    """
+
+    def __init__(self, price_lists):
+        self.price_lists = tuple(sorted(price_lists, key=lambda p: p.effective_from))
+        self._starts = [p.effective_from for p in self.price_lists]
+        self.version = max((p.version for p in self.price_lists), default=0)
+
+    def price_list(self, on=None):
+        """The price list in effect on a day (default today)"""
+        day = day_number(on or date.today())
+        i = bisect_right(self._starts, day)
+        if not i:
+            raise LookupError(f"No price list in effect on {date.fromordinal(day)}")
+        return self.price_lists[i - 1]
+
+    def items(self, category, on=None):
+        """PriceItems of a category in menu order"""
+        return [item for key, item in self.price_list(on).items.items() if key[0] == category]
+
+    def price(self, category, item, on=None):
+        """Base unit price of an item"""
+        try:
+            return self.price_list(on).items[(category, item)].price
+        except KeyError:
+            raise ValueError(f"No {category} price for {item!r}") from None
+
+    def _segments(self, room_type, first, last):
+        """(start, end, base, rates) pieces of [first, last) with constant rules
+
+        base is None where the price list in effect has no such room type.
+        """
+        key = ("room", room_type)
+        cuts = {first, last}
+        cuts.update(start for start in self._starts if first < start < last)
+        for price_list in self.price_lists:
+            for rate in price_list.rates.get(key, ()):
+                cuts.update(day for day in (rate.start, rate.end)
+                            if day is not None and first < day < last)
+        cuts = sorted(cuts)
+        for start, end in zip(cuts, cuts[1:]):
+            price_list = self.price_list(date.fromordinal(start))
+            if key not in price_list.items:
+                yield start, end, None, ()
+                continue
+            rates = [rate for rate in price_list.rates.get(key, ())
+                     if (rate.start is None or rate.start <= start) and
+                        (rate.end is None or end <= rate.end)]
+            yield start, end, price_list.items[key].price, rates
+
+    def night_prices(self, room_type, check_in, check_out):
+        """Price of each night from check_in to check_out - 1, in order
+
+        Nights with no price for room_type in effect are None.
+        """
+        prices = []
+        for start, end, base, rates in self._segments(room_type, day_number(check_in),
+                                                      day_number(check_out)):
+            if base is None:
+                prices.extend([None] * (end - start))
+                continue
+            week = [night_price(rates, weekday, base) for weekday in range(7)]
+            first_weekday = date.fromordinal(start).weekday()
+            prices.extend(week[(first_weekday + offset) % 7] for offset in range(end - start))
+        return prices
+
+# ==================== LOADING ====================
+
+def load_catalog(db=None):
+    """Read every published price list into a PriceCatalog"""
+    db = db or get_manager()
+    items, rates = {}, {}
+    for row in db.execute("""
+        SELECT version, category, item, price, unit, description
+        FROM price_items ORDER BY version, position, category, item
+    """):
+        items.setdefault(row[0], {})[(row[1], row[2])] = PriceItem(*tuple(row)[1:])
+    for row in db.execute("""
+        SELECT version, category, item, name, start_date, end_date, weekdays, price,
+               multiplier, priority
+        FROM price_rates ORDER BY version, priority DESC, id
+    """):
+        rate = Rate(row["name"],
+                    day_number(row["start_date"]) if row["start_date"] else None,
+                    day_number(row["end_date"]) if row["end_date"] else None,
+                    frozenset(int(d) for d in row["weekdays"]) if row["weekdays"] else None,
+                    row["price"], row["multiplier"] if row["multiplier"] is not None else 1.0,
+                    row["priority"])
+        rates.setdefault(row[0], {}).setdefault((row[1], row[2]), []).append(rate)
+    price_lists = []
+    for version, effective_from in db.execute(
+            "SELECT version, effective_from FROM price_versions"):
+        price_lists.append(PriceList(
+            version, day_number(effective_from),
+            MappingProxyType(items.get(version, {})),
+            MappingProxyType({key: tuple(value)
+                              for key, value in rates.get(version, {}).items()})))
+    return PriceCatalog(price_lists)
+
+class Pricing:
+    """Shared PriceCatalog that reloads itself when a new version is published
+
+    current() checks the newest version number at most every check_interval
+    seconds (one indexed MAX query) and swaps in a freshly loaded catalog
+    when it changed; readers always get a complete, immutable snapshot.
+    """
+
+    def __init__(self, db=None, check_interval=5.0):
+        self.db = db or get_manager()
+        self.check_interval = check_interval
+        self._catalog = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        catalog = self._catalog
+        if catalog is not None and time.monotonic() - self._checked < self.check_interval:
+            return catalog
+        with self._lock:
+            latest = self.db.execute("SELECT MAX(version) FROM price_versions").fetchone()[0] or 0
+            if self._catalog is None or self._catalog.version != latest:
+                self._catalog = load_catalog(self.db)
+            self._checked = time.monotonic()
+            return self._catalog
+
+    def reload(self):
+        """Load the catalog now, regardless of the check interval"""
+        with self._lock:
+            self._catalog = load_catalog(self.db)
+            self._checked = time.monotonic()
+            return self._catalog
+
+# ==================== PUBLISHING ====================
+
+def publish_prices(items, rates=(), effective_from=None, note=None, db=None):
+    """Publish a complete price list; returns its version number
+
+    items are dicts with category, item, price and optional unit and
+    description (menu order is the order given); rates are dicts shaped like
+    price_rates rows. The new list applies to nights from effective_from
+    (default today) and to every later day until the next version.
+    """
+    db = db or get_manager()
+    effective_from = date.fromordinal(day_number(effective_from or date.today())).isoformat()
+    with db.transaction("IMMEDIATE"):
+        version = db.execute("INSERT INTO price_versions (effective_from, note) VALUES (?, ?)",
+                             (effective_from, note)).lastrowid
+        db.executemany("""
+            INSERT INTO price_items (version, category, item, price, unit, description, position)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(version, item["category"], item["item"], float(item["price"]),
+               item.get("unit") or "each", item.get("description"), position)
+              for position, item in enumerate(items)])
+        db.executemany("""
+            INSERT INTO price_rates (version, category, item, name, start_date, end_date,
+                                     weekdays, price, multiplier, priority)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(version, rate["category"], rate["item"], rate["name"], rate.get("start_date"),
+               rate.get("end_date"), rate.get("weekdays"), rate.get("price"),
+               rate.get("multiplier"), rate.get("priority", 0))
+              for rate in rates])
+    return version
+
+def price_list_json(price_list):
+    """A price list as the dict accepted by publish_prices(**...)"""
+    rates = []
+    for (category, item), item_rates in price_list.rates.items():
+        for rate in item_rates:
+            rates.append({
+                "category": category, "item": item, "name": rate.name,
+                "start_date": date.fromordinal(rate.start).isoformat() if rate.start else None,
+                "end_date": date.fromordinal(rate.end).isoformat() if rate.end else None,
+                "weekdays": "".join(str(d) for d in sorted(rate.weekdays)) if rate.weekdays else None,
+                "price": rate.price, "multiplier": rate.multiplier, "priority": rate.priority,
+            })
+    return {"items": [item._asdict() for item in price_list.items.values()], "rates": rates}
@@ -0,0 +1,121 @@
+"""
+Hotel Management System - Rate Engine
+Per-night room rates as cumulative-sum calendars for constant-time stay quotes
+"""
+
+import threading
+from array import array
+from datetime import date, timedelta
+from itertools import accumulate
+
+from .pricing import day_number
+
+HORIZON_BEFORE = 366       # days of calendar kept before today
+HORIZON_AFTER = 2 * 366    # days of calendar kept after today
+
+def stay_nights(check_in, check_out):
+    """Nights billed for a stay; a same-day stay counts as one night"""
+    return max(day_number(check_out) - day_number(check_in), 1)
+
+class RateCalendar:
+    """Cumulative nightly prices of one room type from `first` to `last`
+
+    sums[i] is the price of the nights first .. first + i - 1, so any stay
+    inside the calendar is priced with one subtraction; unpriced[i] counts
+    the nights before i on which the room type was not on the price list.
+    """
+
+    __slots__ = ("room_type", "first", "last", "sums", "unpriced")
+
+    def __init__(self, catalog, room_type, first, last):
+        self.room_type = room_type
+        self.first = first
+        self.last = last
+        prices = catalog.night_prices(room_type, date.fromordinal(first), date.fromordinal(last))
+        self.sums = array("d", accumulate((price or 0.0 for price in prices), initial=0.0))
+        self.unpriced = array("l", accumulate((price is None for price in prices), initial=0))
+
+    def covers(self, first, last):
+        return self.first <= first and last <= self.last
+
+    def quote(self, first, last):
+        i, j = first - self.first, last - self.first
+        if self.unpriced[j] != self.unpriced[i]:
+            raise ValueError(f"No room price for {self.room_type!r} on some nights "
+                             f"from {date.fromordinal(first)} to {date.fromordinal(last)}")
+        return self.sums[j] - self.sums[i]
+
+class RateEngine:
+    """Quotes stays against the current pricing catalog in O(1)
+
+    One RateCalendar per room type is built on first use, covering a year
+    back and two years ahead (or wider when a quote needs it), and rebuilt
+    when a new price list version is published.
+    """
+
+    def __init__(self, pricing):
+        self.pricing = pricing
+        self._calendars = {}       # room_type -> RateCalendar
+        self._version = None
+        self._lock = threading.Lock()
+
+    def calendar(self, room_type, first, last):
+        """Calendar for room_type covering [first, last)"""
+        catalog = self.pricing.current()
+        with self._lock:
+            if self._version != catalog.version:
+                self._calendars.clear()
+                self._version = catalog.version
+            calendar = self._calendars.get(room_type)
+            if calendar is None or not calendar.covers(first, last):
+                today = date.today().toordinal()
+                low = min(first, today - HORIZON_BEFORE)
+                high = max(last, today + HORIZON_AFTER)
+                if calendar is not None:
+                    low, high = min(low, calendar.first), max(high, calendar.last)
+                calendar = RateCalendar(catalog, room_type, low, high)
+                self._calendars[room_type] = calendar
+            return calendar
+
+    def quote(self, room_type, check_in, check_out):
+        """Room rent for a stay, priced night by night"""
+        first = day_number(check_in)
+        last = first + stay_nights(check_in, check_out)
+        return self.calendar(room_type, first, last).quote(first, last)
+
+    def quote_many(self, stays):
+        """Room rent for each (room_type, check_in, check_out)
+
+        Builds each room type's calendar once to span every stay, then
+        prices all of them by subtraction. Stays that cannot be priced (room
+        type not on the price list, dates that are not YYYY-MM-DD) are None.
+        """
+        spans = {}
+        parsed = []
+        for room_type, check_in, check_out in stays:
+            try:
+                first = day_number(check_in)
+                last = first + stay_nights(check_in, check_out)
+            except ValueError:
+                parsed.append(None)
+                continue
+            parsed.append((room_type, first, last))
+            low, high = spans.get(room_type, (first, last))
+            spans[room_type] = (min(low, first), max(high, last))
+        calendars = {room_type: self.calendar(room_type, low, high)
+                     for room_type, (low, high) in spans.items()}
+        quotes = []
+        for stay in parsed:
+            if stay is None:
+                quotes.append(None)
+                continue
+            room_type, first, last = stay
+            try:
+                quotes.append(calendars[room_type].quote(first, last))
+            except ValueError:
+                quotes.append(None)
+        return quotes
+
+def check_out_after(check_in, nights):
+    """Check-out date for a stay of `nights` nights"""
+    return (date.fromordinal(day_number(check_in)) + timedelta(days=nights)).isoformat()
@@ -0,0 +1,268 @@
+"""
+Hotel Management System - Receipts
+Folio rendering from precompiled templates, one at a time or in batches
+
+Usage:
+    python -m hotel.receipts show BOOKING_ID [--format html]
+    python -m hotel.receipts batch OUT_DIR [--format html] [--check-out 2024-06-01]
+    python -m hotel.receipts batch folios.txt --single-file [--workers 4]
+"""
+
+import argparse
+import html
+import os
+import string
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from .db import DB_FILE, ConnectionManager, existing_archive, get_manager
+from .records import ARCHIVED_BOOKINGS, BOOKING_COLUMNS, BOOKING_SELECT
+from .schema import init_database
+
+RULE = "=" * 60
+THIN_RULE = "-" * 60
+
+TEXT_RECEIPT = f"""
+{RULE}
+            Thunder HOTEL - BILL RECEIPT
+{RULE}
+
+Customer Details:
+    Name: {{name}}
+    Address: {{address}}
+    Room No: {{room_no}}
+    Check-in Date: {{check_in_date}}
+    Check-out Date: {{check_out_date}}
+    Room Type: {{room_type}}
+
+{RULE}
+BILL BREAKDOWN:
+{RULE}
+
+    Room Rent:              Rs {{room_rent:>12,.2f}}
+    Restaurant Bill:        Rs {{restaurant_bill:>12,.2f}}
+    Laundry Bill:           Rs {{laundry_bill:>12,.2f}}
+    Game Bill:              Rs {{game_bill:>12,.2f}}
+    {THIN_RULE}
+    Subtotal:                Rs {{subtotal:>12,.2f}}
+    Service Charge:         Rs {{service_charge:>12,.2f}}
+    {RULE}
+    GRAND TOTAL:            Rs {{total_bill:>12,.2f}}
+    {RULE}
+
+    Booking ID: {{id}}
+    Generated on: {{generated_on}}
+
+Thank you for choosing Thunder Hotel!
+{RULE}
+"""
+
+HTML_RECEIPT = """<article class="receipt" id="booking-{id}">
+<h1>Thunder Hotel &ndash; Bill Receipt</h1>
+<table class="guest">
+<tr><th>Name</th><td>{name}</td></tr>
+<tr><th>Address</th><td>{address}</td></tr>
+<tr><th>Room No</th><td>{room_no}</td></tr>
+<tr><th>Check-in Date</th><td>{check_in_date}</td></tr>
+<tr><th>Check-out Date</th><td>{check_out_date}</td></tr>
+<tr><th>Room Type</th><td>{room_type}</td></tr>
+</table>
+<table class="bill">
+<tr><th>Room Rent</th><td>Rs {room_rent:,.2f}</td></tr>
+<tr><th>Restaurant Bill</th><td>Rs {restaurant_bill:,.2f}</td></tr>
+<tr><th>Laundry Bill</th><td>Rs {laundry_bill:,.2f}</td></tr>
+<tr><th>Game Bill</th><td>Rs {game_bill:,.2f}</td></tr>
+<tr class="subtotal"><th>Subtotal</th><td>Rs {subtotal:,.2f}</td></tr>
+<tr><th>Service Charge</th><td>Rs {service_charge:,.2f}</td></tr>
+<tr class="total"><th>Grand Total</th><td>Rs {total_bill:,.2f}</td></tr>
+</table>
+<p class="footer">Booking ID: {id} &middot; Generated on: {generated_on}</p>
+<p class="footer">Thank you for choosing Thunder Hotel!</p>
+</article>
+"""
+
+HTML_HEAD = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Thunder Hotel Receipts</title>
+<style>
+.receipt { font-family: sans-serif; max-width: 36em; margin: 2em auto; page-break-after: always; }
+.receipt th { text-align: left; padding-right: 2em; }
+.receipt td { text-align: right; }
+.receipt .total { font-weight: bold; }
+</style></head><body>
+"""
+HTML_TAIL = "</body></html>\n"
+
+RECEIPT_FIELDS = frozenset(BOOKING_COLUMNS) | {"subtotal", "generated_on"}
+
+# ==================== TEMPLATES ====================
+
+class ReceiptTemplate:
+    """A receipt format parsed and checked once, then rendered by format_map
+
+    escape is applied to text fields (e.g. html.escape for HTML output).
+    """
+
+    def __init__(self, source, escape=None):
+        unknown = {field for _, field, _, _ in string.Formatter().parse(source)
+                   if field is not None} - RECEIPT_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown receipt fields: {', '.join(sorted(unknown))}")
+        self.render_fields = source.format_map
+        self.escape = escape
+
+    def render(self, booking, generated_on):
+        return self.render_fields(receipt_fields(booking, generated_on, self.escape))
+
+TEMPLATES = {
+    "text": ReceiptTemplate(TEXT_RECEIPT),
+    "html": ReceiptTemplate(HTML_RECEIPT, escape=html.escape),
+}
+
+EXTENSIONS = {"text": ".txt", "html": ".html"}
+
+def receipt_fields(booking, generated_on, escape=None):
+    """Template values for a booking dict"""
+    fields = dict(booking)
+    fields["address"] = booking["address"] or "N/A"
+    fields["room_type"] = booking["room_type"] or "Not selected"
+    fields["subtotal"] = (booking["room_rent"] + booking["restaurant_bill"] +
+                          booking["laundry_bill"] + booking["game_bill"])
+    fields["generated_on"] = generated_on
+    if escape is not None:
+        for name in ("name", "address", "room_type", "check_in_date", "check_out_date"):
+            fields[name] = escape(str(fields[name]))
+    return fields
+
+def render_receipt(booking, fmt="text", generated_on=None):
+    """Receipt for one booking dict as text or HTML"""
+    generated_on = generated_on or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return TEMPLATES[fmt].render(booking, generated_on)
+
+# ==================== BATCH RENDERING ====================
+
+def _render_chunk(rows, fmt, generated_on):
+    """Worker: render raw BOOKING_COLUMNS rows; returns [(id, receipt)]"""
+    template = TEMPLATES[fmt]
+    return [(row[0], template.render(dict(zip(BOOKING_COLUMNS, row)), generated_on))
+            for row in rows]
+
+def _stream_chunks(db, check_out, chunk_size, archived):
+    params = (check_out,) if check_out else ()
+    queries = [f"{BOOKING_SELECT} WHERE check_out_date = ? ORDER BY id" if check_out
+               else f"{BOOKING_SELECT} ORDER BY id"]
+    if archived and db.archive_file:
+        stay = "AND check_out_date = ?" if check_out else ""
+        queries.insert(0, f"{ARCHIVED_BOOKINGS} {stay} ORDER BY id")
+    # One read transaction, so an archiving run cannot move rows between the
+    # two streams while they are rendered
+    with db.transaction():
+        for query in queries:
+            cursor = db.connection().cursor()
+            cursor.row_factory = None
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
+def render_batch(out, fmt="text", db=None, single_file=False, check_out=None,
+                 workers=None, chunk_size=200, archived=True):
+    """Render many folios with a process pool; returns the number written
+
+    Bookings are streamed from the database in chunks and at most two
+    chunks per worker are in flight, so memory stays bounded however many
+    folios there are. Output is written in booking id order, either one
+    file per booking in the `out` directory or concatenated into the file
+    `out` (form feeds between text receipts, one HTML document for HTML).
+    check_out restricts the batch to stays ending that day (night audit).
+    Archived stays are rendered first when db attaches the archive, unless
+    archived is False.
+    """
+    db = db or get_manager()
+    generated_on = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    workers = workers or os.cpu_count() or 1
+    written = 0
+
+    if single_file:
+        sink = open(out, "w", encoding="utf-8")
+        if fmt == "html":
+            sink.write(HTML_HEAD)
+    else:
+        os.makedirs(out, exist_ok=True)
+        sink = None
+
+    def write(results):
+        nonlocal written
+        for booking_id, receipt in results:
+            if sink is None:
+                path = os.path.join(out, f"receipt_{booking_id}{EXTENSIONS[fmt]}")
+                with open(path, "w", encoding="utf-8") as f:
+                    if fmt == "html":
+                        f.write(HTML_HEAD + receipt + HTML_TAIL)
+                    else:
+                        f.write(receipt)
+            else:
+                if fmt == "text" and written:
+                    sink.write("\f")
+                sink.write(receipt)
+            written += 1
+
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for rows in _stream_chunks(db, check_out, chunk_size, archived):
+                pending.append(pool.submit(_render_chunk, rows, fmt, generated_on))
+                if len(pending) >= 2 * workers:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+        if sink is not None and fmt == "html":
+            sink.write(HTML_TAIL)
+    finally:
+        if sink is not None:
+            sink.close()
+    return written
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render hotel receipts")
+    parser.add_argument("--db", default=DB_FILE, help="database file")
+    parser.add_argument("--archive",
+                        help="archive file to attach (default: <db>_archive.db if it exists)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_show = sub.add_parser("show", help="print one booking's receipt")
+    p_show.add_argument("booking_id", type=int)
+    p_show.add_argument("--format", choices=tuple(TEMPLATES), default="text")
+    p_batch = sub.add_parser("batch", help="render many receipts")
+    p_batch.add_argument("out", help="output directory, or file with --single-file")
+    p_batch.add_argument("--format", choices=tuple(TEMPLATES), default="text")
+    p_batch.add_argument("--single-file", action="store_true")
+    p_batch.add_argument("--check-out", help="only stays checking out on this day")
+    p_batch.add_argument("--workers", type=int)
+
+    args = parser.parse_args(argv)
+    db = ConnectionManager(args.db, archive=args.archive or existing_archive(args.db))
+    try:
+        init_database(db)
+        if args.command == "show":
+            row = db.execute(f"{BOOKING_SELECT} WHERE id = ?", (args.booking_id,)).fetchone()
+            if row is None and db.archive_file:
+                row = db.execute(f"{ARCHIVED_BOOKINGS} AND id = ?", (args.booking_id,)).fetchone()
+            if row is None:
+                print(f"Booking {args.booking_id} not found", file=sys.stderr)
+                return 1
+            print(render_receipt(dict(row), args.format))
+            return 0
+        count = render_batch(args.out, args.format, db, args.single_file, args.check_out,
+                             args.workers)
+        print(f"Rendered {count:,} receipts to {args.out}")
+        return 0
+    finally:
+        db.close_all()
+
+if __name__ == "__main__":
+    sys.exit(main())
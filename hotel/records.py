@@ -0,0 +1,131 @@
+"""
+Hotel Management System - Compact Booking Records
+__slots__ records and a columnar, array-backed table as alternatives to dict rows
+"""
+
+import sys
+from array import array
+
+BOOKING_COLUMNS = (
+    "id", "room_no", "name", "address", "check_in_date", "check_out_date",
+    "room_type", "room_rent", "restaurant_bill", "laundry_bill", "game_bill",
+    "service_charge", "total_bill", "created_at",
+)
+
+BOOKING_SELECT = f"SELECT {', '.join(BOOKING_COLUMNS)} FROM bookings"
+
+LEDGER_COLUMNS = ("id", "booking_id", "category", "item", "qty", "unit_price", "posted_at")
+
+# Archived rows for reads that span both databases. A booking is only in
+# both while a move is interrupted; the live copy wins then.
+ARCHIVED_BOOKINGS = f"""
+    SELECT {', '.join(BOOKING_COLUMNS)} FROM archive.bookings
+    WHERE id NOT IN (SELECT id FROM main.bookings)
+"""
+ARCHIVED_CHARGES = """
+    SELECT {columns} FROM archive.charges
+    WHERE booking_id NOT IN (SELECT id FROM main.bookings)
+"""
+
+INT_COLUMNS = ("id", "room_no")
+FLOAT_COLUMNS = ("room_rent", "restaurant_bill", "laundry_bill", "game_bill",
+                 "service_charge", "total_bill")
+# Low-cardinality text is interned so repeated values share one string
+INTERNED_COLUMNS = ("check_in_date", "check_out_date", "room_type", "created_at")
+TEXT_COLUMNS = ("name", "address")
+INTERNED_INDEXES = frozenset(BOOKING_COLUMNS.index(name) for name in INTERNED_COLUMNS)
+
+# ==================== BOOKING RECORD ====================
+
+class Booking:
+    """One booking without a per-record dict
+
+    Supports attribute access (booking.name) and, for code written against
+    the dict rows, item access (booking['name']).
+    """
+
+    __slots__ = BOOKING_COLUMNS
+
+    def __init__(self, *values):
+        for name, value in zip(BOOKING_COLUMNS, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_row(cls, row):
+        """Build from a row in BOOKING_COLUMNS order, interning repeated text"""
+        return cls(*(sys.intern(value) if index in INTERNED_INDEXES and value is not None
+                     else value for index, value in enumerate(row)))
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        """sqlite3 row factory for queries selecting BOOKING_COLUMNS in order"""
+        return cls.from_row(row)
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def keys(self):
+        return BOOKING_COLUMNS
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in BOOKING_COLUMNS}
+
+    def __eq__(self, other):
+        if not isinstance(other, Booking):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in BOOKING_COLUMNS)
+
+    def __repr__(self):
+        return f"Booking(id={self.id!r}, room_no={self.room_no!r}, name={self.name!r})"
+
+# ==================== COLUMNAR TABLE ====================
+
+class BookingTable:
+    """Bookings stored column by column
+
+    Integer columns are array('q'), charges are array('d') and repeated text
+    (dates, room types) is interned, so per-booking overhead is a few
+    machine words instead of a dict with fourteen keys.
+    """
+
+    def __init__(self):
+        self.columns = {}
+        for name in BOOKING_COLUMNS:
+            if name in INT_COLUMNS:
+                self.columns[name] = array("q")
+            elif name in FLOAT_COLUMNS:
+                self.columns[name] = array("d")
+            else:
+                self.columns[name] = []
+
+    def append(self, row):
+        """Add one row given in BOOKING_COLUMNS order"""
+        for name, value in zip(BOOKING_COLUMNS, row):
+            column = self.columns[name]
+            if name in FLOAT_COLUMNS:
+                column.append(value or 0.0)
+            elif name in INTERNED_COLUMNS and value is not None:
+                column.append(sys.intern(str(value)))
+            else:
+                column.append(value)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self):
+        return len(self.columns["id"])
+
+    def __getitem__(self, index):
+        return Booking(*(self.columns[name][index] for name in BOOKING_COLUMNS))
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name):
+        """The raw column (array or list) for name"""
+        return self.columns[name]
@@ -0,0 +1,108 @@
+"""
+Hotel Management System - Revenue Rollups
+Dashboard queries over the trigger-maintained daily summary tables
+
+Usage:
+    python -m hotel.rollups rebuild
+    python -m hotel.rollups rooms --by month [--start 2024-01-01] [--end 2025-01-01]
+    python -m hotel.rollups charges --by day
+"""
+
+import argparse
+import sys
+
+from .db import DB_FILE, ConnectionManager, existing_archive, get_manager
+from .schema import ARCHIVE_ROLLUP_FILL, ROLLUP_FILL, has_archive, init_database
+
+# Bounds compare against 'YYYY-MM-DD' days (or 'YYYY-MM' months)
+ROOM_QUERY = """
+    SELECT {period} AS period, room_type, SUM(bookings) AS bookings,
+           SUM(room_nights) AS room_nights, SUM(room_rent) AS room_rent,
+           SUM(revenue) AS revenue
+    FROM rollup_room_daily
+    WHERE day >= COALESCE(?, '') AND day < COALESCE(?, '9999-12-31')
+    GROUP BY 1, 2
+    HAVING SUM(bookings) != 0
+    ORDER BY 1, 2
+"""
+
+CHARGE_QUERY = """
+    SELECT {period} AS period, category, SUM(lines) AS lines, SUM(qty) AS qty,
+           SUM(revenue) AS revenue
+    FROM rollup_charge_daily
+    WHERE day >= COALESCE(?, '') AND day < COALESCE(?, '9999-12-31')
+    GROUP BY 1, 2
+    HAVING SUM(lines) != 0
+    ORDER BY 1, 2
+"""
+
+PERIODS = {"day": "day", "month": "substr(day, 1, 7)"}
+
+def rebuild_rollups(db=None):
+    """Recompute the summary tables from bookings and charges
+
+    Use after backfills or bulk edits made with triggers bypassed; returns
+    the number of (room, charge) daily rows written. Archived bookings and
+    charges are counted too, so db must attach the archive when one exists.
+    """
+    db = db or get_manager()
+    archived = has_archive(db)
+    if not archived and existing_archive(db.db_file):
+        raise RuntimeError("Rebuilding without the archive attached would drop archived "
+                           "revenue; use ConnectionManager(..., archive=True)")
+    statements = ROLLUP_FILL + (ARCHIVE_ROLLUP_FILL if archived else ())
+    with db.transaction("IMMEDIATE") as conn:
+        for statement in statements:
+            conn.execute(statement)
+        rooms = conn.execute("SELECT COUNT(*) FROM rollup_room_daily").fetchone()[0]
+        charges = conn.execute("SELECT COUNT(*) FROM rollup_charge_daily").fetchone()[0]
+    return rooms, charges
+
+def room_revenue(db=None, by="day", start=None, end=None):
+    """Bookings, room-nights and revenue per period and room type, by check-in day"""
+    db = db or get_manager()
+    cursor = db.execute(ROOM_QUERY.format(period=PERIODS[by]), (start, end))
+    return [dict(row) for row in cursor]
+
+def charge_revenue(db=None, by="day", start=None, end=None):
+    """Ledger lines, quantity and revenue per period and category, by posting day"""
+    db = db or get_manager()
+    cursor = db.execute(CHARGE_QUERY.format(period=PERIODS[by]), (start, end))
+    return [dict(row) for row in cursor]
+
+# ==================== CLI ====================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel revenue rollups")
+    parser.add_argument("--db", default=DB_FILE, help="database file")
+    parser.add_argument("--archive",
+                        help="archive file to attach (default: <db>_archive.db if it exists)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="recompute the rollup tables from scratch")
+    for name in ("rooms", "charges"):
+        p_report = sub.add_parser(name, help=f"{name} revenue report")
+        p_report.add_argument("--by", choices=tuple(PERIODS), default="month")
+        p_report.add_argument("--start", help="first day, YYYY-MM-DD")
+        p_report.add_argument("--end", help="day after the last, YYYY-MM-DD")
+
+    args = parser.parse_args(argv)
+    db = ConnectionManager(args.db, archive=args.archive or existing_archive(args.db))
+    try:
+        init_database(db)
+        if args.command == "rebuild":
+            rooms, charges = rebuild_rollups(db)
+            print(f"Rebuilt {rooms:,} room and {charges:,} charge daily rows")
+            return 0
+        report = room_revenue if args.command == "rooms" else charge_revenue
+        rows = report(db, args.by, args.start, args.end)
+        if rows:
+            print("\t".join(rows[0]))
+        for row in rows:
+            print("\t".join(f"{value:.2f}" if isinstance(value, float) else str(value)
+                            for value in row.values()))
+        return 0
+    finally:
+        db.close_all()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,607 @@
+"""
+Hotel Management System - Schema Migrations
+Versioned schema upgrades tracked with PRAGMA user_version
+"""
+
+from .db import get_manager
+
+# ==================== MIGRATION REGISTRY ====================
+
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a schema migration; versions must be applied in order"""
+    def register(func):
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return register
+
+def latest_version():
+    """Highest known schema version"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+def current_version(db=None):
+    """Schema version recorded in the database file"""
+    db = db or get_manager()
+    return db.execute("PRAGMA user_version").fetchone()[0]
+
+# ==================== MIGRATIONS ====================
+
+@migration(1, "create bookings table")
+def _create_bookings(conn):
+    # IF NOT EXISTS so databases created before versioning upgrade in place
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            room_no INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            address TEXT,
+            check_in_date TEXT NOT NULL,
+            check_out_date TEXT NOT NULL,
+            room_type TEXT,
+            room_rent REAL DEFAULT 0,
+            restaurant_bill REAL DEFAULT 0,
+            laundry_bill REAL DEFAULT 0,
+            game_bill REAL DEFAULT 0,
+            service_charge REAL DEFAULT 1800,
+            total_bill REAL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+@migration(2, "bookings secondary indexes")
+def _bookings_indexes(conn):
+    # (created_at, id) serves ORDER BY created_at DESC and keyset paging
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bookings_created_at "
+                 "ON bookings (created_at, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bookings_room_no "
+                 "ON bookings (room_no)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bookings_name "
+                 "ON bookings (name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_bookings_stay "
+                 "ON bookings (check_in_date, check_out_date)")
+
+@migration(3, "keep total_bill in sync with the charge columns")
+def _total_bill_triggers(conn):
+    # A generated column cannot replace an existing column without
+    # rebuilding the table, so total_bill is maintained by triggers instead
+    total = "NEW.room_rent + NEW.restaurant_bill + NEW.laundry_bill + NEW.game_bill + NEW.service_charge"
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_total_insert
+        AFTER INSERT ON bookings
+        BEGIN
+            UPDATE bookings SET total_bill = {total} WHERE id = NEW.id;
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_total_update
+        AFTER UPDATE OF room_rent, restaurant_bill, laundry_bill, game_bill, service_charge
+        ON bookings
+        BEGIN
+            UPDATE bookings SET total_bill = {total} WHERE id = NEW.id;
+        END
+    """)
+    # Backfill rows whose total was never calculated
+    conn.execute("""
+        UPDATE bookings
+        SET total_bill = room_rent + restaurant_bill + laundry_bill + game_bill + service_charge
+        WHERE total_bill IS NOT room_rent + restaurant_bill + laundry_bill + game_bill + service_charge
+    """)
+
+@migration(4, "rooms inventory")
+def _rooms(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rooms (
+            room_no INTEGER PRIMARY KEY,
+            room_type TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_rooms_type ON rooms (room_type, room_no)")
+
+@migration(5, "itemized charges ledger")
+def _charges_ledger(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS charges (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            booking_id INTEGER NOT NULL REFERENCES bookings (id),
+            category TEXT NOT NULL,
+            item TEXT,
+            qty REAL NOT NULL DEFAULT 1,
+            unit_price REAL NOT NULL,
+            posted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    # Existing running sums become one opening line per booking and category,
+    # inserted before the triggers exist so they are not added twice
+    for category, column in (("restaurant", "restaurant_bill"),
+                             ("laundry", "laundry_bill"),
+                             ("game", "game_bill")):
+        conn.execute(f"""
+            INSERT INTO charges (booking_id, category, item, qty, unit_price, posted_at)
+            SELECT id, '{category}', 'Balance brought forward', 1, {column}, created_at
+            FROM bookings
+            WHERE {column} != 0
+        """)
+        # bookings.<column> is a materialized SUM(qty * unit_price) per booking
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_charges_{category}
+            AFTER INSERT ON charges
+            WHEN NEW.category = '{category}'
+            BEGIN
+                UPDATE bookings SET {column} = {column} + NEW.qty * NEW.unit_price
+                WHERE id = NEW.booking_id;
+            END
+        """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_charges_append_only
+        BEFORE UPDATE ON charges
+        BEGIN
+            SELECT RAISE(ABORT, 'charges ledger is append-only; post a correcting line');
+        END
+    """)
+    # Covering indexes: per-booking itemization and per-item sales reports
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_charges_booking ON charges "
+                 "(booking_id, posted_at, category, item, qty, unit_price)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_charges_item ON charges "
+                 "(category, item, posted_at, qty, unit_price)")
+
+# Stay length in nights; a same-day stay counts as one
+NIGHTS_SQL = ("COALESCE(MAX(CAST(julianday(substr({0}.check_out_date, 1, 10)) - "
+              "julianday(substr({0}.check_in_date, 1, 10)) AS INTEGER), 1), 1)")
+
+ROLLUP_FILL = (
+    "DELETE FROM rollup_room_daily",
+    f"""
+    INSERT INTO rollup_room_daily (day, room_type, bookings, room_nights, room_rent, revenue)
+    SELECT substr(check_in_date, 1, 10), COALESCE(room_type, ''), COUNT(*),
+           SUM({NIGHTS_SQL.format('bookings')}), SUM(room_rent), SUM(total_bill)
+    FROM bookings
+    GROUP BY 1, 2
+    """,
+    "DELETE FROM rollup_charge_daily",
+    """
+    INSERT INTO rollup_charge_daily (day, category, lines, qty, revenue)
+    SELECT substr(posted_at, 1, 10), category, COUNT(*), SUM(qty), SUM(qty * unit_price)
+    FROM charges
+    GROUP BY 1, 2
+    """,
+)
+
+def _room_rollup_upsert(row, sign):
+    """Add (sign=+1) or remove (sign=-1) one booking row's contribution"""
+    return f"""
+        INSERT INTO rollup_room_daily (day, room_type, bookings, room_nights, room_rent, revenue)
+        VALUES (substr({row}.check_in_date, 1, 10), COALESCE({row}.room_type, ''), {sign},
+                {sign} * {NIGHTS_SQL.format(row)}, {sign} * {row}.room_rent,
+                {sign} * {row}.total_bill)
+        ON CONFLICT (day, room_type) DO UPDATE SET
+            bookings = bookings + excluded.bookings,
+            room_nights = room_nights + excluded.room_nights,
+            room_rent = room_rent + excluded.room_rent,
+            revenue = revenue + excluded.revenue;
+    """
+
+@migration(6, "daily revenue rollups")
+def _revenue_rollups(conn):
+    # Revenue is attributed to the check-in day (rooms) or posting day
+    # (charges); monthly figures are summed from at most 31 daily rows
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_room_daily (
+            day TEXT NOT NULL,
+            room_type TEXT NOT NULL,
+            bookings INTEGER NOT NULL,
+            room_nights INTEGER NOT NULL,
+            room_rent REAL NOT NULL,
+            revenue REAL NOT NULL,
+            PRIMARY KEY (day, room_type)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rollup_charge_daily (
+            day TEXT NOT NULL,
+            category TEXT NOT NULL,
+            lines INTEGER NOT NULL,
+            qty REAL NOT NULL,
+            revenue REAL NOT NULL,
+            PRIMARY KEY (day, category)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS rollup_room_monthly AS
+        SELECT substr(day, 1, 7) AS month, room_type, SUM(bookings) AS bookings,
+               SUM(room_nights) AS room_nights, SUM(room_rent) AS room_rent,
+               SUM(revenue) AS revenue
+        FROM rollup_room_daily
+        GROUP BY 1, 2
+    """)
+    conn.execute("""
+        CREATE VIEW IF NOT EXISTS rollup_charge_monthly AS
+        SELECT substr(day, 1, 7) AS month, category, SUM(lines) AS lines,
+               SUM(qty) AS qty, SUM(revenue) AS revenue
+        FROM rollup_charge_daily
+        GROUP BY 1, 2
+    """)
+    for statement in ROLLUP_FILL:
+        conn.execute(statement)
+    # Triggers apply deltas, so chained updates (a ledger line updating
+    # restaurant_bill, which updates total_bill) each add their own share
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_bookings_insert
+        AFTER INSERT ON bookings
+        BEGIN
+            {_room_rollup_upsert("NEW", 1)}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_bookings_update
+        AFTER UPDATE OF check_in_date, check_out_date, room_type, room_rent, total_bill
+        ON bookings
+        BEGIN
+            {_room_rollup_upsert("OLD", -1)}
+            {_room_rollup_upsert("NEW", 1)}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_bookings_delete
+        AFTER DELETE ON bookings
+        BEGIN
+            {_room_rollup_upsert("OLD", -1)}
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_charges_insert
+        AFTER INSERT ON charges
+        BEGIN
+            INSERT INTO rollup_charge_daily (day, category, lines, qty, revenue)
+            VALUES (substr(NEW.posted_at, 1, 10), NEW.category, 1, NEW.qty,
+                    NEW.qty * NEW.unit_price)
+            ON CONFLICT (day, category) DO UPDATE SET
+                lines = lines + 1,
+                qty = qty + excluded.qty,
+                revenue = revenue + excluded.revenue;
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_rollup_charges_delete
+        AFTER DELETE ON charges
+        BEGIN
+            UPDATE rollup_charge_daily
+            SET lines = lines - 1, qty = qty - OLD.qty, revenue = revenue - OLD.qty * OLD.unit_price
+            WHERE day = substr(OLD.posted_at, 1, 10) AND category = OLD.category;
+        END
+    """)
+
+# Price list in effect before any catalog existed (the old hard-coded prices)
+SEED_PRICES = (
+    ("room", "Type A", 6000, "night", "Luxury Suite"),
+    ("room", "Type B", 5000, "night", "Deluxe Room"),
+    ("room", "Type C", 4000, "night", "Standard Room"),
+    ("room", "Type D", 3000, "night", "Economy Room"),
+    ("restaurant", "Water", 20, "each", None),
+    ("restaurant", "Tea", 10, "each", None),
+    ("restaurant", "Breakfast Combo", 90, "each", None),
+    ("restaurant", "Lunch", 110, "each", None),
+    ("restaurant", "Dinner", 150, "each", None),
+    ("laundry", "Shorts", 3, "each", None),
+    ("laundry", "Trousers", 4, "each", None),
+    ("laundry", "Shirt", 5, "each", None),
+    ("laundry", "Jeans", 6, "each", None),
+    ("laundry", "Girl Suit", 8, "each", None),
+    ("game", "Table Tennis", 60, "hour", None),
+    ("game", "Bowling", 80, "hour", None),
+    ("game", "Snooker", 70, "hour", None),
+    ("game", "Video Games", 90, "hour", None),
+    ("game", "Pool", 50, "hour", None),
+)
+
+@migration(7, "effective-dated pricing catalog")
+def _pricing_catalog(conn):
+    # A version is a complete price list in effect from effective_from until
+    # the next version; published versions are never edited
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS price_versions (
+            version INTEGER PRIMARY KEY AUTOINCREMENT,
+            effective_from TEXT NOT NULL,
+            note TEXT,
+            published_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS price_items (
+            version INTEGER NOT NULL REFERENCES price_versions (version),
+            category TEXT NOT NULL,
+            item TEXT NOT NULL,
+            price REAL NOT NULL,
+            unit TEXT NOT NULL DEFAULT 'each',
+            description TEXT,
+            position INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (version, category, item)
+        ) WITHOUT ROWID
+    """)
+    # Date-based rates: a night matching start_date <= night < end_date and
+    # one of weekdays (Monday=0, e.g. '45' for Friday and Saturday nights)
+    # costs price, or the base price times multiplier
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS price_rates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            version INTEGER NOT NULL REFERENCES price_versions (version),
+            category TEXT NOT NULL,
+            item TEXT NOT NULL,
+            name TEXT NOT NULL,
+            start_date TEXT,
+            end_date TEXT,
+            weekdays TEXT,
+            price REAL,
+            multiplier REAL,
+            priority INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    for table in ("price_versions", "price_items", "price_rates"):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_immutable_update
+            BEFORE UPDATE ON {table}
+            BEGIN
+                SELECT RAISE(ABORT, 'published prices are immutable; publish a new version');
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_immutable_delete
+            BEFORE DELETE ON {table}
+            BEGIN
+                SELECT RAISE(ABORT, 'published prices are immutable; publish a new version');
+            END
+        """)
+    if conn.execute("SELECT COUNT(*) FROM price_versions").fetchone()[0] == 0:
+        version = conn.execute("""
+            INSERT INTO price_versions (effective_from, note)
+            VALUES ('0001-01-01', 'Initial price list')
+        """).lastrowid
+        conn.executemany("""
+            INSERT INTO price_items (version, category, item, price, unit, description, position)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, [(version,) + row + (position,) for position, row in enumerate(SEED_PRICES)])
+
+@migration(8, "full-text guest search")
+def _guest_search(conn):
+    # External-content index: the text lives only in bookings, the index
+    # holds tokens; prefix indexes make search-as-you-type lookups cheap
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS bookings_fts USING fts5 (
+            name, address,
+            content = 'bookings', content_rowid = 'id',
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+    # Name matches outrank address matches
+    conn.execute("INSERT INTO bookings_fts (bookings_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    conn.execute("INSERT INTO bookings_fts (bookings_fts) VALUES ('rebuild')")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_insert
+        AFTER INSERT ON bookings
+        BEGIN
+            INSERT INTO bookings_fts (rowid, name, address)
+            VALUES (NEW.id, NEW.name, NEW.address);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_delete
+        AFTER DELETE ON bookings
+        BEGIN
+            INSERT INTO bookings_fts (bookings_fts, rowid, name, address)
+            VALUES ('delete', OLD.id, OLD.name, OLD.address);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_bookings_fts_update
+        AFTER UPDATE OF name, address ON bookings
+        BEGIN
+            INSERT INTO bookings_fts (bookings_fts, rowid, name, address)
+            VALUES ('delete', OLD.id, OLD.name, OLD.address);
+            INSERT INTO bookings_fts (rowid, name, address)
+            VALUES (NEW.id, NEW.name, NEW.address);
+        END
+    """)
+
+@migration(9, "archival keeps rollups of archived bookings")
+def _archive_support(conn):
+    # Ids being moved to the archive; only filled inside the archiving
+    # transaction, so the delete triggers leave those rows in the rollups
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS archive_moving (
+            booking_id INTEGER PRIMARY KEY
+        )
+    """)
+    conn.execute("DROP TRIGGER IF EXISTS trg_rollup_bookings_delete")
+    conn.execute(f"""
+        CREATE TRIGGER trg_rollup_bookings_delete
+        AFTER DELETE ON bookings
+        WHEN NOT EXISTS (SELECT 1 FROM archive_moving WHERE booking_id = OLD.id)
+        BEGIN
+            {_room_rollup_upsert("OLD", -1)}
+        END
+    """)
+    conn.execute("DROP TRIGGER IF EXISTS trg_rollup_charges_delete")
+    conn.execute("""
+        CREATE TRIGGER trg_rollup_charges_delete
+        AFTER DELETE ON charges
+        WHEN NOT EXISTS (SELECT 1 FROM archive_moving WHERE booking_id = OLD.booking_id)
+        BEGIN
+            UPDATE rollup_charge_daily
+            SET lines = lines - 1, qty = qty - OLD.qty, revenue = revenue - OLD.qty * OLD.unit_price
+            WHERE day = substr(OLD.posted_at, 1, 10) AND category = OLD.category;
+        END
+    """)
+
+STAY_CHANGES_KEPT = 10000  # newest stay_changes rows kept for readers catching up
+
+@migration(10, "stay change log for the availability index")
+def _stay_changes(conn):
+    # Changed or deleted stays (booking_id NULL: the rooms inventory
+    # changed) get a sequence number, so in-memory indexes in any process
+    # replay just the rows after the last one they saw. New bookings need
+    # no entry: readers pick them up by id.
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS stay_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            booking_id INTEGER
+        )
+    """)
+    for name, event, booking_id in (
+            ("trg_stay_changes_update",
+             "AFTER UPDATE OF room_no, check_in_date, check_out_date ON bookings", "OLD.id"),
+            ("trg_stay_changes_delete", "AFTER DELETE ON bookings", "OLD.id"),
+            ("trg_stay_changes_rooms_insert", "AFTER INSERT ON rooms", "NULL"),
+            ("trg_stay_changes_rooms_update", "AFTER UPDATE ON rooms", "NULL"),
+            ("trg_stay_changes_rooms_delete", "AFTER DELETE ON rooms", "NULL")):
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {name}
+            {event}
+            BEGIN
+                INSERT INTO stay_changes (booking_id) VALUES ({booking_id});
+            END
+        """)
+    # Only the newest rows are kept; a reader further behind rebuilds
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_stay_changes_prune
+        AFTER INSERT ON stay_changes
+        BEGIN
+            DELETE FROM stay_changes WHERE seq <= NEW.seq - {STAY_CHANGES_KEPT};
+        END
+    """)
+
+# ==================== ARCHIVE DATABASE ====================
+
+# Same columns as the live tables; ids are kept, so no AUTOINCREMENT
+ARCHIVE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS archive.bookings (
+        id INTEGER PRIMARY KEY,
+        room_no INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        address TEXT,
+        check_in_date TEXT NOT NULL,
+        check_out_date TEXT NOT NULL,
+        room_type TEXT,
+        room_rent REAL DEFAULT 0,
+        restaurant_bill REAL DEFAULT 0,
+        laundry_bill REAL DEFAULT 0,
+        game_bill REAL DEFAULT 0,
+        service_charge REAL DEFAULT 1800,
+        total_bill REAL DEFAULT 0,
+        created_at TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS archive.idx_bookings_created_at ON bookings (created_at, id)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_bookings_stay ON bookings (check_in_date, check_out_date)",
+    """
+    CREATE TABLE IF NOT EXISTS archive.charges (
+        id INTEGER PRIMARY KEY,
+        booking_id INTEGER NOT NULL,
+        category TEXT NOT NULL,
+        item TEXT,
+        qty REAL NOT NULL DEFAULT 1,
+        unit_price REAL NOT NULL,
+        posted_at TIMESTAMP
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS archive.idx_charges_booking ON charges "
+    "(booking_id, posted_at, category, item, qty, unit_price)",
+    "CREATE INDEX IF NOT EXISTS archive.idx_charges_item ON charges "
+    "(category, item, posted_at, qty, unit_price)",
+    """
+    CREATE TABLE IF NOT EXISTS archive.archive_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        finished_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        checked_out_before TEXT NOT NULL,
+        bookings INTEGER NOT NULL,
+        charges INTEGER NOT NULL
+    )
+    """,
+)
+
+# Rollup contributions of archived bookings, added on top of ROLLUP_FILL;
+# rows still present in main (an interrupted move) are counted there
+ARCHIVE_ROLLUP_FILL = (
+    f"""
+    INSERT INTO rollup_room_daily (day, room_type, bookings, room_nights, room_rent, revenue)
+    SELECT substr(check_in_date, 1, 10), COALESCE(room_type, ''), COUNT(*),
+           SUM({NIGHTS_SQL.format('a')}), SUM(room_rent), SUM(total_bill)
+    FROM archive.bookings AS a
+    WHERE id NOT IN (SELECT id FROM main.bookings)
+    GROUP BY 1, 2
+    ON CONFLICT (day, room_type) DO UPDATE SET
+        bookings = bookings + excluded.bookings,
+        room_nights = room_nights + excluded.room_nights,
+        room_rent = room_rent + excluded.room_rent,
+        revenue = revenue + excluded.revenue
+    """,
+    """
+    INSERT INTO rollup_charge_daily (day, category, lines, qty, revenue)
+    SELECT substr(posted_at, 1, 10), category, COUNT(*), SUM(qty), SUM(qty * unit_price)
+    FROM archive.charges
+    WHERE booking_id NOT IN (SELECT id FROM main.bookings)
+    GROUP BY 1, 2
+    ON CONFLICT (day, category) DO UPDATE SET
+        lines = lines + excluded.lines,
+        qty = qty + excluded.qty,
+        revenue = revenue + excluded.revenue
+    """,
+)
+
+def has_archive(db=None):
+    """True when the connection has the archive database attached"""
+    db = db or get_manager()
+    return any(row[1] == "archive" for row in db.execute("PRAGMA database_list"))
+
+def init_archive(db=None):
+    """Create the archive tables in the attached archive database, if any"""
+    db = db or get_manager()
+    if not has_archive(db):
+        return False
+    if db.execute("SELECT 1 FROM archive.sqlite_master WHERE name = 'archive_runs'").fetchone():
+        return True
+    # WAL lets readers keep querying the archive while a run writes to it
+    db.execute("PRAGMA archive.journal_mode = WAL")
+    with db.transaction("IMMEDIATE") as conn:
+        for statement in ARCHIVE_SCHEMA:
+            conn.execute(statement)
+    return True
+
+# ==================== MIGRATION RUNNER ====================
+
+def migrate(db=None, target=None):
+    """Apply pending migrations up to target (default: latest)
+
+    Returns the list of versions applied. On an up-to-date database this
+    is a single PRAGMA read, so it is cheap to call at every startup.
+    """
+    db = db or get_manager()
+    target = latest_version() if target is None else target
+    if current_version(db) >= target:
+        return []
+
+    applied = []
+    for version, description, func in MIGRATIONS:
+        if version > target:
+            break
+        # IMMEDIATE takes the write lock up front, so two processes starting
+        # together cannot both run the same migration
+        with db.transaction("IMMEDIATE") as conn:
+            if current_version(db) >= version:
+                continue
+            func(conn)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+        applied.append(version)
+
+    if applied:
+        db.execute("PRAGMA optimize")
+    return applied
+
+def init_database(db=None):
+    """Initialize the database, upgrading older files in place"""
+    db = db or get_manager()
+    applied = migrate(db)
+    init_archive(db)
+    return applied
@@ -0,0 +1,411 @@
+"""
+Hotel Management System - HTTP/JSON API
+asyncio HTTP/1.1 server for kiosks and POS terminals, with keep-alive and pipelining
+
+Usage: python -m hotel.server [--host 127.0.0.1] [--port 8080] [--db FILE] [--workers 4]
+                              [--group-commit MS]
+
+Endpoints:
+    POST /bookings                  {"name", "address", "check_in", "check_out", "room_type"?}
+    GET  /bookings?limit=&after_created_at=&after_id=
+    GET  /bookings/search?q=&limit=
+    GET  /bookings/<id>
+    GET  /bookings/<id>/total
+    POST /bookings/<id>/room        {"room_type", "nights"?}
+    POST /bookings/<id>/charges     {"category", "amount"} or {"category", "item", "qty", "unit_price"}
+    POST /charges                   [[booking_id, category, amount], ...]
+    GET  /metrics                   instrumentation snapshot (when HOTEL_METRICS is set)
+"""
+
+import argparse
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from .core import HotelManagement, check_stay
+from .db import DB_FILE, ConnectionManager, existing_archive
+from .instrument import from_environment
+from .schema import init_database
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_PIPELINE = 32          # requests read ahead per connection
+SAFE_METHODS = ("GET", "HEAD")
+KEEP_ALIVE_TIMEOUT = 30    # seconds an idle connection is kept open
+MAX_PAGE_SIZE = 500
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message=None):
+        super().__init__(message or status.phrase)
+        self.status = status
+
+# ==================== ROUTES ====================
+
+def _json_body(body):
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "body is not valid JSON")
+
+def _require(data, *keys):
+    if not isinstance(data, dict):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "expected a JSON object")
+    missing = [key for key in keys if data.get(key) in (None, "")]
+    if missing:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"missing fields: {', '.join(missing)}")
+    return [data[key] for key in keys]
+
+TYPE_NAMES = {str: "a string", int: "an integer", (int, float): "a number"}
+
+def _check(key, value, kind):
+    """value unchanged if it is None or of kind (bools are not numbers), else 400"""
+    if value is not None and (isinstance(value, bool) or not isinstance(value, kind)):
+        raise HTTPError(HTTPStatus.BAD_REQUEST, f"{key} must be {TYPE_NAMES[kind]}")
+    return value
+
+
+class BookingAPI:
+    """Maps requests onto HotelManagement; every handler runs on the DB thread pool"""
+
+    def __init__(self, hotel, metrics=None):
+        self.hotel = hotel
+        self.metrics = metrics
+        self.routes = [
+            ("POST", re.compile(r"^/bookings$"), self.create_booking),
+            ("GET", re.compile(r"^/bookings$"), self.list_bookings),
+            ("GET", re.compile(r"^/bookings/search$"), self.search_bookings),
+            ("GET", re.compile(r"^/bookings/(\d+)$"), self.get_booking),
+            ("GET", re.compile(r"^/bookings/(\d+)/total$"), self.get_total),
+            ("POST", re.compile(r"^/bookings/(\d+)/room$"), self.update_room_rent),
+            ("POST", re.compile(r"^/bookings/(\d+)/charges$"), self.add_charge),
+            ("POST", re.compile(r"^/charges$"), self.post_charges),
+            ("GET", re.compile(r"^/metrics$"), self.get_metrics),
+        ]
+
+    def resolve(self, method, path):
+        """Return (handler, path_args) or raise 404/405"""
+        allowed = False
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match:
+                if route_method == method:
+                    return handler, [int(arg) for arg in match.groups()]
+                allowed = True
+        raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED if allowed else HTTPStatus.NOT_FOUND)
+
+    def create_booking(self, query, body):
+        data = _json_body(body)
+        name, check_in, check_out = _require(data, "name", "check_in", "check_out")
+        for key in ("name", "check_in", "check_out", "address", "room_type"):
+            _check(key, data.get(key), str)
+        try:
+            check_stay(check_in, check_out)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        try:
+            booking_id, room_no = self.hotel.create_booking(
+                name, data.get("address") or "", check_in, check_out, data.get("room_type"))
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.CONFLICT, str(e))
+        return HTTPStatus.CREATED, {"id": booking_id, "room_no": room_no}
+
+    def list_bookings(self, query, body):
+        try:
+            limit = min(int(query.get("limit", 100)), MAX_PAGE_SIZE)
+            after = None
+            if "after_id" in query or "after_created_at" in query:
+                after = (query["after_created_at"], int(query["after_id"]))
+        except (KeyError, ValueError):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "bad paging parameters")
+        page = self.hotel.get_bookings_page(limit, after=after)
+        next_cursor = None
+        if len(page) == limit:
+            next_cursor = {"after_created_at": page[-1]["created_at"],
+                           "after_id": page[-1]["id"]}
+        return HTTPStatus.OK, {"bookings": page, "next": next_cursor}
+
+    def search_bookings(self, query, body):
+        try:
+            limit = min(int(query.get("limit", 50)), MAX_PAGE_SIZE)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "bad limit")
+        return HTTPStatus.OK, {"bookings": self.hotel.search_bookings(query.get("q", ""), limit)}
+
+    def get_booking(self, query, body, booking_id):
+        booking = self.hotel.get_booking(booking_id)
+        if booking is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "booking not found")
+        return HTTPStatus.OK, booking
+
+    def get_total(self, query, body, booking_id):
+        return HTTPStatus.OK, {"id": booking_id,
+                               "total": self.hotel.calculate_total(booking_id)}
+
+    def update_room_rent(self, query, body, booking_id):
+        data = _json_body(body)
+        (room_type,) = _require(data, "room_type")
+        _check("room_type", room_type, str)
+        nights = _check("nights", data.get("nights"), int)
+        if nights is not None and nights <= 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "nights must be greater than 0")
+        if self.hotel.get_booking(booking_id) is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "booking not found")
+        try:
+            room_rent = self.hotel.update_room_rent(booking_id, room_type, nights)
+        except (LookupError, ValueError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return HTTPStatus.OK, {"id": booking_id, "room_rent": room_rent}
+
+    def add_charge(self, query, body, booking_id):
+        data = _json_body(body)
+        (category,) = _require(data, "category")
+        _check("category", category, str)
+        if "item" in data:
+            item, qty, unit_price = _require(data, "item", "qty", "unit_price")
+            _check("item", item, str)
+            _check("qty", qty, (int, float))
+            _check("unit_price", unit_price, (int, float))
+            charge = (booking_id, category, item, qty, unit_price)
+        else:
+            (amount,) = _require(data, "amount")
+            _check("amount", amount, (int, float))
+            charge = (booking_id, category, amount)
+        return self._post([charge])
+
+    def post_charges(self, query, body):
+        charges = _json_body(body)
+        if not isinstance(charges, list) or not all(isinstance(c, list) for c in charges):
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "expected a JSON array of charges")
+        # ledger_row checks the types and ranges of each charge
+        return self._post(charges)
+
+    def _post(self, charges):
+        try:
+            posted = self.hotel.post_charges(charges)
+        except (TypeError, ValueError) as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        return HTTPStatus.OK, {"posted": posted}
+
+    def get_metrics(self, query, body):
+        if self.metrics is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND, "instrumentation is not enabled")
+        return HTTPStatus.OK, self.metrics.snapshot()
+
+# ==================== HTTP SERVER ====================
+
+class BookingServer:
+    """HTTP/1.1 front end; DB calls run on a bounded thread pool
+
+    Each connection has a reader that parses requests as they arrive and
+    starts them immediately (up to MAX_PIPELINE ahead), and a writer that
+    sends the responses back in request order.
+    """
+
+    def __init__(self, hotel, workers=4, max_pending=None, metrics=None):
+        self.api = BookingAPI(hotel, metrics)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hotel-api")
+        # Bounds work handed to the pool; further requests wait here
+        self.slots = asyncio.Semaphore(max_pending or workers * 4)
+        self.server = None
+        self.connections = set()
+
+    async def start(self, host="127.0.0.1", port=8080):
+        self.server = await asyncio.start_server(self.handle_connection, host, port,
+                                                 limit=MAX_HEADER_BYTES)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for task in list(self.connections):
+            task.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        self.pool.shutdown(wait=True)
+
+    async def run_handler(self, handler, args):
+        async with self.slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, lambda: handler(*args))
+
+    async def dispatch(self, method, target, body, after=()):
+        """Run one request once the tasks in after finish; returns (status, payload)"""
+        if after:
+            await asyncio.wait(after)
+        try:
+            url = urlsplit(target)
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            handler, path_args = self.api.resolve(method, url.path)
+            return await self.run_handler(handler, [query, body, *path_args])
+        except HTTPError as e:
+            return e.status, {"error": str(e)}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+
+    async def read_request(self, reader):
+        """Parse one request; returns None on a clean EOF"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial.strip():
+                return None
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "incomplete request")
+        except asyncio.LimitOverrunError:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "bad request line")
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "chunked bodies are not supported")
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+        return method.upper(), target, body, keep_alive
+
+    async def handle_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self.connections.add(task)
+        task.add_done_callback(self.connections.discard)
+        responses = asyncio.Queue(MAX_PIPELINE)
+        sender = asyncio.create_task(self.send_responses(responses, writer))
+        # Pipelined reads run side by side, but a write waits for every
+        # earlier request and every later request waits for it, so each
+        # request sees the writes sent before it on this connection
+        reads = []
+        last_write = None
+        cancelled = False
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader),
+                                                     KEEP_ALIVE_TIMEOUT)
+                except HTTPError as e:
+                    await responses.put((self._done(e.status, {"error": str(e)}), False))
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError,
+                        ConnectionError):
+                    break
+                if request is None:
+                    break
+                method, target, body, keep_alive = request
+                if method in SAFE_METHODS:
+                    reads = [read for read in reads if not read.done()]
+                    after = [last_write] if last_write else []
+                    task = asyncio.create_task(self.dispatch(method, target, body, after))
+                    reads.append(task)
+                else:
+                    after = reads + ([last_write] if last_write else [])
+                    task = asyncio.create_task(self.dispatch(method, target, body, after))
+                    last_write = task
+                    reads = []
+                await responses.put((task, keep_alive))
+                if not keep_alive:
+                    break
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if cancelled:
+                sender.cancel()
+            elif not sender.done():
+                await responses.put(None)
+            await asyncio.gather(sender, return_exceptions=True)
+
+    @staticmethod
+    def _done(status, payload):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result((status, payload))
+        return future
+
+    async def send_responses(self, responses, writer):
+        try:
+            while True:
+                entry = await responses.get()
+                if entry is None:
+                    break
+                task, keep_alive = entry
+                status, payload = await task
+                body = json.dumps(payload).encode()
+                head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+                writer.write(head.encode() + body)
+                # Flush once the pipeline is drained rather than per response
+                if responses.empty():
+                    await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            # Anything still queued belongs to a dead connection
+            while not responses.empty():
+                entry = responses.get_nowait()
+                if entry is not None:
+                    entry[0].cancel()
+            writer.close()
+
+# ==================== CLI ====================
+
+async def serve(host, port, db_file, workers, group_commit_ms=None, archive=None):
+    db = ConnectionManager(db_file, archive=archive or existing_archive(db_file))
+    init_database(db)
+    hotel = HotelManagement(db)
+    if group_commit_ms is not None:
+        hotel.enable_group_commit(group_commit_ms / 1000)
+    metrics, metrics_path = from_environment(hotel)
+    server = BookingServer(hotel, workers, metrics=metrics)
+    await server.start(host, port)
+    print(f"Serving {db_file} on http://{host}:{port} with {workers} DB workers")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        hotel.close()
+        if metrics is not None:
+            metrics.export(metrics_path)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hotel booking HTTP/JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--db", default=DB_FILE, help="database file")
+    parser.add_argument("--archive",
+                        help="archive file to attach (default: <db>_archive.db if it exists)")
+    parser.add_argument("--workers", type=int, default=4, help="DB thread pool size")
+    parser.add_argument("--group-commit", type=float, metavar="MS",
+                        help="commit charges from all workers together, waiting up to "
+                             "MS ms for a group to fill (0 = no wait)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.db, args.workers, args.group_commit,
+                          args.archive))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
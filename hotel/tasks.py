@@ -0,0 +1,161 @@
+"""
+Hotel Management System - Background Task Executor
+Runs database work off the Tk main thread and hands results back via root.after
+"""
+
+import queue
+import threading
+import traceback
+
+# ==================== TASK EXECUTOR ====================
+
+class Task:
+    """A unit of work plus the callbacks that receive its outcome"""
+
+    __slots__ = ("func", "on_success", "on_error", "key")
+
+    def __init__(self, func, on_success=None, on_error=None, key=None):
+        self.func = func
+        self.on_success = on_success
+        self.on_error = on_error
+        self.key = key
+
+
+class TaskExecutor:
+    """Worker threads fed by a queue, with results delivered on the Tk thread
+
+    Workers never touch Tk. Finished tasks are put on a result queue that
+    the Tk thread drains every poll_ms through root.after, so callbacks can
+    update widgets safely. Without a root, callbacks run on the worker; an
+    error no callback handles goes to on_error or is printed, and the
+    worker carries on with the next task.
+
+    Tasks submitted with a key are coalesced: while a task with that key is
+    still queued, newer submissions replace its function and callbacks
+    instead of queueing a duplicate.
+    """
+
+    def __init__(self, root=None, workers=1, poll_ms=20, on_error=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.default_on_error = on_error
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending_keys = {}
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._coalesced = 0
+        self._stopped = False
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._worker, name=f"hotel-db-{i}",
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if root is not None:
+            root.after(self.poll_ms, self._poll)
+
+    def submit(self, func, on_success=None, on_error=None, key=None):
+        """Queue func() to run on a worker thread"""
+        with self._lock:
+            if self._stopped:
+                raise RuntimeError("TaskExecutor has been shut down")
+            if key is not None and key in self._pending_keys:
+                task = self._pending_keys[key]
+                task.func = func
+                task.on_success = on_success
+                task.on_error = on_error
+                self._coalesced += 1
+                return
+            task = Task(func, on_success, on_error, key)
+            if key is not None:
+                self._pending_keys[key] = task
+        self._tasks.put(task)
+
+    def _worker(self):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            with self._lock:
+                # Once started, a newer request with the same key must queue
+                # a fresh run rather than merge into this one
+                if task.key is not None:
+                    self._pending_keys.pop(task.key, None)
+                self._in_flight += 1
+            try:
+                result = task.func()
+            except Exception as e:
+                outcome = (task.on_error or self.default_on_error, e, False)
+            else:
+                outcome = (task.on_success, result, True)
+            with self._lock:
+                self._in_flight -= 1
+                if outcome[2]:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+            if self.root is None:
+                # A failing task or callback must not end the worker loop
+                try:
+                    self._deliver(*outcome)
+                except Exception as e:
+                    self._report_error(e, outcome[0])
+            else:
+                self._results.put(outcome)
+
+    def _deliver(self, callback, value, ok):
+        if callback is not None:
+            callback(value)
+        elif not ok:
+            raise value
+
+    def _report_error(self, error, failed_callback):
+        """Hand an unhandled worker-side error to on_error, or print it like Tk would"""
+        handler = self.default_on_error
+        if handler is not None and handler is not failed_callback:
+            try:
+                handler(error)
+                return
+            except Exception as e:
+                error = e
+        traceback.print_exception(type(error), error, error.__traceback__)
+
+    def _poll(self):
+        """Drain finished tasks on the Tk thread and reschedule"""
+        while True:
+            try:
+                outcome = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._deliver(*outcome)
+            except Exception as e:
+                self.root.report_callback_exception(type(e), e, e.__traceback__)
+        if not self._stopped:
+            self.root.after(self.poll_ms, self._poll)
+
+    def stats(self):
+        """In-flight, queued and lifetime counters"""
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "queue_depth": self._tasks.qsize(),
+                "completed": self._completed,
+                "failed": self._failed,
+                "coalesced": self._coalesced,
+            }
+
+    def shutdown(self, wait=True):
+        """Stop the workers after the queued tasks finish"""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        for _ in self._threads:
+            self._tasks.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
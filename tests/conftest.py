@@ -0,0 +1,53 @@
+"""
+Hotel Management System - Test Fixtures
+Throwaway databases with the archive attached, and a small mixed workload
+"""
+
+import pytest
+
+from hotel import ConnectionManager, HotelManagement, init_database
+
+@pytest.fixture
+def db(tmp_path):
+    db = ConnectionManager(str(tmp_path / "hotel_management.db"), archive=True)
+    init_database(db)
+    yield db
+    db.close_all()
+
+@pytest.fixture
+def hotel(db):
+    hotel = HotelManagement(db, cache_size=0)
+    yield hotel
+    hotel.close()
+
+STAYS = [
+    # (check_in, check_out, room_type, restaurant, laundry, game)
+    ("2020-03-01", "2020-03-04", "Type A", 450.0, 0.0, 120.0),
+    ("2020-03-02", "2020-03-02", "Type B", 0.0, 80.0, 0.0),
+    ("2020-12-30", "2021-01-02", "Type C", 1200.0, 150.0, 0.0),
+    ("2021-06-10", "2021-06-15", "Type A", 0.0, 0.0, 300.0),
+    ("2030-01-05", "2030-01-07", "Type D", 75.0, 0.0, 0.0),
+    ("2030-01-06", "2030-01-09", "Type B", 0.0, 40.0, 60.0),
+]
+
+def book_stays(hotel, stays=STAYS):
+    """Book each stay into a fresh room, price it and post its charges; returns the ids"""
+    ids = []
+    for i, (check_in, check_out, room_type, restaurant, laundry, game) in enumerate(stays):
+        booking_id, _ = hotel.create_booking(f"Guest {i}", f"{i} High Street",
+                                             check_in, check_out)
+        hotel.db.execute("UPDATE bookings SET room_type = ? WHERE id = ?",
+                         (room_type, booking_id))
+        hotel.update_room_rent(booking_id, room_type)
+        for category, amount in (("restaurant", restaurant), ("laundry", laundry),
+                                 ("game", game)):
+            if amount:
+                hotel.add_charge(booking_id, category, amount)
+        ids.append(booking_id)
+    return ids
+
+def bills(hotel, booking_id):
+    """(restaurant, laundry, game) read straight from the row, bypassing any buffer"""
+    return tuple(hotel.db.execute("""
+        SELECT restaurant_bill, laundry_bill, game_bill FROM bookings WHERE id = ?
+    """, (booking_id,)).fetchone())
@@ -0,0 +1,140 @@
+"""
+Hotel Management System - Analytics Tests
+Column kernels against a row-by-row reference, with and without NumPy
+"""
+
+import random
+from collections import defaultdict
+from datetime import date, timedelta
+
+import pytest
+
+from hotel import analytics
+from hotel.analytics import REVENUE_COLUMNS, RevenueAnalytics
+
+ROOM_TYPES = ("Type A", "Type B", "Type C", None)
+PERIODS = [("2023-01-01", "2025-01-01"), ("2023-06-10", "2023-06-11"),
+           ("2024-02-15", "2024-04-03"), ("2019-01-01", "2020-01-01")]
+
+@pytest.fixture
+def bookings(db):
+    rng = random.Random(15)
+    rows = []
+    for i in range(400):
+        check_in = date(2023, 1, 1) + timedelta(days=rng.randrange(700))
+        check_out = check_in + timedelta(days=rng.choice([0, 1, 2, 3, 7, 30]))
+        rows.append((i % 40 + 1, f"Guest {i}", check_in.isoformat(),
+                     check_out.isoformat() + rng.choice(["", " 11:00:00"]),
+                     rng.choice(ROOM_TYPES), rng.choice([0, 2500.0, 9999.5]),
+                     rng.choice([0, 120.0]), rng.choice([0, 15.5]), rng.choice([0, 60.0])))
+    rows.append((41, "Legacy", "5th May", "7th May", "Type A", 8000, 0, 0, 0))
+    db.executemany("""
+        INSERT INTO bookings (room_no, name, check_in_date, check_out_date, room_type,
+                              room_rent, restaurant_bill, laundry_bill, game_bill)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, rows)
+    return [dict(row) for row in db.execute("SELECT * FROM bookings")]
+
+def stays(bookings):
+    """(check_in, check_out, booking) with ordinals, skipping free-text dates"""
+    for booking in bookings:
+        try:
+            first = date.fromisoformat(booking["check_in_date"][:10]).toordinal()
+            last = date.fromisoformat(booking["check_out_date"][:10]).toordinal()
+        except ValueError:
+            continue
+        yield first, max(last, first + 1), booking
+
+def reference(bookings, start, end):
+    """Every report for one period, computed a booking and a night at a time"""
+    start, end = date.fromisoformat(start).toordinal(), date.fromisoformat(end).toordinal()
+    nights = revenue = 0.0
+    by_type = defaultdict(lambda: dict.fromkeys(REVENUE_COLUMNS + ("total",), 0.0))
+    by_day = defaultdict(float)
+    by_month = defaultdict(float)
+    for first, last, booking in stays(bookings):
+        inside = sum(1 for night in range(first, last) if start <= night < end)
+        nights += inside
+        revenue += booking["room_rent"] * inside / (last - first)
+        total = sum(booking[name] for name in REVENUE_COLUMNS)
+        group = by_type[booking["room_type"] or "Unassigned"]
+        for name in REVENUE_COLUMNS:
+            group[name] += booking[name]
+        group["total"] += total
+        if start <= first < end:
+            by_day[date.fromordinal(first)] += total
+            by_month[date.fromordinal(first).isoformat()[:7]] += total
+    return {
+        "room_nights": nights,
+        "room_revenue": revenue,
+        "by_type": dict(by_type),
+        "by_day": [(date.fromordinal(day), by_day[date.fromordinal(day)])
+                   for day in range(start, end)],
+        "by_month": by_month,
+    }
+
+def report(reports, start, end):
+    return {
+        "room_nights": reports.room_nights(start, end),
+        "room_revenue": reports.room_revenue(start, end),
+        "by_type": reports.revenue_by_room_type(),
+        "by_day": reports.revenue_by_day(start, end),
+        "by_month": dict(reports.revenue_by_month(start, end)),
+        "summary": reports.summary(start, end),
+    }
+
+def assert_reports_equal(actual, expected):
+    assert actual["room_nights"] == expected["room_nights"]
+    assert actual["room_revenue"] == pytest.approx(expected["room_revenue"])
+    assert actual["by_type"].keys() == expected["by_type"].keys()
+    for room_type, sums in expected["by_type"].items():
+        assert actual["by_type"][room_type] == pytest.approx(sums), room_type
+    assert [day for day, _ in actual["by_day"]] == [day for day, _ in expected["by_day"]]
+    assert [amount for _, amount in actual["by_day"]] == pytest.approx(
+        [amount for _, amount in expected["by_day"]])
+    assert {month: amount for month, amount in actual["by_month"].items() if amount} == (
+        pytest.approx(dict(expected["by_month"])))
+
+@pytest.mark.parametrize("start, end", PERIODS)
+def test_fallback_matches_the_reference(monkeypatch, db, bookings, start, end):
+    monkeypatch.setattr(analytics, "np", None)
+    reports = RevenueAnalytics.load(db)
+    assert len(reports.columns) == len(bookings) - 1
+    actual = report(reports, start, end)
+    assert_reports_equal(actual, reference(bookings, start, end))
+    summary = actual["summary"]
+    # No rooms inventory: every room ever booked counts, legacy stays too
+    rooms = len({booking["room_no"] for booking in bookings})
+    available = rooms * (date.fromisoformat(end) - date.fromisoformat(start)).days
+    assert summary["rooms"] == rooms and summary["available_room_nights"] == available
+    assert summary["occupancy"] == pytest.approx(summary["room_nights"] / available)
+    if summary["room_nights"]:
+        assert summary["adr"] == pytest.approx(summary["room_revenue"] / summary["room_nights"])
+
+def test_numpy_matches_the_fallback(monkeypatch, db, bookings):
+    pytest.importorskip("numpy")
+    fast = RevenueAnalytics.load(db)
+    monkeypatch.setattr(analytics, "np", None)
+    slow = RevenueAnalytics.load(db)
+    for start, end in PERIODS:
+        expected = report(slow, start, end)
+        actual = report(fast, start, end)
+        assert_reports_equal(actual, expected)
+        assert actual["summary"] == pytest.approx(expected["summary"])
+
+def test_since_and_room_type_period_filters(monkeypatch, db, bookings):
+    monkeypatch.setattr(analytics, "np", None)
+    recent = RevenueAnalytics.load(db, since="2024-06-01", rooms=10)
+    assert recent.rooms == 10
+    assert len(recent.columns) == sum(1 for _, _, booking in stays(bookings)
+                                      if booking["check_out_date"] >= "2024-06-01")
+    by_type = RevenueAnalytics.load(db).revenue_by_room_type("2024-01-01", "2024-02-01")
+    expected = defaultdict(float)
+    for first, _, booking in stays(bookings):
+        if date(2024, 1, 1).toordinal() <= first < date(2024, 2, 1).toordinal():
+            expected[booking["room_type"] or "Unassigned"] += sum(
+                booking[name] for name in REVENUE_COLUMNS)
+    assert {key: sums["total"] for key, sums in by_type.items() if sums["total"]} == (
+        pytest.approx(dict(expected)))
+    with pytest.raises(ValueError):
+        recent.summary("2024-01-02", "2024-01-01")
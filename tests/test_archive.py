@@ -0,0 +1,125 @@
+"""
+Hotel Management System - Archive Tests
+Moving old stays to the archive database must not change what readers see
+"""
+
+import os
+
+import pytest
+
+from hotel import ConnectionManager, HotelManagement, bulk, init_database, receipts, rollups
+from hotel.analytics import RevenueAnalytics
+from hotel.archive import archive_bookings, archive_status
+from hotel.availability import AvailabilityIndex
+from hotel.db import archive_path
+from hotel.receipts import render_batch
+from hotel.rollups import charge_revenue, rebuild_rollups, room_revenue
+
+from conftest import book_stays
+
+CUTOFF = "2025-01-01"
+
+def snapshot(db):
+    analytics = RevenueAnalytics.load(db)
+    return {
+        "rooms": room_revenue(db, "day"),
+        "charges": charge_revenue(db, "day"),
+        "summary": analytics.summary("2020-01-01", "2031-01-01"),
+        "by_month": analytics.revenue_by_month("2020-01-01", "2031-01-01"),
+        "by_type": analytics.revenue_by_room_type(),
+    }
+
+def assert_same(actual, expected):
+    assert actual["summary"] == pytest.approx(expected["summary"])
+    for key in ("rooms", "charges", "by_month", "by_type"):
+        assert actual[key] == expected[key], key
+
+def test_archiving_leaves_rollups_and_analytics_unchanged(db, hotel):
+    book_stays(hotel)
+    before = snapshot(db)
+
+    moved, charges = archive_bookings(db, before=CUTOFF, pause=0)
+    assert moved == 4 and charges > 0
+    assert archive_status(db)["live_bookings"] == 2
+    assert_same(snapshot(db), before)
+
+    # The archived rows still rebuild to the same rollups
+    rebuild_rollups(db)
+    assert_same(snapshot(db), before)
+
+def test_only_iso_check_out_dates_are_archived(db, hotel):
+    db.execute("""
+        INSERT INTO bookings (room_no, name, check_in_date, check_out_date)
+        VALUES (1, 'Free text', '5th May', '7th May'), (2, 'Compact', '20190105', '20190107'),
+               (3, 'Timestamp', '2019-01-05', '2019-01-07 11:00:00'),
+               (4, 'ISO', '2019-01-05', '2019-01-07')
+    """)
+    assert archive_bookings(db, before=CUTOFF, pause=0) == (2, 0)
+    live = [row[0] for row in db.execute("SELECT name FROM main.bookings ORDER BY id")]
+    assert live == ["Free text", "Compact"]
+
+def test_archived_bookings_read_through(tmp_path, db, hotel):
+    ids = book_stays(hotel)
+    bookings = {b["id"]: b for b in hotel.get_all_bookings()}
+    ledgers = {booking_id: hotel.get_charges(booking_id) for booking_id in ids}
+
+    archive_bookings(db, before=CUTOFF, pause=0)
+    assert len(hotel.get_all_bookings()) == 2
+    assert {b["id"]: b for b in hotel.get_all_bookings(archived=True)} == bookings
+    for booking_id in ids:
+        assert hotel.get_booking(booking_id) == bookings[booking_id]
+        assert hotel.get_charges(booking_id) == ledgers[booking_id]
+    folios = tmp_path / "folios.txt"
+    assert render_batch(str(folios), db=db, single_file=True, workers=1) == 6
+    assert all(f"Booking ID: {booking_id}\n" in folios.read_text() for booking_id in ids)
+
+    # Archiving again finds nothing left to move
+    assert archive_bookings(db, before=CUTOFF, pause=0) == (0, 0)
+
+def test_availability_index_sees_archived_and_changed_stays(db, hotel):
+    hotel.add_rooms("Type A", [101, 102])
+    hotel.create_booking("Old", "", "2020-01-02", "2020-01-04", "Type A")
+    new, _ = hotel.create_booking("New", "", "2030-01-02", "2030-01-04", "Type A")
+    assert hotel.find_available_rooms("Type A", "2020-01-01", "2020-01-05") == [102]
+
+    archive_bookings(db, before=CUTOFF, pause=0)
+    assert hotel.find_available_rooms("Type A", "2020-01-01", "2020-01-05") == [101, 102]
+
+    db.execute("UPDATE bookings SET room_no = 102 WHERE id = ?", (new,))
+    assert hotel.find_available_rooms("Type A", "2030-01-01", "2030-01-05") == [101]
+    db.execute("DELETE FROM bookings WHERE id = ?", (new,))
+    hotel.add_rooms("Type A", [103])
+    fresh = AvailabilityIndex(db)
+    for check_in, check_out in (("2020-01-01", "2020-01-05"), ("2030-01-01", "2030-01-05")):
+        assert (hotel.find_available_rooms("Type A", check_in, check_out) ==
+                fresh.available_rooms("Type A", check_in, check_out) == [101, 102, 103])
+
+def test_command_line_tools_attach_only_an_existing_archive(tmp_path, capsys):
+    path = str(tmp_path / "hotel_management.db")
+    hotel = HotelManagement(ConnectionManager(path), cache_size=0)
+    init_database(hotel.db)
+    ids = book_stays(hotel)
+    hotel.close()
+
+    assert rollups.main(["--db", path, "rooms"]) == 0
+    assert bulk.main(["--db", path, "export", str(tmp_path / "out.csv")]) == 0
+    assert receipts.main(["--db", path, "show", str(ids[0])]) == 0
+    assert not os.path.exists(archive_path(path))
+
+    db = ConnectionManager(path, archive=True)
+    init_database(db)
+    archive_bookings(db, before=CUTOFF, pause=0)
+    db.close_all()
+    capsys.readouterr()
+    # Once archive_bookings has made the file, the tools read through it
+    assert receipts.main(["--db", path, "show", str(ids[0])]) == 0
+    assert f"Booking ID: {ids[0]}\n" in capsys.readouterr().out
+    assert rollups.main(["--db", path, "rebuild"]) == 0
+
+def test_room_numbers_are_not_reused_after_archiving(db, hotel):
+    ids = book_stays(hotel)
+    rooms = {hotel.get_booking(booking_id)["room_no"] for booking_id in ids}
+    archive_bookings(db, before="2031-01-01", pause=0)
+    assert hotel.get_all_bookings() == []
+    _, room_no = hotel.create_booking("Next", "", "2031-02-01", "2031-02-02")
+    assert room_no == max(rooms) + 1
@@ -0,0 +1,140 @@
+"""
+Hotel Management System - Availability Tests
+Overlap and boundary rules, and an index that follows every kind of change
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from hotel import ConnectionManager
+from hotel.archive import archive_bookings
+from hotel.availability import AvailabilityIndex, RoomOccupancy
+
+@pytest.fixture
+def rooms(hotel):
+    hotel.add_rooms("Type A", [101, 102, 103])
+    hotel.add_rooms("Type B", [201])
+    return hotel
+
+def free(hotel, check_in, check_out, room_type="Type A"):
+    return hotel.find_available_rooms(room_type, check_in, check_out)
+
+def test_overlap_and_boundary_days(rooms):
+    rooms.db.execute("""
+        INSERT INTO bookings (room_no, name, check_in_date, check_out_date)
+        VALUES (101, 'Stay', '2024-05-10', '2024-05-13'), (102, 'Day use', '2024-05-20', '2024-05-20')
+    """)
+    # Check-out day is free for the next guest, check-in day is not
+    assert free(rooms, "2024-05-13", "2024-05-15") == [101, 102, 103]
+    assert free(rooms, "2024-05-07", "2024-05-10") == [101, 102, 103]
+    assert free(rooms, "2024-05-12", "2024-05-14") == [102, 103]
+    assert free(rooms, "2024-05-09", "2024-05-11") == [102, 103]
+    assert free(rooms, "2024-05-11", "2024-05-12") == [102, 103]
+    assert free(rooms, "2024-05-01", "2024-05-31") == [103]
+    # A same-day stay blocks that night, in the booking and in the query
+    assert free(rooms, "2024-05-20", "2024-05-21") == [101, 103]
+    assert free(rooms, "2024-05-20", "2024-05-20") == [101, 103]
+    assert free(rooms, "2024-05-21", "2024-05-22") == [101, 102, 103]
+    assert free(rooms, "2024-05-10", "2024-05-12", "Type B") == [201]
+    assert free(rooms, "2024-05-10", "2024-05-12", "Type C") == []
+
+def test_create_booking_assigns_free_rooms_until_full(rooms):
+    assigned = [rooms.create_booking(f"Guest {i}", "", "2024-06-01", "2024-06-03", "Type A")[1]
+                for i in range(3)]
+    assert assigned == [101, 102, 103]
+    with pytest.raises(ValueError):
+        rooms.create_booking("One more", "", "2024-06-02", "2024-06-04", "Type A")
+    assert rooms.create_booking("Next guest", "", "2024-06-03", "2024-06-04", "Type A")[1] == 101
+
+def test_ignores_rooms_outside_the_inventory_and_free_text_dates(rooms):
+    rooms.db.execute("""
+        INSERT INTO bookings (room_no, name, check_in_date, check_out_date)
+        VALUES (999, 'No such room', '2024-05-10', '2024-05-13'),
+               (101, 'Legacy', '10th May', '13th May')
+    """)
+    assert free(rooms, "2024-05-10", "2024-05-13") == [101, 102, 103]
+
+def test_follows_writes_from_other_connections(rooms):
+    other = ConnectionManager(rooms.db.db_file)
+    try:
+        assert free(rooms, "2024-07-01", "2024-07-05") == [101, 102, 103]
+        booking_id = other.execute("""
+            INSERT INTO bookings (room_no, name, check_in_date, check_out_date)
+            VALUES (102, 'Elsewhere', '2024-07-02', '2024-07-04')
+        """).lastrowid
+        assert free(rooms, "2024-07-01", "2024-07-05") == [101, 103]
+        other.execute("UPDATE bookings SET check_in_date = '2024-08-02',"
+                      " check_out_date = '2024-08-04' WHERE id = ?", (booking_id,))
+        assert free(rooms, "2024-07-01", "2024-07-05") == [101, 102, 103]
+        assert free(rooms, "2024-08-01", "2024-08-05") == [101, 103]
+        other.execute("UPDATE bookings SET room_no = 103 WHERE id = ?", (booking_id,))
+        assert free(rooms, "2024-08-01", "2024-08-05") == [101, 102]
+        other.execute("DELETE FROM rooms WHERE room_no = 101")
+        assert free(rooms, "2024-08-01", "2024-08-05") == [102]
+        other.execute("DELETE FROM bookings WHERE id = ?", (booking_id,))
+        assert free(rooms, "2024-08-01", "2024-08-05") == [102, 103]
+    finally:
+        other.close_all()
+
+def test_archived_stays_free_their_rooms(db, rooms):
+    rooms.create_booking("Old", "", "2020-01-02", "2020-01-04", "Type A")
+    rooms.create_booking("New", "", "2030-01-02", "2030-01-04", "Type A")
+    assert free(rooms, "2020-01-01", "2020-01-05") == [102, 103]
+    assert archive_bookings(db, before="2025-01-01", pause=0) == (1, 0)
+    assert free(rooms, "2020-01-01", "2020-01-05") == [101, 102, 103]
+    assert free(rooms, "2030-01-01", "2030-01-05") == [102, 103]
+
+def test_rebuilds_after_the_change_log_is_pruned(rooms):
+    booking_id, _ = rooms.create_booking("Guest", "", "2024-09-01", "2024-09-03", "Type A")
+    assert free(rooms, "2024-09-01", "2024-09-03") == [102, 103]
+    # Simulate a reader that fell behind the pruned log
+    rooms.db.execute("UPDATE bookings SET room_no = 102 WHERE id = ?", (booking_id,))
+    rooms.db.execute("DELETE FROM stay_changes")
+    rooms.db.execute("INSERT INTO stay_changes (booking_id) VALUES (-1), (-1)")
+    rooms.db.execute("DELETE FROM stay_changes WHERE seq = (SELECT MIN(seq) FROM stay_changes)")
+    assert free(rooms, "2024-09-01", "2024-09-03") == [101, 103]
+
+def test_matches_a_fresh_index_under_random_changes(db, rooms):
+    rng = random.Random(3)
+
+    def stay():
+        check_in = date(2024, 1, 1) + timedelta(days=rng.randrange(60))
+        return check_in.isoformat(), (check_in + timedelta(days=rng.randint(0, 5))).isoformat()
+
+    for _ in range(300):
+        action = rng.random()
+        check_in, check_out = stay()
+        if action < 0.5:
+            try:
+                rooms.create_booking("G", "", check_in, check_out, "Type A")
+            except ValueError:
+                pass
+        elif action < 0.75:
+            db.execute("UPDATE bookings SET check_in_date = ?, check_out_date = ?, room_no = ?"
+                       " WHERE id = (SELECT id FROM bookings ORDER BY random() LIMIT 1)",
+                       (check_in, check_out, rng.choice([101, 102, 103])))
+        else:
+            db.execute("DELETE FROM bookings WHERE id = (SELECT id FROM bookings"
+                       " ORDER BY random() LIMIT 1)")
+        check_in, check_out = stay()
+        assert (free(rooms, check_in, check_out) ==
+                AvailabilityIndex(db).available_rooms("Type A", check_in, check_out))
+
+def test_room_occupancy_matches_brute_force():
+    rng = random.Random(5)
+    occupancy, stays = RoomOccupancy(), {}
+    for booking_id in range(400):
+        if stays and rng.random() < 0.3:
+            removed = rng.choice(sorted(stays))
+            occupancy.remove(stays.pop(removed)[0], removed)
+        start = rng.randrange(365)
+        end = start + rng.randint(1, 20)
+        occupancy.add(start, end, booking_id)
+        stays[booking_id] = (start, end)
+        query = rng.randrange(370)
+        query_end = query + rng.randint(1, 10)
+        expected = all(end <= query or start >= query_end for start, end in stays.values())
+        assert occupancy.is_free(query, query_end) == expected
+    assert occupancy.starts == sorted(occupancy.starts)
@@ -0,0 +1,54 @@
+"""
+Hotel Management System - Backup Tests
+Full and incremental snapshots verify and restore both databases
+"""
+
+import pytest
+
+from hotel.archive import archive_bookings
+from hotel.backup import create_snapshot, list_snapshots, restore_snapshot, verify_snapshot
+
+from conftest import book_stays
+
+def counts(db):
+    return tuple(db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                 for table in ("main.bookings", "main.charges",
+                               "archive.bookings", "archive.charges"))
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_snapshot_chain_verifies_and_restores(tmp_path, db, hotel, compress):
+    snapshots = str(tmp_path / "snapshots")
+    book_stays(hotel)
+    archive_bookings(db, before="2025-01-01", pause=0)
+    full = create_snapshot(snapshots, db, compress=compress, pause=0)
+    at_full = counts(db)
+
+    booking_id, _ = hotel.create_booking("Late guest", "", "2030-02-01", "2030-02-03")
+    hotel.update_restaurant_bill(booking_id, 99)
+    incremental = create_snapshot(snapshots, db, incremental=True, compress=compress, pause=0)
+    at_incremental = counts(db)
+    assert at_incremental != at_full
+    assert len(list_snapshots(snapshots)) == 2
+
+    for manifest in (full, incremental):
+        results = verify_snapshot(snapshots, manifest["name"])
+        assert results.keys() == {"main", "archive"}
+        assert all(result["integrity"] for result in results.values())
+
+    restore_snapshot(snapshots, full["name"], db)
+    assert counts(db) == at_full
+    restore_snapshot(snapshots, incremental["name"], db)
+    assert counts(db) == at_incremental
+    assert hotel.get_booking(booking_id)["restaurant_bill"] == 99
+
+def test_verify_rejects_a_damaged_snapshot(tmp_path, db, hotel):
+    snapshots = tmp_path / "snapshots"
+    book_stays(hotel)
+    manifest = create_snapshot(str(snapshots), db, pause=0)
+    for path in snapshots.iterdir():
+        if path.name.startswith(manifest["name"]) and path.suffix != ".json":
+            data = bytearray(path.read_bytes())
+            data[len(data) // 2] ^= 0xFF
+            path.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        verify_snapshot(str(snapshots), manifest["name"])
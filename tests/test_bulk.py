@@ -0,0 +1,107 @@
+"""
+Hotel Management System - Bulk Import / Export Tests
+Round trips, rejected rows and the opening ledger lines of imported balances
+"""
+
+import csv
+import json
+
+import pytest
+
+from hotel import ConnectionManager, HotelManagement, init_database
+from hotel.bulk import detect_format, export_bookings, import_bookings
+
+from conftest import book_stays
+
+def write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def comparable(bookings):
+    return sorted((b["name"], b["room_no"], b["check_in_date"], b["check_out_date"],
+                   b["room_rent"], b["restaurant_bill"], b["laundry_bill"], b["game_bill"],
+                   b["total_bill"], b["created_at"]) for b in bookings)
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_export_import_round_trip(tmp_path, db, hotel, suffix):
+    book_stays(hotel)
+    path = str(tmp_path / f"bookings{suffix}")
+    assert export_bookings(path, db=db) == 6
+
+    copy = ConnectionManager(str(tmp_path / "copy.db"))
+    try:
+        init_database(copy)
+        assert import_bookings(path, db=copy, batch_size=4) == {"imported": 6, "rejected": 0}
+        assert (comparable(HotelManagement(copy, cache_size=0).get_all_bookings()) ==
+                comparable(hotel.get_all_bookings()))
+    finally:
+        copy.close_all()
+
+def test_rejects_keep_line_numbers_and_reasons(tmp_path, db):
+    good = {"name": "Good", "check_in": "2024-01-05", "check_out": "2024-01-07",
+            "room_no": "", "restaurant_bill": "", "created_at": ""}
+    rows = [
+        good,
+        dict(good, name=""),
+        dict(good, check_in="20240105"),
+        dict(good, check_in="2024-W01-5"),
+        dict(good, check_out="2024-01-01"),
+        dict(good, room_no="twelve"),
+        dict(good, restaurant_bill="-5"),
+        dict(good, created_at="yesterday"),
+        dict(good, created_at="2024-01-05T10:00:00"),
+        dict(good, name="Also good", created_at="2024-01-04 18:30:00"),
+    ]
+    source, rejects = str(tmp_path / "in.csv"), str(tmp_path / "rejects.csv")
+    write_csv(source, rows)
+    assert import_bookings(source, db=db, rejects_path=rejects) == {"imported": 2,
+                                                                     "rejected": 8}
+    with open(rejects, newline="") as f:
+        rejected = list(csv.DictReader(f))
+    assert [int(row["line"]) for row in rejected] == list(range(3, 11))
+    assert all(row["error"] for row in rejected)
+    created = [row[0] for row in db.execute("SELECT created_at FROM bookings ORDER BY id")]
+    assert created[1] == "2024-01-04 18:30:00"
+
+def test_invalid_json_lines_are_rejected(tmp_path, db):
+    source = tmp_path / "in.jsonl"
+    source.write_text('{"name": "A", "check_in": "2024-01-01", "check_out": "2024-01-02"}\n'
+                      "not json\n"
+                      "[1, 2]\n")
+    rejects = tmp_path / "rejects.jsonl"
+    assert import_bookings(str(source), db=db, rejects_path=str(rejects)) == {
+        "imported": 1, "rejected": 2}
+    assert [json.loads(line)["line"] for line in rejects.read_text().splitlines()] == [2, 3]
+
+def test_imported_balances_become_dated_ledger_lines(tmp_path, db, hotel):
+    # A booking id that was used and deleted must not be reused for ledger lines
+    booking_id, _ = hotel.create_booking("Gone", "", "2024-01-01", "2024-01-02")
+    db.execute("DELETE FROM bookings WHERE id = ?", (booking_id,))
+    source = str(tmp_path / "in.csv")
+    write_csv(source, [
+        {"name": "Dated", "check_in": "2023-05-01", "check_out": "2023-05-03",
+         "restaurant_bill": "50", "game_bill": "", "created_at": "2023-04-20 10:00:00"},
+        {"name": "Plain", "check_in": "2023-06-01", "check_out": "2023-06-02",
+         "restaurant_bill": "", "game_bill": "", "created_at": ""},
+        {"name": "Undated", "check_in": "2023-06-01", "check_out": "2023-06-02",
+         "restaurant_bill": "", "game_bill": "7", "created_at": ""},
+    ])
+    import_bookings(source, db=db)
+    lines = db.execute("""
+        SELECT b.name, c.category, c.unit_price, c.posted_at
+        FROM charges c JOIN bookings b ON b.id = c.booking_id
+        ORDER BY b.id
+    """).fetchall()
+    assert [tuple(line) for line in lines] == [
+        ("Dated", "restaurant", 50.0, "2023-04-20 10:00:00"),
+        ("Undated", "game", 7.0, "2023-06-01"),
+    ]
+    names = [row[0] for row in db.execute("SELECT name FROM bookings ORDER BY id")]
+    assert names == ["Dated", "Plain", "Undated"]
+
+def test_json_arrays_are_refused():
+    with pytest.raises(ValueError):
+        detect_format("bookings.json")
+    assert detect_format("bookings.ndjson") == "jsonl"
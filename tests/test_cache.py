@@ -0,0 +1,84 @@
+"""
+Hotel Management System - Booking Cache Tests
+Cached reads never outlive a write, and reads flush only their own charges
+"""
+
+import pytest
+
+from hotel import HotelManagement
+from hotel.cache import BookingCache
+
+@pytest.fixture
+def cached(db):
+    hotel = HotelManagement(db, cache_size=64, cache_ttl=60)
+    yield hotel
+    hotel.close()
+
+def test_writes_through_the_hotel_invalidate_cached_bookings(cached):
+    booking_id, _ = cached.create_booking("Guest", "", "2024-04-01", "2024-04-03")
+    assert cached.get_booking(booking_id)["total_bill"] == 1800
+    assert cached.get_booking(booking_id)["total_bill"] == 1800
+    assert cached.cache.stats()["hits"] == 1
+
+    cached.update_restaurant_bill(booking_id, 120)
+    assert cached.get_booking(booking_id)["restaurant_bill"] == 120
+    rent = cached.update_room_rent(booking_id, "Type A")
+    assert cached.calculate_total(booking_id) == rent + 120 + 1800
+    cached.post_charges([(booking_id, "game", 30), (booking_id, "laundry", "Shirt", 2, 5)])
+    booking = cached.get_booking(booking_id)
+    assert (booking["game_bill"], booking["laundry_bill"]) == (30, 10)
+
+def test_writes_behind_the_hotels_back_wait_for_the_ttl(db, cached):
+    booking_id, _ = cached.create_booking("Guest", "", "2024-04-01", "2024-04-03")
+    cached.get_booking(booking_id)
+    db.execute("UPDATE bookings SET name = 'Renamed' WHERE id = ?", (booking_id,))
+    assert cached.get_booking(booking_id)["name"] == "Guest"
+    cached.cache.ttl = -1
+    cached.cache.invalidate()
+    assert cached.get_booking(booking_id)["name"] == "Renamed"
+    assert cached.get_booking(booking_id)["name"] == "Renamed"
+    assert cached.cache.stats()["expirations"] == 1
+
+def test_reads_flush_only_bookings_with_pending_charges(cached):
+    first, _ = cached.create_booking("First", "", "2024-04-01", "2024-04-03")
+    second, _ = cached.create_booking("Second", "", "2024-04-01", "2024-04-03")
+    cached.get_booking(first)
+    buffer = cached.enable_write_behind(max_charges=100, max_delay=60)
+    cached.update_restaurant_bill(first, 40)
+    cached.update_game_bill(first, 10)
+
+    assert cached.get_booking(second)["restaurant_bill"] == 0
+    assert buffer.pending() == 2 and buffer.pending(first) == 2
+    assert cached.get_booking(first)["restaurant_bill"] == 40
+    assert buffer.pending() == buffer.pending(first) == 0
+    assert sorted(line["unit_price"] for line in cached.get_charges(first)) == [10, 40]
+
+def test_group_commit_submissions_are_visible_to_the_next_read(cached):
+    booking_id, _ = cached.create_booking("Guest", "", "2024-04-01", "2024-04-03")
+    cached.get_booking(booking_id)
+    writer = cached.enable_group_commit(interval=0.05, synchronous="NORMAL")
+    futures = [cached.submit_charges([(booking_id, "restaurant", 10)]) for _ in range(5)]
+    assert cached.get_booking(booking_id)["restaurant_bill"] == 50
+    assert all(future.done() for future in futures)
+    assert writer.pending() == writer.pending(booking_id) == 0
+
+def test_stale_loads_are_not_stored():
+    cache = BookingCache(max_entries=8)
+    generation = cache.generation
+    cache.invalidate([1])
+    cache.put(1, {"id": 1}, generation)
+    assert cache.get(1) is None
+    cache.put(1, {"id": 1}, cache.generation)
+    assert cache.get(1) == {"id": 1}
+
+def test_least_recently_used_entries_are_evicted():
+    cache = BookingCache(max_entries=2)
+    for booking_id in (1, 2):
+        cache.put(booking_id, {"id": booking_id}, cache.generation)
+    cache.get(1)
+    cache.put(3, {"id": 3}, cache.generation)
+    assert [cache.get(booking_id) is not None for booking_id in (1, 2, 3)] == [True, False, True]
+
+    small = BookingCache(max_entries=100, max_bytes=1)
+    small.put(1, {"id": 1}, small.generation)
+    assert small.stats()["entries"] == 0 and small.stats()["evictions"] == 1
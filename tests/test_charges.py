@@ -0,0 +1,66 @@
+"""
+Hotel Management System - Charge Posting Tests
+Write-behind buffering posts every charge exactly once
+"""
+
+import pytest
+
+from hotel.charges import MAX_CORRECTION, MAX_QTY, ledger_row
+
+from conftest import bills
+
+def test_write_behind_buffer_posts_in_batches(hotel):
+    booking_id, _ = hotel.create_booking("Guest", "", "2024-01-01", "2024-01-03")
+    buffer = hotel.enable_write_behind(max_charges=3, max_delay=60)
+
+    hotel.update_restaurant_bill(booking_id, 100)
+    hotel.update_laundry_bill(booking_id, 20)
+    assert buffer.pending() == 2
+    assert bills(hotel, booking_id) == (0, 0, 0)
+
+    hotel.update_game_bill(booking_id, 5)
+    assert buffer.pending() == 0
+    assert bills(hotel, booking_id) == (100, 20, 5)
+
+    hotel.update_restaurant_bill(booking_id, 50)
+    hotel.flush_charges()
+    assert bills(hotel, booking_id) == (150, 20, 5)
+
+def test_write_behind_buffer_flushes_on_close(hotel):
+    booking_id, _ = hotel.create_booking("Guest", "", "2024-01-01", "2024-01-03")
+    hotel.enable_write_behind(max_charges=100, max_delay=60)
+    hotel.update_restaurant_bill(booking_id, 75)
+    hotel.charge_buffer.close()
+    hotel.charge_buffer = None
+    assert bills(hotel, booking_id) == (75, 0, 0)
+
+@pytest.mark.parametrize("charge", [
+    (1, "restaurant", "abc"),
+    (1, "restaurant", None),
+    (1, "restaurant", True),
+    (1, "restaurant", float("nan")),
+    (1, "spa", 10),
+    ("1", "restaurant", 10),
+    (1, "restaurant", 5, 1, 10),
+    (1, "restaurant", "Tea", 0, 10),
+    (1, "restaurant", "Tea", "2", 10),
+    (1, "restaurant", "Tea", 2, "10"),
+    (1, "restaurant", -5e9),
+    (1, "restaurant", 5e9),
+    (1, "restaurant", "Tea", MAX_QTY + 1, 1),
+    (1, "restaurant"),
+])
+def test_bad_charges_are_rejected(hotel, charge):
+    booking_id, _ = hotel.create_booking("Guest", "", "2024-01-01", "2024-01-03")
+    with pytest.raises(ValueError):
+        ledger_row(charge)
+    with pytest.raises(ValueError):
+        hotel.post_charges([charge])
+    assert hotel.get_booking(booking_id)["total_bill"] == 1800
+
+def test_corrections_post_negative_lines(hotel):
+    booking_id, _ = hotel.create_booking("Guest", "", "2024-01-01", "2024-01-03")
+    hotel.post_charges([(booking_id, "restaurant", "Dinner", 2, 400.0),
+                        (booking_id, "restaurant", "Dinner refund", 1, -400.0)])
+    assert bills(hotel, booking_id) == (400, 0, 0)
+    assert ledger_row((booking_id, "game", -MAX_CORRECTION))[4] == -MAX_CORRECTION
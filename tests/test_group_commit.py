@@ -0,0 +1,50 @@
+"""
+Hotel Management System - Group Commit Tests
+Charges from many threads share commits and are each posted once
+"""
+
+import threading
+
+from hotel.charges import GroupCommitWriter
+
+from conftest import bills, book_stays
+
+def test_group_commit_shares_commits_between_threads(hotel):
+    ids = book_stays(hotel)
+    before = {booking_id: bills(hotel, booking_id) for booking_id in ids}
+    writer = hotel.enable_group_commit()
+
+    def post(thread):
+        for i in range(25):
+            hotel.post_charges([(ids[(thread + i) % len(ids)], "restaurant", 10)])
+
+    threads = [threading.Thread(target=post, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = writer.stats()
+    assert stats["committed"] == 200 and stats["groups"] <= 200
+    assert sum(bills(hotel, booking_id)[0] - before[booking_id][0] for booking_id in ids) == 2000
+    # Charges for unknown bookings are skipped, not failed
+    assert hotel.post_charges([(999999, "game", 10)]) == 0
+    assert hotel.submit_charges([(ids[0], "game", 10)]).result() == 1
+
+def test_failing_commit_hook_is_logged_not_raised(db, hotel, caplog):
+    booking_id, _ = hotel.create_booking("Guest", "", "2024-01-01", "2024-01-02")
+    calls = []
+
+    def hook(booking_ids):
+        calls.append(booking_ids)
+        raise RuntimeError("hook broke")
+
+    writer = GroupCommitWriter(db, synchronous="NORMAL", on_commit=hook)
+    try:
+        assert writer.submit([(booking_id, "restaurant", 10)]).result(timeout=5) == 1
+        assert writer.submit([(booking_id, "game", 5)]).result(timeout=5) == 1
+    finally:
+        writer.close()
+    assert calls == [{booking_id}, {booking_id}]
+    assert bills(hotel, booking_id) == (10, 0, 5)
+    assert "on_commit hook failed" in caplog.text
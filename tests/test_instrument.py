@@ -0,0 +1,122 @@
+"""
+Hotel Management System - Instrumentation Tests
+Hotel, SQL and lock timings, the slow log and statement tracing, and clean detaching
+"""
+
+import json
+import sqlite3
+
+import pytest
+
+from hotel.instrument import (BUCKETS_US, ENV_VAR, HOTEL_METHODS, Histogram,
+                              Instrumentation, from_environment)
+
+from conftest import book_stays
+
+def test_histogram_percentiles_use_bucket_bounds():
+    histogram = Histogram()
+    for us in (3, 3, 3, 40, 40000):
+        histogram.add(us * 1000)
+    histogram.add(7, rows=2, failed=True)
+    stats = histogram.as_dict()
+    assert (stats["count"], stats["errors"], stats["rows"]) == (6, 1, 2)
+    assert stats["p50_ms"] == 0.005 and stats["p90_ms"] == stats["p99_ms"] == 50
+    assert histogram.percentile(0.8) == 0.05
+    assert stats["max_ms"] == 40
+    assert stats["buckets_us"] == {"1": 1, "5": 3, "50": 1, "50000": 1}
+    histogram.add((BUCKETS_US[-1] + 1) * 1000)
+    assert histogram.as_dict()["buckets_us"]["inf"] == 1
+    assert histogram.percentile(1.0) == histogram.max_ns / 1e6
+
+def test_hotel_sql_and_lock_metrics(hotel):
+    metrics = Instrumentation(slow_query_ms=0).attach_hotel(hotel)
+    ids = book_stays(hotel)
+    assert len(hotel.get_all_bookings()) == len(ids)
+    snapshot = metrics.snapshot()
+
+    assert snapshot["hotel"]["create_booking"]["count"] == len(ids)
+    assert snapshot["hotel"]["get_all_bookings"]["rows"] == len(ids)
+    # Statement keys are whitespace-normalised and writes count changed rows
+    assert all(name == " ".join(name.split()) for name in snapshot["sql"])
+    updates = [stats for name, stats in snapshot["sql"].items()
+               if name.startswith("UPDATE bookings SET room_type")]
+    assert updates and updates[0]["rows"] == len(ids)
+    assert snapshot["lock"]["begin immediate"]["count"] >= len(ids)
+    assert snapshot["lock"]["commit"]["count"] >= len(ids)
+    # slow_query_ms=0 puts every statement in the slow log
+    assert snapshot["slow_queries"] and all(
+        entry["sql"] in snapshot["sql"] for entry in snapshot["slow_queries"])
+
+    with pytest.raises(sqlite3.OperationalError):
+        hotel.db.execute("SELECT nope FROM bookings")
+    assert metrics.snapshot()["sql"]["SELECT nope FROM bookings"]["errors"] == 1
+
+def test_detach_restores_the_originals(hotel):
+    methods = {name: getattr(hotel, name) for name in HOTEL_METHODS}
+    metrics = Instrumentation(trace_sql=True).attach_hotel(hotel)
+    assert hotel.get_booking != methods["get_booking"]
+    metrics.detach()
+    assert all(getattr(hotel, name) == method for name, method in methods.items())
+    assert not {"execute", "executemany", "transaction", "_connect"} & vars(hotel.db).keys()
+    # Recorded metrics survive; nothing new is recorded or traced
+    recorded = metrics.snapshot()
+    hotel.create_booking("Asha Rao", "", "2024-01-01", "2024-01-02")
+    after = metrics.snapshot()
+    assert after["hotel"] == recorded["hotel"] and after["sql"] == recorded["sql"]
+    assert after["traced_statements"] == recorded["traced_statements"]
+
+def test_traced_statements_hide_literals_and_show_trigger_steps(hotel):
+    booking_id, _ = hotel.create_booking("Asha Rao", "", "2024-01-01", "2024-01-02")
+    metrics = Instrumentation(trace_sql=True).attach_hotel(hotel)
+    hotel.db.execute("UPDATE bookings SET name = 'Meera Rao' WHERE id = ?", (booking_id,))
+    traced = metrics.snapshot()["traced_statements"]
+    assert not any("Meera" in statement for statement in traced)
+    # Each trigger step reports the statement again; the search index
+    # writes to its shadow tables show up as nested "--" statements
+    assert traced["UPDATE bookings SET name = ? WHERE id = ?"] > 1
+    assert any(statement.startswith("-- ") for statement in traced)
+    metrics.detach()
+
+def test_busy_errors_are_counted(db, hotel):
+    metrics = Instrumentation().attach_hotel(hotel)
+    db.execute("PRAGMA busy_timeout = 0")
+    holder = sqlite3.connect(db.db_file, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            with db.transaction("IMMEDIATE"):
+                pass
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    assert metrics.snapshot()["busy_errors"] == 1
+    assert "begin immediate" not in metrics.snapshot()["lock"]
+
+def test_export_and_reset(tmp_path, hotel):
+    metrics = Instrumentation().attach_hotel(hotel)
+    with metrics.timer("hotel", "report job"):
+        hotel.get_all_bookings()
+    path = tmp_path / "metrics.json"
+    assert metrics.export(str(path)) == str(path)
+    exported = json.loads(path.read_text())
+    assert exported["hotel"]["report job"]["count"] == 1
+    assert not (tmp_path / "metrics.json.tmp").exists()
+    metrics.reset()
+    snapshot = metrics.snapshot()
+    assert snapshot["hotel"] == snapshot["sql"] == {} and snapshot["slow_queries"] == []
+
+def test_from_environment(monkeypatch, tmp_path, hotel):
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    assert from_environment(hotel) == (None, None)
+    assert "get_booking" not in vars(hotel)
+
+    path = str(tmp_path / "metrics.json")
+    monkeypatch.setenv(ENV_VAR, path)
+    monkeypatch.setenv("HOTEL_SLOW_QUERY_MS", "12.5")
+    monkeypatch.setenv("HOTEL_TRACE_SQL", "1")
+    metrics, exported = from_environment(hotel)
+    assert exported == path
+    assert metrics.slow_query_ns == 12_500_000 and metrics.trace_sql
+    hotel.flush_charges()
+    assert metrics.snapshot()["hotel"]["flush_charges"]["count"] == 1
+    metrics.detach()
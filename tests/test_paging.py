@@ -0,0 +1,24 @@
+"""
+Hotel Management System - Paging Tests
+Keyset paging over bookings that share a timestamp
+"""
+
+from hotel import booking_key
+
+def test_keyset_paging_visits_every_booking_once(db, hotel):
+    # Bulk inserts in one second share created_at; the id breaks the tie
+    db.executemany("""
+        INSERT INTO bookings (room_no, name, check_in_date, check_out_date, created_at)
+        VALUES (?, ?, '2024-01-01', '2024-01-02', ?)
+    """, [(i, f"Guest {i}", f"2024-01-0{1 + i // 10} 12:00:00") for i in range(1, 46)])
+    newest_first = [b["id"] for b in hotel.get_all_bookings()]
+    assert len(newest_first) == 45
+
+    pages = [hotel.get_bookings_page(limit=10)]
+    while len(pages[-1]) == 10:
+        pages.append(hotel.get_bookings_page(limit=10, after=booking_key(pages[-1][-1])))
+    assert [b["id"] for page in pages for b in page] == newest_first
+
+    # Scrolling back up returns the previous page unchanged
+    assert hotel.get_bookings_page(limit=10, before=booking_key(pages[2][0])) == pages[1]
+    assert [b.id for b in hotel.iter_bookings(batch_size=7, format="record")] == newest_first
@@ -0,0 +1,77 @@
+"""
+Hotel Management System - Pricing Catalog Tests
+Effective-dated versions, immutable published rows and hot reload
+"""
+
+import sqlite3
+
+import pytest
+
+from hotel.pricing import PriceCatalog, Pricing, load_catalog, price_list_json, publish_prices
+
+MENU = [
+    {"category": "room", "item": "Type A", "price": 7000, "unit": "night"},
+    {"category": "restaurant", "item": "Tea", "price": 15},
+    {"category": "restaurant", "item": "Coffee", "price": 25, "description": "Filter"},
+]
+
+def test_each_day_uses_the_version_in_effect(db):
+    seed = load_catalog(db)
+    assert seed.price("restaurant", "Tea", on="2024-06-01") == 10
+    version = publish_prices(MENU, effective_from="2025-01-01", note="2025 menu", db=db)
+    catalog = load_catalog(db)
+    assert catalog.version == version > seed.version
+    assert catalog.price("restaurant", "Tea", on="2024-12-31") == 10
+    assert catalog.price("restaurant", "Tea", on="2025-01-01") == 15
+    assert [item.item for item in catalog.items("restaurant", on="2025-06-01")] == ["Tea", "Coffee"]
+    with pytest.raises(ValueError):
+        catalog.price("restaurant", "Water", on="2025-06-01")
+    with pytest.raises(LookupError):
+        PriceCatalog([]).price_list("2025-01-01")
+
+def test_night_prices_follow_versions_and_gaps(db):
+    publish_prices(MENU[1:], effective_from="2025-01-01", db=db)
+    publish_prices(MENU, effective_from="2025-01-03", db=db)
+    assert load_catalog(db).night_prices("Type A", "2024-12-31", "2025-01-04") == [
+        6000, None, None, 7000]
+
+@pytest.mark.parametrize("statement", [
+    "UPDATE price_items SET price = 1 WHERE item = 'Tea'",
+    "DELETE FROM price_items WHERE item = 'Tea'",
+    "UPDATE price_versions SET effective_from = '2000-01-01'",
+    "DELETE FROM price_versions",
+    "UPDATE price_rates SET price = 1",
+    "DELETE FROM price_rates",
+])
+def test_published_prices_are_immutable(db, statement):
+    publish_prices(MENU, [{"category": "room", "item": "Type A", "name": "Weekend",
+                           "weekdays": "45", "multiplier": 1.2}], "2025-01-01", db=db)
+    before = price_list_json(load_catalog(db).price_list("2025-01-01"))
+    with pytest.raises(sqlite3.IntegrityError, match="immutable"):
+        db.execute(statement)
+    assert price_list_json(load_catalog(db).price_list("2025-01-01")) == before
+
+def test_published_json_round_trips(db):
+    rates = [{"category": "room", "item": "Type A", "name": "Festival",
+              "start_date": "2025-11-01", "end_date": "2025-11-05", "weekdays": None,
+              "price": 9000.0, "multiplier": 1.0, "priority": 5}]
+    publish_prices(MENU, rates, "2025-01-01", db=db)
+    published = price_list_json(load_catalog(db).price_list("2025-01-01"))
+    publish_prices(published["items"], published["rates"], "2026-01-01", db=db)
+    assert price_list_json(load_catalog(db).price_list("2026-01-01")) == published
+    assert published["rates"] == rates
+
+def test_pricing_reloads_new_versions_and_shares_snapshots(db, hotel):
+    pricing = Pricing(db, check_interval=0)
+    first = pricing.current()
+    assert pricing.current() is first
+    publish_prices(MENU, effective_from="2020-01-01", db=db)
+    assert pricing.current().version == first.version + 1
+
+    # Catalog charges use the price list in effect today
+    booking_id, _ = hotel.create_booking("Guest", "", "2030-01-01", "2030-01-02")
+    hotel.pricing.reload()
+    assert hotel.post_catalog_charges(booking_id, "restaurant", {"Tea": 2, "Coffee": 1}) == 55
+    assert hotel.get_booking(booking_id)["restaurant_bill"] == 55
+    with pytest.raises(ValueError):
+        hotel.post_catalog_charges(booking_id, "restaurant", {"Water": 1})
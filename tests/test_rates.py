@@ -0,0 +1,116 @@
+"""
+Hotel Management System - Rate Tests
+Stay validation and per-night pricing of new and legacy bookings
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from hotel.core import check_stay
+from hotel.pricing import night_price, publish_prices
+
+# From 2024: Type A with a weekend surcharge and a festival price, Type B
+# flat, Type C off the list (earlier nights keep the seed prices)
+ROOMS_2024 = [{"category": "room", "item": "Type A", "price": 1000},
+              {"category": "room", "item": "Type B", "price": 2000}]
+RATES_2024 = [
+    {"category": "room", "item": "Type A", "name": "Weekend", "weekdays": "45",
+     "multiplier": 1.5},
+    {"category": "room", "item": "Type A", "name": "Festival", "start_date": "2024-11-01",
+     "end_date": "2024-11-05", "price": 3000, "priority": 10},
+]
+
+def naive_quote(catalog, room_type, check_in, check_out):
+    """Price night by night from the price list in effect on each night"""
+    first = date.fromisoformat(check_in).toordinal()
+    last = max(date.fromisoformat(check_out).toordinal(), first + 1)
+    total = 0.0
+    for night in range(first, last):
+        price_list = catalog.price_list(date.fromordinal(night))
+        key = ("room", room_type)
+        if key not in price_list.items:
+            raise ValueError(f"No price on {date.fromordinal(night)}")
+        rates = [rate for rate in price_list.rates.get(key, ())
+                 if (rate.start is None or rate.start <= night) and
+                    (rate.end is None or night < rate.end)]
+        total += night_price(rates, date.fromordinal(night).weekday(),
+                             price_list.items[key].price)
+    return total
+
+@pytest.mark.parametrize("check_in, check_out", [
+    ("5th May", "7th May"),
+    ("2024-1-05", "2024-01-07"),
+    ("2024-01-05 10:00", "2024-01-07"),
+    ("2024-01-07", "2024-01-05"),
+])
+def test_create_booking_rejects_bad_stays(hotel, check_in, check_out):
+    with pytest.raises(ValueError):
+        check_stay(check_in, check_out)
+    with pytest.raises(ValueError):
+        hotel.create_booking("Guest", "", check_in, check_out)
+    assert hotel.get_all_bookings() == []
+
+def test_legacy_free_text_stays_are_priced_per_night(db, hotel):
+    db.execute("""
+        INSERT INTO bookings (room_no, name, check_in_date, check_out_date)
+        VALUES (1, 'Legacy', '5th May', '7th May')
+    """)
+    with pytest.raises(ValueError):
+        hotel.update_room_rent(1, "Type A")
+    hotel.update_room_rent(1, "Type A", nights=2)
+    rate = hotel.pricing.current().price("room", "Type A")
+    assert hotel.get_booking(1)["room_rent"] == 2 * rate
+
+@pytest.fixture
+def priced(db, hotel):
+    publish_prices(ROOMS_2024, RATES_2024, "2024-01-01", db=db)
+    hotel.pricing.reload()
+    return hotel
+
+@pytest.mark.parametrize("room_type, check_in, check_out, rent", [
+    ("Type A", "2024-03-04", "2024-03-06", 2000),        # Monday, Tuesday
+    ("Type A", "2024-03-01", "2024-03-03", 3000),        # Friday, Saturday
+    ("Type A", "2024-03-04", "2024-03-04", 1000),        # same day: one night
+    ("Type A", "2024-10-31", "2024-11-06", 1000 + 4 * 3000 + 1000),
+    ("Type A", "2023-12-30", "2024-01-02", 2 * 6000 + 1000),
+    ("Type B", "2024-03-01", "2024-03-08", 7 * 2000),
+])
+def test_quotes_apply_weekday_seasonal_and_versioned_prices(priced, room_type, check_in,
+                                                            check_out, rent):
+    assert priced.quote_stay(room_type, check_in, check_out) == rent
+
+def test_quotes_match_night_by_night_pricing(priced):
+    rng = random.Random(11)
+    catalog = priced.pricing.current()
+    for _ in range(300):
+        check_in = date(2022, 6, 1) + timedelta(days=rng.randrange(1500))
+        check_out = check_in + timedelta(days=rng.randint(0, 40))
+        stay = (rng.choice(["Type A", "Type B"]), check_in.isoformat(), check_out.isoformat())
+        assert priced.quote_stay(*stay) == naive_quote(catalog, *stay)
+    # Far outside the prebuilt calendar, the calendar is widened
+    stay = ("Type A", "2090-02-01", "2090-03-01")
+    assert priced.quote_stay(*stay) == naive_quote(catalog, *stay)
+
+def test_unpriced_nights_are_refused(priced):
+    assert priced.quote_stay("Type C", "2023-12-01", "2023-12-03") == 8000
+    with pytest.raises(ValueError):
+        priced.quote_stay("Type C", "2023-12-30", "2024-01-02")
+    assert priced.rates.quote_many([
+        ("Type C", "2024-02-01", "2024-02-02"),
+        ("Type A", "5th May", "7th May"),
+        ("Type B", "2024-02-01", "2024-02-02"),
+    ]) == [None, None, 2000]
+
+def test_new_versions_reprice_open_bookings(db, priced):
+    booking_id, _ = priced.create_booking("Guest", "", "2030-05-06", "2030-05-08")
+    assert priced.update_room_rent(booking_id, "Type B") == 4000
+    assert priced.reprice_open_bookings(on="2030-01-01") == 0
+
+    publish_prices([dict(ROOMS_2024[1], price=2500)], effective_from="2030-01-01", db=db)
+    priced.pricing.reload()
+    assert priced.quote_stay("Type B", "2030-05-06", "2030-05-08") == 5000
+    assert priced.reprice_open_bookings(on="2030-01-01") == 1
+    assert priced.get_booking(booking_id)["room_rent"] == 5000
+    assert priced.reprice_open_bookings(on="2031-01-01") == 0
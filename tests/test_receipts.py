@@ -0,0 +1,112 @@
+"""
+Hotel Management System - Receipt Tests
+Text receipts match the original app's bill byte for byte; HTML is escaped
+"""
+
+from html.parser import HTMLParser
+
+import pytest
+
+from hotel.receipts import ReceiptTemplate, render_batch, render_receipt
+
+from conftest import book_stays
+
+GENERATED_ON = "2024-05-01 10:30:00"
+
+def original_bill(booking, booking_id, generated_on):
+    """The bill text the single-file app's generate_bill built"""
+    return f"""
+{'='*60}
+            Thunder HOTEL - BILL RECEIPT
+{'='*60}
+
+Customer Details:
+    Name: {booking['name']}
+    Address: {booking['address'] or 'N/A'}
+    Room No: {booking['room_no']}
+    Check-in Date: {booking['check_in_date']}
+    Check-out Date: {booking['check_out_date']}
+    Room Type: {booking['room_type'] or 'Not selected'}
+
+{'='*60}
+BILL BREAKDOWN:
+{'='*60}
+
+    Room Rent:              Rs {booking['room_rent']:>12,.2f}
+    Restaurant Bill:        Rs {booking['restaurant_bill']:>12,.2f}
+    Laundry Bill:           Rs {booking['laundry_bill']:>12,.2f}
+    Game Bill:              Rs {booking['game_bill']:>12,.2f}
+    {'-'*60}
+    Subtotal:                Rs {(booking['room_rent'] + booking['restaurant_bill'] + booking['laundry_bill'] + booking['game_bill']):>12,.2f}
+    Service Charge:         Rs {booking['service_charge']:>12,.2f}
+    {'='*60}
+    GRAND TOTAL:            Rs {booking['total_bill']:>12,.2f}
+    {'='*60}
+
+    Booking ID: {booking_id}
+    Generated on: {generated_on}
+
+Thank you for choosing Thunder Hotel!
+{'='*60}
+"""
+
+class Cells(HTMLParser):
+    """(th, td) text pairs of an HTML receipt"""
+
+    def __init__(self):
+        super().__init__()
+        self.cells, self.tag = [], None
+
+    def handle_starttag(self, tag, attrs):
+        self.tag = tag
+
+    def handle_endtag(self, tag):
+        self.tag = None
+
+    def handle_data(self, data):
+        if self.tag in ("th", "td"):
+            self.cells.append(data)
+
+def test_text_receipts_match_the_original_bill(hotel):
+    ids = book_stays(hotel)
+    hotel.db.execute("UPDATE bookings SET address = NULL, room_type = NULL WHERE id = ?",
+                     (ids[0],))
+    hotel.post_charges([(ids[1], "restaurant", 987654.25)] * 2)
+    for booking_id in ids:
+        booking = hotel.get_booking(booking_id)
+        assert (render_receipt(booking, generated_on=GENERATED_ON) ==
+                original_bill(booking, booking_id, GENERATED_ON))
+
+def test_html_receipts_escape_guest_text(hotel):
+    booking_id, _ = hotel.create_booking("<b>Tom & Jerry</b>", "1 \"Quote\" St",
+                                         "2024-05-01", "2024-05-03")
+    hotel.update_room_rent(booking_id, "Type B")
+    booking = hotel.get_booking(booking_id)
+    receipt = render_receipt(booking, "html", GENERATED_ON)
+    assert "<b>" not in receipt and "&lt;b&gt;Tom &amp; Jerry&lt;/b&gt;" in receipt
+    parser = Cells()
+    parser.feed(receipt)
+    cells = dict(zip(parser.cells[::2], parser.cells[1::2]))
+    assert cells["Name"] == "<b>Tom & Jerry</b>"
+    assert cells["Address"] == '1 "Quote" St'
+    assert cells["Room Type"] == "Type B"
+    assert cells["Grand Total"] == f"Rs {booking['total_bill']:,.2f}"
+
+def test_templates_reject_unknown_fields():
+    with pytest.raises(ValueError, match="guest_email"):
+        ReceiptTemplate("{name} {guest_email}")
+
+def test_batches_render_every_folio_in_id_order(tmp_path, hotel):
+    ids = book_stays(hotel)
+    folios = tmp_path / "folios.txt"
+    assert render_batch(str(folios), db=hotel.db, single_file=True, workers=2,
+                        chunk_size=2) == len(ids)
+    receipts = folios.read_text().split("\f")
+    assert [receipt.split("Booking ID: ")[1].split("\n")[0] for receipt in receipts] == [
+        str(booking_id) for booking_id in ids]
+
+    out = tmp_path / "html"
+    assert render_batch(str(out), "html", hotel.db, check_out="2030-01-07", workers=1) == 1
+    (page,) = out.iterdir()
+    assert page.name == f"receipt_{ids[4]}.html"
+    assert page.read_text().startswith("<!DOCTYPE html>")
@@ -0,0 +1,53 @@
+"""
+Hotel Management System - Compact Record Tests
+Booking records and columnar tables read back exactly what the dict rows hold
+"""
+
+import pytest
+
+from hotel.records import BOOKING_COLUMNS, Booking, BookingTable
+
+from conftest import book_stays
+
+def test_formats_agree_with_dict_rows(hotel):
+    book_stays(hotel)
+    rows = hotel.get_all_bookings()
+    records = hotel.get_all_bookings(format="record")
+    table = hotel.get_all_bookings(format="table")
+    assert len(rows) == len(records) == len(table) == 6
+    assert [record.as_dict() for record in records] == rows
+    assert [record.as_dict() for record in table] == rows
+    assert list(table) == records
+    assert table[0] == records[0] and table[0] != records[1]
+
+def test_booking_behaves_like_a_row():
+    values = (7, 101, "Asha", None, "2024-01-01", "2024-01-03", "Type A", 2000.0,
+              0.0, 0.0, 0.0, 1800.0, 3800.0, "2024-01-01 09:00:00")
+    booking = Booking.from_row(values)
+    assert booking.name == booking["name"] == "Asha"
+    assert dict(booking) == dict(zip(BOOKING_COLUMNS, values))
+    assert repr(booking) == "Booking(id=7, room_no=101, name='Asha')"
+    with pytest.raises(KeyError):
+        booking["nope"]
+    with pytest.raises(AttributeError):
+        booking.extra = 1
+    assert not hasattr(booking, "__dict__")
+    # Repeated low-cardinality text is shared, even when built separately
+    built = "".join(["2024-01-", "01"])
+    other = Booking.from_row(values[:4] + (built,) + values[5:])
+    assert built is not booking.check_in_date
+    assert other.check_in_date is booking.check_in_date
+
+def test_table_columns_are_compact():
+    table = BookingTable()
+    table.extend([
+        (1, 101, "A", "x", "2024-01-01", "2024-01-02", "Type A", 100.0, None, 0.0, 5.0,
+         1800.0, 1905.0, "2024-01-01 09:00:00"),
+        (2, 102, "B", None, "2024-01-01", "2024-01-03", None, 200.0, 10.0, 0.0, 0.0,
+         1800.0, 2010.0, "2024-01-01 10:00:00"),
+    ])
+    assert table.column("id").typecode == "q"
+    assert table.column("total_bill").typecode == "d"
+    assert table.column("restaurant_bill").tolist() == [0.0, 10.0]
+    assert table.column("check_in_date")[0] is table.column("check_in_date")[1]
+    assert table[1].room_type is None and table[1].address is None
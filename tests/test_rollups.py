@@ -0,0 +1,46 @@
+"""
+Hotel Management System - Rollup Tests
+Trigger-maintained rollups must match a rebuild from the base tables
+"""
+
+import pytest
+
+from hotel import ConnectionManager
+from hotel.rollups import charge_revenue, rebuild_rollups, room_revenue
+
+from conftest import book_stays
+
+def reports(db):
+    return {(by, report.__name__): report(db, by)
+            for by in ("day", "month") for report in (room_revenue, charge_revenue)}
+
+def assert_same(actual, expected):
+    assert actual.keys() == expected.keys()
+    for key in expected:
+        assert len(actual[key]) == len(expected[key]), key
+        for got, want in zip(actual[key], expected[key]):
+            assert got == pytest.approx(want), key
+
+def test_incremental_rollups_match_rebuild(db, hotel):
+    ids = book_stays(hotel)
+    # Edits that move revenue between days and room types, and take it away
+    hotel.update_room_rent(ids[0], "Type A", nights=5)
+    db.execute("UPDATE bookings SET check_in_date = '2020-04-01', check_out_date = '2020-04-03',"
+               " room_type = 'Type D' WHERE id = ?", (ids[1],))
+    hotel.post_charges([(ids[2], "restaurant", "Dinner", 2, 350.0)])
+    db.execute("DELETE FROM charges WHERE booking_id = ? AND category = 'game'", (ids[3],))
+    db.execute("DELETE FROM charges WHERE booking_id = ?", (ids[4],))
+    db.execute("DELETE FROM bookings WHERE id = ?", (ids[4],))
+
+    incremental = reports(db)
+    assert incremental[("month", "room_revenue")]
+    rebuild_rollups(db)
+    assert_same(reports(db), incremental)
+
+def test_rebuild_refuses_to_drop_archived_revenue(db):
+    live_only = ConnectionManager(db.db_file)
+    try:
+        with pytest.raises(RuntimeError):
+            rebuild_rollups(live_only)
+    finally:
+        live_only.close_all()
@@ -0,0 +1,82 @@
+"""
+Hotel Management System - Schema Tests
+Databases written by the original single-file app upgrade in place
+"""
+
+import sqlite3
+
+from hotel import ConnectionManager, HotelManagement, init_database
+from hotel.rollups import charge_revenue, rebuild_rollups, room_revenue
+from hotel.schema import current_version, latest_version
+
+# The bookings table as the original app created it: no indexes, no
+# triggers, and total_bill only written when a bill was generated
+LEGACY_SCHEMA = """
+    CREATE TABLE bookings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        room_no INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        address TEXT,
+        check_in_date TEXT NOT NULL,
+        check_out_date TEXT NOT NULL,
+        room_type TEXT,
+        room_rent REAL DEFAULT 0,
+        restaurant_bill REAL DEFAULT 0,
+        laundry_bill REAL DEFAULT 0,
+        game_bill REAL DEFAULT 0,
+        service_charge REAL DEFAULT 1800,
+        total_bill REAL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+LEGACY_ROWS = [
+    # room_no, name, check_in, check_out, room_type, rent, restaurant, laundry, game, total_bill
+    (1, "Billed", "2019-05-01", "2019-05-03", "Type A", 10000, 500, 0, 0, 12300),
+    (2, "Unbilled", "2019-05-02", "2019-05-06", "Type B", 16000, 0, 250, 90, 0),
+    (3, "Free text dates", "5th May", "7th May", "Type C", 8000, 120, 0, 0, 0),
+]
+
+def make_legacy(path):
+    conn = sqlite3.connect(path)
+    conn.execute(LEGACY_SCHEMA)
+    conn.executemany("""
+        INSERT INTO bookings (room_no, name, check_in_date, check_out_date, room_type,
+                              room_rent, restaurant_bill, laundry_bill, game_bill,
+                              total_bill, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, '2019-04-20 09:00:00')
+    """, LEGACY_ROWS)
+    conn.commit()
+    conn.close()
+
+def test_legacy_database_upgrades_with_total_bill_backfilled(tmp_path):
+    path = str(tmp_path / "hotel_management.db")
+    make_legacy(path)
+    db = ConnectionManager(path)
+    try:
+        assert current_version(db) == 0
+        assert init_database(db) == list(range(1, latest_version() + 1))
+        assert current_version(db) == latest_version()
+        assert init_database(db) == []
+
+        hotel = HotelManagement(db, cache_size=0)
+        for booking_id, row in enumerate(LEGACY_ROWS, 1):
+            booking = hotel.get_booking(booking_id)
+            assert booking["total_bill"] == sum(row[5:9]) + 1800
+            # Running sums became opening ledger lines, dated when booked
+            restaurant = [line for line in hotel.get_charges(booking_id)
+                          if line["category"] == "restaurant"]
+            assert sum(line["qty"] * line["unit_price"] for line in restaurant) == row[6]
+            assert all(line["posted_at"] == "2019-04-20 09:00:00" for line in restaurant)
+
+        # Later charges keep total_bill current through the triggers
+        hotel.update_game_bill(1, 40)
+        assert hotel.calculate_total(1) == 12340
+
+        # The backfilled rollups agree with a rebuild
+        rooms, charges = room_revenue(db, "day"), charge_revenue(db, "day")
+        assert rooms and charges
+        rebuild_rollups(db)
+        assert (room_revenue(db, "day"), charge_revenue(db, "day")) == (rooms, charges)
+    finally:
+        db.close_all()
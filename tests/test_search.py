@@ -0,0 +1,83 @@
+"""
+Hotel Management System - Guest Search Tests
+Prefix search ranking, and an index the triggers keep in step with bookings
+"""
+
+import random
+import re
+import unicodedata
+
+import pytest
+
+from hotel import core
+
+FIRST = ("Asha", "Ashok", "José", "Joseph", "Maria", "Marianne", "Chen", "O'Brien")
+STREETS = ("Lake Road", "Lakeview Avenue", "Mill Lane", "Market Street", "Chennai Road")
+
+def names(results):
+    return [booking["name"] for booking in results]
+
+def words(text):
+    folded = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return re.findall(r"\w+", folded.lower())
+
+def matches(booking, query):
+    """Every query word starts a word of the name or the address"""
+    fields = words(booking["name"]) + words(booking["address"])
+    return all(any(word.startswith(part) for word in fields) for part in words(query))
+
+def test_prefixes_diacritics_and_ranking(hotel):
+    hotel.create_booking("Asha Rao", "12 Lake Road, Pune", "2024-01-01", "2024-01-02")
+    hotel.create_booking("Ravi Kumar", "4 Asha Nagar, Pune", "2024-01-01", "2024-01-02")
+    hotel.create_booking("José Silva", "9 Rua Nova, Lisboa", "2024-01-01", "2024-01-02")
+    # Name matches rank above address matches
+    assert names(hotel.search_bookings("asha")) == ["Asha Rao", "Ravi Kumar"]
+    assert names(hotel.search_bookings("as")) == ["Asha Rao", "Ravi Kumar"]
+    assert names(hotel.search_bookings("jose")) == ["José Silva"]
+    assert names(hotel.search_bookings("JOSÉ si")) == ["José Silva"]
+    assert names(hotel.search_bookings("asha pune")) == ["Asha Rao", "Ravi Kumar"]
+    assert names(hotel.search_bookings("asha lisboa")) == []
+    assert names(hotel.search_bookings("pune", limit=1)) in (["Asha Rao"], ["Ravi Kumar"])
+
+@pytest.mark.parametrize("text, expected", [
+    ("", []), ("   ", []), ("-- ;", []), ('"', []), ("*", []),
+    ("NEAR(", []), ("a AND", ["A And B"]), ('and" OR b', []), ("b)", ["A And B"]),
+])
+def test_query_syntax_in_input_is_quoted(hotel, text, expected):
+    hotel.create_booking("A And B", "", "2024-01-01", "2024-01-02")
+    assert names(hotel.search_bookings(text)) == expected
+
+def test_triggers_keep_the_index_in_sync(db, hotel):
+    booking_id, _ = hotel.create_booking("Asha Rao", "Lake Road", "2024-01-01", "2024-01-02")
+    db.execute("UPDATE bookings SET name = 'Meera Rao', address = 'Hill Road' WHERE id = ?",
+               (booking_id,))
+    assert hotel.search_bookings("asha") == hotel.search_bookings("lake") == []
+    assert names(hotel.search_bookings("meera hill")) == ["Meera Rao"]
+    # Updates that do not touch name or address leave the index alone
+    db.execute("UPDATE bookings SET room_rent = 10 WHERE id = ?", (booking_id,))
+    assert names(hotel.search_bookings("rao")) == ["Meera Rao"]
+    db.execute("DELETE FROM bookings WHERE id = ?", (booking_id,))
+    assert hotel.search_bookings("meera") == []
+    db.execute("INSERT INTO bookings_fts (bookings_fts, rank) VALUES ('integrity-check', 1)")
+
+def test_matches_a_scan_of_every_booking(db, hotel):
+    rng = random.Random(19)
+    for i in range(300):
+        hotel.create_booking(f"{rng.choice(FIRST)} {rng.choice(FIRST)}",
+                             f"{rng.randint(1, 99)} {rng.choice(STREETS)}",
+                             "2024-01-01", "2024-01-02")
+    for i in range(1, 300, 7):
+        db.execute("UPDATE bookings SET address = ? WHERE id = ?", (rng.choice(STREETS), i))
+    db.execute("DELETE FROM bookings WHERE id % 11 = 0")
+    everything = hotel.get_all_bookings()
+    for text in ("as", "ash", "asha", "jos", "jose", "mari", "o brien", "lake", "lakev",
+                 "chen", "chen road", "market asha", "mill jo", "zz"):
+        expected = sorted(b["id"] for b in everything if matches(b, text))
+        assert sorted(b["id"] for b in hotel.search_bookings(text, limit=1000)) == expected, text
+    db.execute("INSERT INTO bookings_fts (bookings_fts, rank) VALUES ('integrity-check', 1)")
+
+def test_only_the_newest_candidates_are_ranked(monkeypatch, hotel):
+    ids = [hotel.create_booking(f"Asha {i}", "", "2024-01-01", "2024-01-02")[0]
+           for i in range(10)]
+    monkeypatch.setattr(core, "SEARCH_CANDIDATES", 4)
+    assert sorted(b["id"] for b in hotel.search_bookings("asha")) == ids[-4:]
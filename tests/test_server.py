@@ -0,0 +1,115 @@
+"""
+Hotel Management System - HTTP API Tests
+Routes, request validation and in-order pipelining on one connection
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from hotel.server import BookingServer
+
+def request(method, target, body=None):
+    payload = b"" if body is None else json.dumps(body).encode()
+    head = f"{method} {target} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(payload)}\r\n\r\n"
+    return head.encode() + payload
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = next(int(line.split(":")[1]) for line in lines
+                  if line.lower().startswith("content-length"))
+    return status, json.loads(await reader.readexactly(length))
+
+def exchange(hotel, *requests):
+    """Send requests pipelined on one connection; returns [(status, payload)]"""
+    async def run():
+        server = BookingServer(hotel, workers=4)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"".join(requests))
+            await writer.drain()
+            responses = [await read_response(reader) for _ in requests]
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+def test_booking_routes(hotel):
+    (status, created), = exchange(hotel, request("POST", "/bookings", {
+        "name": "Asha Rao", "address": "12 Lake Road",
+        "check_in": "2024-03-01", "check_out": "2024-03-04"}))
+    assert status == 201
+    booking_id = created["id"]
+
+    responses = exchange(
+        hotel,
+        request("POST", f"/bookings/{booking_id}/charges", {"category": "restaurant",
+                                                            "amount": 250}),
+        request("POST", f"/bookings/{booking_id}/charges", {
+            "category": "laundry", "item": "Shirt", "qty": 3, "unit_price": 40}),
+        request("POST", "/charges", [[booking_id, "game", 60]]),
+        request("GET", f"/bookings/{booking_id}"),
+        request("GET", f"/bookings/{booking_id}/total"),
+        request("GET", "/bookings?limit=1"),
+        request("GET", "/bookings/search?q=asha"),
+        request("GET", "/bookings/999999"),
+        request("DELETE", f"/bookings/{booking_id}"),
+        request("GET", "/nowhere"),
+    )
+    assert [status for status, _ in responses] == [200, 200, 200, 200, 200, 200, 200,
+                                                   404, 405, 404]
+    booking = responses[3][1]
+    assert (booking["restaurant_bill"], booking["laundry_bill"], booking["game_bill"]) == (
+        250, 120, 60)
+    assert responses[4][1]["total"] == 250 + 120 + 60 + 1800
+    assert responses[5][1]["next"] == {"after_created_at": booking["created_at"],
+                                       "after_id": booking_id}
+    assert [b["id"] for b in responses[6][1]["bookings"]] == [booking_id]
+
+@pytest.mark.parametrize("target, body", [
+    ("/bookings", {"name": 123, "check_in": "2024-03-01", "check_out": "2024-03-02"}),
+    ("/bookings", {"name": "A", "check_in": "2024-3-01", "check_out": "2024-03-02"}),
+    ("/bookings", {"name": "A", "address": ["x"], "check_in": "2024-03-01",
+                   "check_out": "2024-03-02"}),
+    ("/bookings", ["not", "an", "object"]),
+    ("/bookings/{id}/charges", {"category": "restaurant", "amount": "abc"}),
+    ("/bookings/{id}/charges", {"category": "restaurant", "amount": True}),
+    ("/bookings/{id}/charges", {"category": ["restaurant"], "amount": 5}),
+    ("/bookings/{id}/charges", {"category": "laundry", "item": 7, "qty": 1,
+                                "unit_price": 5}),
+    ("/bookings/{id}/charges", {"category": "restaurant", "amount": -5e9}),
+    ("/bookings/{id}/room", {"room_type": "Type A", "nights": "3"}),
+    ("/bookings/{id}/room", {"room_type": 1}),
+    ("/charges", [[1, "restaurant", "abc"]]),
+    ("/charges", [["1", "restaurant", 5]]),
+    ("/charges", [5]),
+    ("/charges", {"booking_id": 1}),
+])
+def test_bad_request_bodies_get_400(hotel, target, body):
+    booking_id, _ = hotel.create_booking("Guest", "", "2024-03-01", "2024-03-02")
+    (status, payload), = exchange(hotel, request("POST", target.format(id=booking_id), body))
+    assert status == 400, payload
+    assert hotel.get_booking(booking_id)["total_bill"] == 1800
+
+def test_invalid_json_gets_400(hotel):
+    raw = b"POST /bookings HTTP/1.1\r\nContent-Length: 5\r\n\r\n{nope"
+    (status, payload), = exchange(hotel, raw)
+    assert status == 400 and "JSON" in payload["error"]
+
+def test_pipelined_reads_see_earlier_writes(hotel):
+    booking_id, _ = hotel.create_booking("Guest", "", "2024-03-01", "2024-03-02")
+    requests = []
+    for _ in range(20):
+        requests.append(request("POST", f"/bookings/{booking_id}/charges",
+                                {"category": "restaurant", "amount": 10}))
+        requests.append(request("GET", f"/bookings/{booking_id}/total"))
+    responses = exchange(hotel, *requests)
+    totals = [payload["total"] for _, payload in responses[1::2]]
+    assert totals == [1800 + 10 * n for n in range(1, 21)]
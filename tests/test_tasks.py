@@ -0,0 +1,53 @@
+"""
+Hotel Management System - Task Executor Tests
+Headless workers report errors and keep serving the queue
+"""
+
+import threading
+
+from hotel.tasks import TaskExecutor
+
+def fail():
+    raise ValueError("task failed")
+
+def test_headless_worker_survives_task_and_callback_errors():
+    errors = []
+    executor = TaskExecutor(on_error=errors.append)
+    done = threading.Event()
+    results = []
+
+    def broken_callback(value):
+        raise RuntimeError("callback failed")
+
+    executor.submit(fail)
+    executor.submit(lambda: 1, on_success=broken_callback)
+    executor.submit(lambda: 2, on_success=results.append)
+    executor.submit(done.set)
+    assert done.wait(5)
+    executor.shutdown()
+
+    assert results == [2]
+    assert [type(e) for e in errors] == [ValueError, RuntimeError]
+    stats = executor.stats()
+    assert (stats["completed"], stats["failed"]) == (3, 1)
+
+def test_headless_worker_prints_unhandled_errors(capsys):
+    executor = TaskExecutor()
+    done = threading.Event()
+    executor.submit(fail)
+    executor.submit(done.set)
+    assert done.wait(5)
+    executor.shutdown()
+    assert "task failed" in capsys.readouterr().err
+
+def test_keyed_tasks_coalesce_while_queued():
+    executor = TaskExecutor()
+    release = threading.Event()
+    results = []
+    executor.submit(release.wait)
+    for i in range(5):
+        executor.submit(lambda i=i: i, on_success=results.append, key="search")
+    release.set()
+    executor.shutdown()
+    assert results == [4]
+    assert executor.stats()["coalesced"] == 4